@@ -157,25 +157,27 @@ def transform_sequence(angle, dx=0, dy=0, dz=0):
 - dx, dy, dz: -3.0 a 3.0 unidades
 """
 
-# 🔹 Ejemplo 1: Solo rotación (sin traslación)
-transform_sequence(angle=45)
+# Al cargarse como módulo (p. ej. desde los benchmarks) no se ejecuta ningún ejemplo
+if __name__ == "__main__":
+    # 🔹 Ejemplo 1: Solo rotación (sin traslación)
+    transform_sequence(angle=45)
 
-# 🔹 Ejemplo 2: Rotación + Traslación en X
-# transform_sequence(angle=30, dx=1.5)
+    # 🔹 Ejemplo 2: Rotación + Traslación en X
+    # transform_sequence(angle=30, dx=1.5)
 
-# 🔹 Ejemplo 3: Rotación + Traslación en X e Y  
-# transform_sequence(angle=60, dx=1.0, dy=0.8)
+    # 🔹 Ejemplo 3: Rotación + Traslación en X e Y  
+    # transform_sequence(angle=60, dx=1.0, dy=0.8)
 
-# 🔹 Ejemplo 4: Rotación + Traslación completa
-# transform_sequence(angle=90, dx=1.0, dy=0.5, dz=0.3)
+    # 🔹 Ejemplo 4: Rotación + Traslación completa
+    # transform_sequence(angle=90, dx=1.0, dy=0.5, dz=0.3)
 
-# 🔹 Ejemplo 5: Rotación negativa + Traslación negativa
-# transform_sequence(angle=-45, dx=-1.0, dy=-0.5)
+    # 🔹 Ejemplo 5: Rotación negativa + Traslación negativa
+    # transform_sequence(angle=-45, dx=-1.0, dy=-0.5)
 
-# 🔹 Ejemplo 6: Experimenta con tus propios valores
-# transform_sequence(angle=120, dx=2.0, dy=-1.0, dz=1.5)
+    # 🔹 Ejemplo 6: Experimenta con tus propios valores
+    # transform_sequence(angle=120, dx=2.0, dy=-1.0, dz=1.5)
 
-# =============================================================================
-# 🎯 SECCIÓN 5: EJECUCIÓN FINAL - NO MODIFICAR
-# =============================================================================
-plt.show()
\ No newline at end of file
+    # =============================================================================
+    # 🎯 SECCIÓN 5: EJECUCIÓN FINAL - NO MODIFICAR
+    # =============================================================================
+    plt.show()
\ No newline at end of file
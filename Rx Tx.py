@@ -2,7 +2,10 @@ import matplotlib.pyplot as plt
 from mpl_toolkits import mplot3d
 import numpy as np
 
+from exportacion import grabador_desde_entorno
+
 # Configuración inicial
+grabador = grabador_desde_entorno()  # ritmo fijo de reloj o exportación sin ventana
 fig, ax = plt.subplots()
 ax = plt.axes(projection="3d")
 
@@ -71,7 +74,9 @@ def drawVector(v, color='orange', label=None):
 
 # Animación: Rotación X + Traslación X (simultánea)
 def animate_rotation_x():
-    for frame in range(0, 91, 2):  # 0° a 90°
+    frames = range(0, 91, 2)  # 0° a 90°
+    for i in grabador.recorrer(len(frames), fps=20):  # 20 fps de reloj, sin deriva
+        frame = frames[i]
         ax.cla()
         setaxis(-3, 3, -3, 3, -3, 3)
         fix_system(2)
@@ -93,10 +98,8 @@ def animate_rotation_x():
         
         ax.legend()
         ax.set_title(f'Rotación X + Traslación X Simultánea')
-        plt.draw()
-        plt.pause(0.05)
     
-    plt.show()
+    grabador.mostrar()
 
 # Ejecutar animación
 animate_rotation_x()
\ No newline at end of file
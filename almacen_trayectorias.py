@@ -0,0 +1,160 @@
+"""
+ALMACÉN DE TRAYECTORIAS EN MEMORIA COMPARTIDA
+
+Pasar trayectorias grandes a un ProcessPoolExecutor las serializa (pickle)
+en cada tarea. AlmacenTrayectorias guarda arrays con nombre (trayectorias
+articulares, pilas de marcos, puntas de herramienta...) en bloques de
+multiprocessing.shared_memory o, con `carpeta`, en archivos .npy mapeados
+en memoria. A los procesos solo viaja su `descriptor` (nombres, formas y
+tipos); cada proceso abre los mismos bytes y lee o escribe su tramo de
+filas sin copias.
+
+Ejemplo (cinemática directa del SCARA en paralelo):
+    with AlmacenTrayectorias.crear({'articulaciones': ((N, 4), 'f8')}) as almacen:
+        almacen['articulaciones'][:] = q
+        cinematica_scara_paralela(almacen, 650.0, 720.0, procesos=8)
+        punta = almacen['punta'].copy()
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cargador_scripts import cargar_script
+
+class AlmacenTrayectorias:
+    """Conjunto de arrays con nombre en memoria compartida (o .npy mapeados)"""
+
+    def __init__(self, descriptor, propietario=False):
+        self.descriptor = descriptor
+        self.propietario = propietario
+        self._segmentos = []
+        self._arrays = {}
+        for nombre, (ubicacion, forma, tipo) in descriptor['arrays'].items():
+            self._arrays[nombre] = self._abrir_array(ubicacion, forma, tipo)
+
+    @classmethod
+    def crear(cls, formas, carpeta=None):
+        """Reserva los arrays {nombre: (forma, dtype)}, en memoria compartida o en `carpeta`"""
+        descriptor = {'carpeta': carpeta, 'arrays': {}}
+        almacen = cls(descriptor, propietario=True)
+        for nombre, (forma, tipo) in formas.items():
+            almacen.añadir(nombre, forma, tipo)
+        return almacen
+
+    @classmethod
+    def abrir(cls, descriptor):
+        """Abre (sin copiar) un almacén creado en otro proceso a partir de su descriptor"""
+        return cls(descriptor)
+
+    def añadir(self, nombre, forma, tipo=np.float64):
+        """Reserva un nuevo array en el almacén y lo devuelve"""
+        forma, tipo = tuple(int(n) for n in np.atleast_1d(forma)), np.dtype(tipo)
+        carpeta = self.descriptor['carpeta']
+        if carpeta is None:
+            tamaño = max(1, int(np.prod(forma)) * tipo.itemsize)
+            segmento = shared_memory.SharedMemory(create=True, size=tamaño)
+            self._segmentos.append(segmento)
+            ubicacion = segmento.name
+            array = np.ndarray(forma, dtype=tipo, buffer=segmento.buf)
+        else:
+            os.makedirs(carpeta, exist_ok=True)
+            ubicacion = os.path.join(carpeta, nombre + ".npy")
+            array = np.lib.format.open_memmap(ubicacion, mode='w+', dtype=tipo, shape=forma)
+        self.descriptor['arrays'][nombre] = (ubicacion, forma, tipo.str)
+        self._arrays[nombre] = array
+        return array
+
+    def _abrir_array(self, ubicacion, forma, tipo):
+        if self.descriptor['carpeta'] is not None:
+            return np.load(ubicacion, mmap_mode='r+')
+        # Los procesos hijos comparten el resource_tracker del creador, así que
+        # abrir el segmento no cambia quién lo libera (el propietario, en cerrar)
+        segmento = shared_memory.SharedMemory(name=ubicacion)
+        self._segmentos.append(segmento)
+        return np.ndarray(forma, dtype=np.dtype(tipo), buffer=segmento.buf)
+
+    def __getitem__(self, nombre):
+        return self._arrays[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self._arrays
+
+    def cerrar(self):
+        """Suelta las vistas de este proceso; el propietario además libera la memoria"""
+        for array in self._arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+        self._arrays = {}
+        for segmento in self._segmentos:
+            segmento.close()
+            if self.propietario:
+                segmento.unlink()
+        self._segmentos = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+# ------------------ Trabajo en Paralelo por Tramos ------------------
+# Almacenes ya abiertos en este proceso (un proceso del pool atiende muchas tareas)
+_ABIERTOS = {}
+
+def _almacen_en_proceso(descriptor):
+    clave = tuple(ubicacion for ubicacion, _, _ in descriptor['arrays'].values())
+    if clave not in _ABIERTOS:
+        _ABIERTOS[clave] = AlmacenTrayectorias.abrir(descriptor)
+    return _ABIERTOS[clave]
+
+def _ejecutar_tramo(funcion, descriptor, tramo):
+    funcion(_almacen_en_proceso(descriptor), *tramo)
+
+def procesar_por_tramos(almacen, funcion, num_filas, procesos=None, tamaño_tramo=65536):
+    """Llama funcion(almacen, inicio, fin) sobre tramos de filas repartidos entre procesos
+
+    `funcion` debe ser de módulo (o functools.partial de una) para poder
+    enviarse a los procesos; lee y escribe directamente en los arrays del
+    almacén, de modo que solo viajan el descriptor y los límites del tramo.
+    """
+    tramos = [(inicio, min(inicio + tamaño_tramo, num_filas)) for inicio in range(0, num_filas, tamaño_tramo)]
+    if (procesos or 1) <= 1:
+        for tramo in tramos:
+            funcion(almacen, *tramo)
+        return
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        list(ejecutor.map(partial(_ejecutar_tramo, funcion, almacen.descriptor), tramos))
+
+# ------------------ Cinemática del SCARA sobre el Almacén ------------------
+def _tramo_cinematica_scara(almacen, inicio, fin, longitud_eslabon1, longitud_eslabon2,
+                            altura_base, offset_vertical):
+    simulador = cargar_script("examen tercer parcial.py")
+    cadena = simulador.obtener_cadena_scara(float(longitud_eslabon1), float(longitud_eslabon2),
+                                            float(altura_base), float(offset_vertical))
+    # La pila de marcos se escribe directamente en la memoria compartida
+    marcos = cadena.evaluar_lote(almacen['articulaciones'][inicio:fin], salida=almacen['marcos'][inicio:fin])
+    muñeca = marcos[:, 2, :3, 2]*altura_base + marcos[:, 2, :3, 3]
+    np.add(muñeca, marcos[:, 3, :3, 2]*simulador.LONGITUD_HERRAMIENTA, out=almacen['punta'][inicio:fin])
+
+def cinematica_scara_paralela(almacen, longitud_eslabon1, longitud_eslabon2, altura_base=800.0,
+                              offset_vertical=-35.0, procesos=None, tamaño_tramo=65536):
+    """Cinemática directa del SCARA para almacen['articulaciones'] (N,4) = (θ1, θ2, Z, θ4)
+
+    Añade (si faltan) almacen['marcos'] (N,4,4,4), con T0_a_1..T0_a_4, y
+    almacen['punta'] (N,3) con la punta de herramienta, como
+    calcular_cinematica_directa_lote de 'examen tercer parcial.py'.
+    """
+    num_filas = len(almacen['articulaciones'])
+    if 'marcos' not in almacen:
+        almacen.añadir('marcos', (num_filas, 4, 4, 4))
+    if 'punta' not in almacen:
+        almacen.añadir('punta', (num_filas, 3))
+    procesar_por_tramos(almacen,
+                        partial(_tramo_cinematica_scara, longitud_eslabon1=longitud_eslabon1,
+                                longitud_eslabon2=longitud_eslabon2, altura_base=altura_base,
+                                offset_vertical=offset_vertical),
+                        num_filas, procesos or os.cpu_count(), tamaño_tramo)
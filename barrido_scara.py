@@ -0,0 +1,177 @@
+"""
+BARRIDO DE PARÁMETROS DEL SCARA EN VARIOS PROCESOS
+
+Recorre una rejilla de parámetros de ejecutar_simulacion_movimiento
+('examen tercer parcial.py'): longitudes de eslabón, offset_vertical,
+recorrido en Z y perfiles de movimiento articular. Para cada combinación
+calcula la cinemática directa de toda la trayectoria y guarda sus métricas:
+
+    alcance_maximo        mayor distancia horizontal de la punta al eje de la base
+    longitud_trayectoria  longitud del recorrido de la punta de herramienta
+    extension_x/y/z       tamaño de la caja que envuelve el recorrido
+    altura_minima         menor altura de la punta
+
+Las simulaciones se agrupan en bloques que se reparten con un
+ProcessPoolExecutor (por defecto un proceso por núcleo). Cada bloque
+terminado se escribe en la carpeta de salida como bloque_NNNNN.npz (una
+columna por parámetro/métrica); si el barrido se interrumpe, al relanzarlo
+se saltan los bloques ya escritos. Al final los bloques se reúnen en
+resultados.npz, también por columnas.
+
+Uso:
+    python barrido_scara.py rejilla.json --salida barridos/estudio --procesos 64
+
+rejilla.json (o .toml) asigna a cada parámetro un valor fijo o una lista:
+    {"long_eslabon1": [500, 650, 800], "offset_vertical": [-35, 0],
+     "angulo_final_art2": [60, 120], "perfil": ["lineal", "curva_s"]}
+"""
+
+import argparse
+import itertools
+import json
+import os
+import tomllib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from cargador_scripts import cargar_script
+
+METRICAS = ('alcance_maximo', 'longitud_trayectoria',
+            'extension_x', 'extension_y', 'extension_z', 'altura_minima')
+
+def _simulador():
+    return cargar_script("examen tercer parcial.py")
+
+# ------------------ Rejilla de Parámetros ------------------
+def cargar_rejilla(ruta):
+    """Lee una rejilla de parámetros de un archivo JSON o TOML"""
+    if str(ruta).lower().endswith('.toml'):
+        with open(ruta, 'rb') as archivo:
+            return tomllib.load(archivo)
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+def expandir_rejilla(rejilla):
+    """Producto cartesiano de la rejilla: lista de conjuntos completos de parámetros
+
+    Los parámetros que no aparecen toman su valor por defecto.
+    """
+    simulador = _simulador()
+    claves = list(rejilla)
+    valores = [v if isinstance(v, (list, tuple)) else [v] for v in rejilla.values()]
+    return [simulador.normalizar_parametros(dict(zip(claves, combinacion)))
+            for combinacion in itertools.product(*valores)]
+
+# ------------------ Métricas de una Simulación ------------------
+def metricas_simulacion(parametros):
+    """Calcula las métricas de la trayectoria de la punta para un conjunto de parámetros"""
+    simulador = _simulador()
+    secuencias = simulador.generar_secuencias_movimiento(
+        parametros['longitud_minima_brazo'], parametros['longitud_maxima_brazo'], parametros['num_frames'],
+        parametros['angulo_inicial_art1'], parametros['angulo_final_art1'],
+        parametros['angulo_final_art2'], parametros['rotacion_total_art4'], parametros['perfil'])
+    punta = simulador.calcular_cinematica_directa_lote(
+        *secuencias, parametros['long_eslabon1'], parametros['long_eslabon2'],
+        simulador.ALTURA_BASE, parametros['offset_vertical'])[3]
+
+    extension = np.ptp(punta, axis=0)
+    return {
+        'alcance_maximo': float(np.hypot(punta[:, 0], punta[:, 1]).max()),
+        'longitud_trayectoria': float(np.linalg.norm(np.diff(punta, axis=0), axis=1).sum()),
+        'extension_x': float(extension[0]),
+        'extension_y': float(extension[1]),
+        'extension_z': float(extension[2]),
+        'altura_minima': float(punta[:, 2].min()),
+    }
+
+def evaluar_bloque(indices, conjuntos):
+    """Evalúa varias simulaciones y devuelve sus columnas (parámetros + métricas)"""
+    filas = [dict(parametros, **metricas_simulacion(parametros)) for parametros in conjuntos]
+    columnas = {'indice': np.asarray(indices, dtype=np.int64)}
+    for clave in filas[0]:
+        columnas[clave] = np.array([fila[clave] for fila in filas])
+    return columnas
+
+# ------------------ Resultados por Bloques ------------------
+def _ruta_bloque(carpeta, numero):
+    return os.path.join(carpeta, f"bloque_{numero:05d}.npz")
+
+def _guardar_columnas(ruta, columnas):
+    # Se escribe en un temporal y se renombra: un corte a mitad nunca deja un bloque a medias
+    temporal = ruta + ".tmp.npz"
+    np.savez(temporal, **columnas)
+    os.replace(temporal, ruta)
+
+def _preparar_carpeta(carpeta, conjuntos, tamaño_bloque):
+    # La carpeta recuerda la rejilla expandida; reanudar con otra distinta sería mezclar estudios
+    os.makedirs(carpeta, exist_ok=True)
+    descripcion = {'tamaño_bloque': tamaño_bloque, 'conjuntos': conjuntos}
+    ruta = os.path.join(carpeta, "rejilla.json")
+    if os.path.exists(ruta):
+        with open(ruta, encoding='utf-8') as archivo:
+            if json.load(archivo) != json.loads(json.dumps(descripcion)):
+                raise ValueError(f"{carpeta} contiene un barrido con otra rejilla; usa otra carpeta de salida")
+    else:
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(descripcion, archivo, indent=1)
+
+def ejecutar_barrido(conjuntos, carpeta, procesos=None, tamaño_bloque=32):
+    """Evalúa todos los conjuntos en paralelo y devuelve las columnas de resultados
+
+    Los bloques ya presentes en `carpeta` (de una ejecución interrumpida) no
+    se recalculan.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    _preparar_carpeta(carpeta, conjuntos, tamaño_bloque)
+
+    bloques = [range(inicio, min(inicio + tamaño_bloque, len(conjuntos)))
+               for inicio in range(0, len(conjuntos), tamaño_bloque)]
+    pendientes = [numero for numero in range(len(bloques))
+                  if not os.path.exists(_ruta_bloque(carpeta, numero))]
+    print(f"Barrido de {len(conjuntos)} simulaciones en {len(bloques)} bloques "
+          f"({len(bloques) - len(pendientes)} ya calculados), {procesos} procesos")
+
+    if pendientes:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = {ejecutor.submit(evaluar_bloque, list(bloques[numero]),
+                                       [conjuntos[i] for i in bloques[numero]]): numero
+                       for numero in pendientes}
+            for hechos, futuro in enumerate(as_completed(futuros), start=1):
+                _guardar_columnas(_ruta_bloque(carpeta, futuros[futuro]), futuro.result())
+                print(f"  bloque {futuros[futuro] + 1}/{len(bloques)} listo ({hechos}/{len(pendientes)})")
+
+    return consolidar_resultados(carpeta, len(bloques))
+
+def consolidar_resultados(carpeta, num_bloques):
+    """Une los bloques en resultados.npz (una columna por parámetro/métrica) y devuelve las columnas"""
+    partes = []
+    for numero in range(num_bloques):
+        with np.load(_ruta_bloque(carpeta, numero)) as bloque:
+            partes.append({clave: bloque[clave] for clave in bloque.files})
+    columnas = {clave: np.concatenate([parte[clave] for parte in partes]) for clave in partes[0]}
+    _guardar_columnas(os.path.join(carpeta, "resultados.npz"), columnas)
+    return columnas
+
+def cargar_resultados(carpeta):
+    """Lee las columnas de resultados.npz de un barrido terminado"""
+    with np.load(os.path.join(carpeta, "resultados.npz")) as resultados:
+        return {clave: resultados[clave] for clave in resultados.files}
+
+# ------------------ Programa Principal ------------------
+def main(argumentos=None):
+    analizador = argparse.ArgumentParser(description="Barrido de parámetros del SCARA en varios procesos")
+    analizador.add_argument('rejilla', help="archivo JSON o TOML con los valores de cada parámetro")
+    analizador.add_argument('--salida', required=True, help="carpeta de resultados (permite reanudar)")
+    analizador.add_argument('--procesos', type=int, default=None, help="por defecto, un proceso por núcleo")
+    analizador.add_argument('--bloque', type=int, default=32, help="simulaciones por tarea")
+    opciones = analizador.parse_args(argumentos)
+
+    conjuntos = expandir_rejilla(cargar_rejilla(opciones.rejilla))
+    columnas = ejecutar_barrido(conjuntos, opciones.salida, opciones.procesos, opciones.bloque)
+    mejor = int(np.argmax(columnas['alcance_maximo']))
+    print(f"Resultados en {os.path.join(opciones.salida, 'resultados.npz')}; mayor alcance "
+          f"{columnas['alcance_maximo'][mejor]:.1f} mm (simulación {columnas['indice'][mejor]})")
+
+if __name__ == "__main__":
+    main()
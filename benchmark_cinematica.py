@@ -0,0 +1,265 @@
+"""
+BENCHMARKS DE CINEMÁTICA
+
+Mide el tiempo de los puntos de entrada de cinemática directa/inversa y de
+transformación de los scripts del curso, para tamaños de 1 a 10^6 muestras:
+
+    matriz_transformacion_DH(_lote), calcular_cinematica_directa(_lote), CinematicaSCARA.evaluar
+    RobotArm3DOF.forward_kinematics, RobotArmFleet.forward_kinematics
+    cinematica_inversa(_lote) del brazo planar y del de base giratoria
+    rotate_box, rotate_box_simultaneous, transform_sequence
+
+Las funciones escalares se llaman una vez por muestra en un bucle de Python
+(hasta --maximo-escalar muestras); sus variantes por lotes reciben todas
+las muestras de una vez. Los resultados se guardan en JSON y pueden
+compararse con una ejecución anterior: si algún caso es más lento que la
+referencia en más de --umbral (por defecto 20 %), el programa termina con
+código 1.
+
+Uso:
+    python benchmark_cinematica.py --salida base.json
+    python benchmark_cinematica.py --salida nuevo.json --comparar base.json
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")  # transform_sequence y los scripts de cajas dibujan al cargarse/llamarse
+
+from cargador_scripts import cargar_script
+
+TAMAÑOS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# ------------------ Casos ------------------
+# Cada caso prepara, para n muestras, una función sin argumentos que procesa las n
+CASOS = {}
+
+def caso(nombre, escalar=False, tamaño_maximo=None):
+    """Registra preparar(n, generador) -> ejecutar() como caso de benchmark"""
+    def registrar(preparar):
+        CASOS[nombre] = (preparar, escalar, tamaño_maximo)
+        return preparar
+    return registrar
+
+def _scara():
+    return cargar_script("examen tercer parcial.py")
+
+@caso("matriz_transformacion_DH", escalar=True)
+def _(n, generador):
+    matriz_transformacion_DH = _scara().matriz_transformacion_DH
+    angulos = generador.uniform(-180, 180, n).tolist()
+
+    def ejecutar():
+        for angulo in angulos:
+            matriz_transformacion_DH(angulo, 100.0, 650.0, 0.0)
+    return ejecutar
+
+@caso("matriz_transformacion_DH_lote")
+def _(n, generador):
+    matriz_transformacion_DH_lote = _scara().matriz_transformacion_DH_lote
+    angulos = generador.uniform(-180, 180, n)
+    return lambda: matriz_transformacion_DH_lote(angulos, 100.0, 650.0, 0.0)
+
+def _articulaciones_scara(n, generador):
+    return np.column_stack((generador.uniform(-180, 180, n), generador.uniform(-180, 180, n),
+                            generador.uniform(350, 820, n), generador.uniform(-180, 180, n)))
+
+@caso("calcular_cinematica_directa", escalar=True)
+def _(n, generador):
+    simulador = _scara()
+    q = _articulaciones_scara(n, generador).tolist()
+
+    def ejecutar():
+        for a1, a2, z, a4 in q:
+            simulador.calcular_cinematica_directa(a1, a2, z, a4, 650.0, 720.0, simulador.ALTURA_BASE, -35.0, 85.0)
+    return ejecutar
+
+@caso("CinematicaSCARA.evaluar", escalar=True)
+def _(n, generador):
+    # Lo que hacen los bucles de animación: una CinematicaSCARA guardada y evaluar() por cuadro
+    simulador = _scara()
+    cinematica = simulador.CinematicaSCARA(650.0, 720.0, simulador.ALTURA_BASE, -35.0, 85.0)
+    q = _articulaciones_scara(n, generador).tolist()
+
+    def ejecutar():
+        for a1, a2, z, a4 in q:
+            cinematica.evaluar(a1, a2, z, a4)
+    return ejecutar
+
+@caso("calcular_cinematica_directa_lote")
+def _(n, generador):
+    simulador = _scara()
+    q = _articulaciones_scara(n, generador).T
+    return lambda: simulador.calcular_cinematica_directa_lote(*q, 650.0, 720.0, simulador.ALTURA_BASE, -35.0)
+
+@caso("RobotArm3DOF.forward_kinematics", escalar=True)
+def _(n, generador):
+    brazo = cargar_script("examen").RobotArm3DOF()
+    angulos = generador.uniform(-180, 180, (n, 3))
+
+    def ejecutar():
+        # Ángulos distintos en cada llamada: se mide el cálculo, no la memoización
+        for fila in angulos:
+            brazo.params[3:] = fila
+            brazo.forward_kinematics()
+    return ejecutar
+
+@caso("RobotArmFleet.forward_kinematics")
+def _(n, generador):
+    flota = cargar_script("examen").RobotArmFleet(n, angles=generador.uniform(-180, 180, (n, 3)))
+    return flota.forward_kinematics
+
+def _objetivos_planares(n, generador, l1=3.0, l2=2.0):
+    radio = generador.uniform(abs(l1 - l2), l1 + l2, n)
+    angulo = generador.uniform(-np.pi, np.pi, n)
+    return np.column_stack((radio*np.cos(angulo), radio*np.sin(angulo)))
+
+@caso("cinematica_inversa (planar)", escalar=True)
+def _(n, generador):
+    cinematica_inversa = cargar_script("tarea parcial 2.py").cinematica_inversa
+    objetivos = _objetivos_planares(n, generador).tolist()
+
+    def ejecutar():
+        for x, y in objetivos:
+            cinematica_inversa(x, y, 3.0, 2.0, "arriba")
+    return ejecutar
+
+@caso("cinematica_inversa_lote (planar)")
+def _(n, generador):
+    cinematica_inversa_lote = cargar_script("tarea parcial 2.py").cinematica_inversa_lote
+    objetivos = _objetivos_planares(n, generador)
+    return lambda: cinematica_inversa_lote(objetivos, 3.0, 2.0)
+
+def _objetivos_espaciales(n, generador):
+    plano = _objetivos_planares(n, generador)
+    base = generador.uniform(-np.pi, np.pi, n)
+    return np.column_stack((plano[:, 0]*np.cos(base), plano[:, 0]*np.sin(base), plano[:, 1]))
+
+@caso("cinematica_inversa (base giratoria)", escalar=True)
+def _(n, generador):
+    cinematica_inversa = cargar_script("tarea 2 parcial 2.py").cinematica_inversa
+    objetivos = _objetivos_espaciales(n, generador).tolist()
+
+    def ejecutar():
+        for x, y, z in objetivos:
+            cinematica_inversa(x, y, z, 3.0, 2.0, "arriba")
+    return ejecutar
+
+@caso("cinematica_inversa_lote (base giratoria)")
+def _(n, generador):
+    cinematica_inversa_lote = cargar_script("tarea 2 parcial 2.py").cinematica_inversa_lote
+    objetivos = _objetivos_espaciales(n, generador)
+    return lambda: cinematica_inversa_lote(objetivos, 3.0, 2.0)
+
+@caso("rotate_box")
+def _(n, generador):
+    rotate_box = cargar_script("rotacion de la caja animada en X,Y,Z.py").rotate_box
+    puntos = generador.uniform(-10, 10, (n, 3))
+    salida = np.empty_like(puntos)
+    return lambda: rotate_box(puntos, 'z', 30.0, out=salida)
+
+@caso("rotate_box_simultaneous")
+def _(n, generador):
+    rotate_box_simultaneous = cargar_script("movimiento fluido de la caja.py").rotate_box_simultaneous
+    puntos = generador.uniform(-10, 10, (n, 3))
+    salida = np.empty_like(puntos)
+    return lambda: rotate_box_simultaneous(puntos, 45.0, 30.0, 15.0, out=salida)
+
+@caso("transform_sequence", escalar=True, tamaño_maximo=10)
+def _(n, generador):
+    # Incluye el dibujado (ax.cla, vectores, leyenda): es lo que hace la función
+    transform_sequence = cargar_script("Codigo con matriz 4x4.py").transform_sequence
+    angulos = generador.uniform(0, 360, n).tolist()
+
+    def ejecutar():
+        for angulo in angulos:
+            transform_sequence(angulo, 1.0, 0.5, 0.3)
+    return ejecutar
+
+# ------------------ Medición ------------------
+def medir(ejecutar, tiempo_minimo=0.2, repeticiones_maximas=50):
+    """Repite `ejecutar` (tras una vuelta de calentamiento) hasta sumar tiempo_minimo s"""
+    ejecutar()
+    tiempos = []
+    while len(tiempos) < 3 or (sum(tiempos) < tiempo_minimo and len(tiempos) < repeticiones_maximas):
+        inicio = time.perf_counter()
+        ejecutar()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+def ejecutar_benchmarks(tamaños=TAMAÑOS, maximo_escalar=10_000, patron="*", semilla=0, tiempo_minimo=0.2):
+    """Mide todos los casos cuyo nombre encaja con `patron` y devuelve la lista de resultados"""
+    resultados = []
+    for nombre, (preparar, escalar, tamaño_maximo) in CASOS.items():
+        if not fnmatch.fnmatch(nombre, patron):
+            continue
+        limite = tamaño_maximo or (maximo_escalar if escalar else max(tamaños))
+        for n in (n for n in tamaños if n <= limite):
+            tiempos = medir(preparar(n, np.random.default_rng(semilla)), tiempo_minimo)
+            mediana = statistics.median(tiempos)
+            resultados.append({'caso': nombre, 'n': n, 'mediana_s': mediana, 'minimo_s': min(tiempos),
+                               'ns_por_muestra': mediana / n * 1e9, 'repeticiones': len(tiempos)})
+            print(f"{nombre:42s} n={n:>9d}  {mediana*1e3:12.4f} ms  {mediana/n*1e9:12.1f} ns/muestra")
+    return resultados
+
+def entorno():
+    """Versión de Python/NumPy/Matplotlib y máquina, para interpretar los resultados"""
+    return {'fecha': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'matplotlib': matplotlib.__version__,
+            'plataforma': platform.platform(), 'procesador': platform.processor() or platform.machine()}
+
+def comparar(resultados, referencia, umbral=0.2):
+    """Compara medianas con una ejecución de referencia; devuelve las regresiones (caso, n, razón)"""
+    base = {(r['caso'], r['n']): r['mediana_s'] for r in referencia}
+    regresiones = []
+    for resultado in resultados:
+        clave = (resultado['caso'], resultado['n'])
+        if clave not in base:
+            continue
+        razon = resultado['mediana_s'] / base[clave]
+        marca = "REGRESIÓN" if razon > 1 + umbral else ("mejora" if razon < 1 - umbral else "")
+        print(f"{clave[0]:42s} n={clave[1]:>9d}  x{razon:6.2f}  {marca}")
+        if razon > 1 + umbral:
+            regresiones.append((clave[0], clave[1], razon))
+    return regresiones
+
+# ------------------ Programa Principal ------------------
+def main(argumentos=None):
+    analizador = argparse.ArgumentParser(description="Benchmarks de cinemática de los scripts del curso")
+    analizador.add_argument('--salida', help="archivo JSON donde guardar los resultados")
+    analizador.add_argument('--comparar', help="JSON de referencia con el que comparar")
+    analizador.add_argument('--umbral', type=float, default=0.2, help="ralentización tolerada (0.2 = 20 %%)")
+    analizador.add_argument('--tamaños', type=int, nargs='+', default=list(TAMAÑOS))
+    analizador.add_argument('--maximo-escalar', type=int, default=10_000,
+                            help="máximo de muestras para las funciones escalares (bucle de Python)")
+    analizador.add_argument('--casos', default="*", help="patrón de nombres de caso (fnmatch)")
+    analizador.add_argument('--tiempo-minimo', type=float, default=0.2, help="segundos medidos por caso y tamaño")
+    opciones = analizador.parse_args(argumentos)
+
+    resultados = ejecutar_benchmarks(opciones.tamaños, opciones.maximo_escalar, opciones.casos,
+                                     tiempo_minimo=opciones.tiempo_minimo)
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'entorno': entorno(), 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {opciones.salida}")
+
+    if opciones.comparar:
+        with open(opciones.comparar, encoding='utf-8') as archivo:
+            referencia = json.load(archivo)['resultados']
+        regresiones = comparar(resultados, referencia, opciones.umbral)
+        if regresiones:
+            print(f"{len(regresiones)} caso(s) más lentos que la referencia en más de un {opciones.umbral:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+BENCHMARK DE RENDERIZADO SIN PANTALLA
+
+Renderiza N cuadros de cada escena estándar de los scripts del curso en el
+lienzo Agg (no hace falta pantalla, sirve en CI) y mide cuánto cuesta cada
+cuadro: crear/actualizar los artistas más canvas.draw().
+
+    scara          visualizar_configuracion_robot (todo se redibuja desde cero)
+    scara_persistente  RenderizadorSCARA.actualizar (artistas creados una vez)
+    caja           drawBox + fix_system ('movimiento fluido de la caja.py')
+    vectores       fix_system + drawVector (transform_sequence, 'Codigo con matriz 4x4.py')
+    brazo_planar   dibujar_brazo ('tarea parcial 2.py')
+    brazo_3d       dibujar_brazo + fix_system ('tarea 2 parcial 2.py')
+
+Por escena informa media, p95 y p99 del tiempo de cuadro, el tiempo medio de
+canvas.draw(), los artistas por cuadro y el pico de memoria de Python
+(tracemalloc, en una pasada aparte para no falsear los tiempos). Con
+--comparar falla (código 1) si el p95 de alguna escena empeora más que
+--umbral respecto a una ejecución de referencia.
+
+Uso:
+    python benchmark_renderizado.py --cuadros 200 --salida render.json
+    python benchmark_renderizado.py --comparar render.json
+"""
+
+import argparse
+import fnmatch
+import json
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")  # sin pantalla, aunque MPLBACKEND diga otra cosa
+
+import matplotlib.pyplot as plt
+
+from benchmark_cinematica import entorno
+from cargador_scripts import cargar_script
+
+# ------------------ Escenas ------------------
+# Cada escena crea su figura y devuelve (figura, dibujar(i, n)), que deja listo el cuadro i de n
+ESCENAS = {}
+
+def escena(nombre):
+    """Registra crear() -> (figura, dibujar) como escena del benchmark"""
+    def registrar(crear):
+        ESCENAS[nombre] = crear
+        return crear
+    return registrar
+
+def _movimiento_scara(i, n):
+    # Mismo recorrido que generar_secuencias_movimiento con los parámetros por defecto
+    t = i / max(n - 1, 1)
+    return 90.0*t, 120.0*t, 820.0 - 470.0*t/2, 270.0*t
+
+@escena("scara")
+def _():
+    simulador = cargar_script("examen tercer parcial.py")
+    figura = plt.figure(figsize=(10, 8))
+    eje_3d = figura.add_subplot(111, projection='3d')
+    limite = max(1600, 650.0 + 720.0 + 300)
+    cinematica = simulador.CinematicaSCARA(650.0, 720.0, simulador.ALTURA_BASE, -35.0, 85.0)
+
+    def dibujar(i, n):
+        eje_3d.cla()
+        datos = cinematica.evaluar(*_movimiento_scara(i, n))
+        simulador.visualizar_configuracion_robot(eje_3d, *datos[:12], limite, *datos[12:])
+    return figura, dibujar
+
+@escena("scara_persistente")
+def _():
+    simulador = cargar_script("examen tercer parcial.py")
+    figura = plt.figure(figsize=(10, 8))
+    renderizador = simulador.RenderizadorSCARA(figura.add_subplot(111, projection='3d'),
+                                               max(1600, 650.0 + 720.0 + 300))
+    cinematica = simulador.CinematicaSCARA(650.0, 720.0, simulador.ALTURA_BASE, -35.0, 85.0)
+
+    def dibujar(i, n):
+        renderizador.actualizar(*cinematica.evaluar(*_movimiento_scara(i, n)))
+    return figura, dibujar
+
+@escena("caja")
+def _():
+    caja = cargar_script("movimiento fluido de la caja.py")
+    figura = caja.ax.figure
+    figura.set_size_inches(6.4, 4.8)
+
+    def dibujar(i, n):
+        t = i / max(n - 1, 1)
+        caja.ax.cla()
+        caja.setaxis(-15, 15, -15, 15, -15, 15)
+        caja.fix_system(10, 1)
+        caja.drawBox(*caja.original_points, color='gray', alpha=0.5)
+        caja.drawBox(*caja.rotate_box_simultaneous(caja.original_points, 45*t, 30*t, 15*t), color='red')
+        caja.ax.set_title(f'Rotación Simultánea: {t:.0%}')
+    return figura, dibujar
+
+@escena("vectores")
+def _():
+    vectores = cargar_script("Codigo con matriz 4x4.py")
+    figura = vectores.ax.figure
+    figura.set_size_inches(6.4, 4.8)
+
+    def dibujar(i, n):
+        vectores.transform_sequence(360.0 * i / max(n, 1), 1, 0.5, 0.3)
+    return figura, dibujar
+
+@escena("brazo_planar")
+def _():
+    planar = cargar_script("tarea parcial 2.py")
+    figura, ax = plt.subplots(figsize=(6, 6))
+    l1, l2 = 3.0, 2.0
+    objetivo = planar.cinematica_inversa(2.5, 3.0, l1, l2, "arriba")
+    lim = l1 + l2 + 1
+
+    def dibujar(i, n):
+        t = i / max(n - 1, 1)
+        ax.cla()
+        ax.set_xlim(-lim, lim)
+        ax.set_ylim(-lim, lim)
+        ax.set_aspect("equal")
+        ax.set_title("Animación planar - codo arriba")
+        planar.dibujar_ejes(ax, l1 + l2)
+        ax.scatter([2.5], [3.0], color="darkred", s=80, alpha=0.8, marker="X")
+        planar.dibujar_brazo(ax, objetivo[0]*t, objetivo[1]*t, l1, l2)
+    return figura, dibujar
+
+@escena("brazo_3d")
+def _():
+    brazo = cargar_script("tarea 2 parcial 2.py")
+    figura = plt.figure(figsize=(8, 8))
+    brazo.ax = figura.add_subplot(111, projection="3d")  # el script dibuja sobre su `ax` global
+    l1, l2 = 3.0, 2.0
+    tb_f, t1_f, t2_f = brazo.cinematica_inversa(2.0, 1.5, 2.5, l1, l2, "arriba")
+    lim = l1 + l2 + 2
+
+    def dibujar(i, n):
+        t = i / max(n - 1, 1)
+        brazo.ax.cla()
+        brazo.setaxis(-lim, lim, -lim, lim, -lim, lim)
+        brazo.fix_system(lim, 2)
+        brazo.ax.set_title("Brazo 3D - codo arriba")
+        brazo.ax.scatter([0], [0], [0], color="black", s=100)
+        brazo.ax.scatter([2.0], [1.5], [2.5], color="darkred", s=80, alpha=0.8, marker="X")
+        brazo.dibujar_brazo(tb_f*t, t1_f*t, t2_f*t, l1, l2)
+    return figura, dibujar
+
+# ------------------ Medición ------------------
+def contar_artistas(figura):
+    """Artistas que cuelgan directamente de los ejes de la figura (líneas, colecciones, textos...)"""
+    return sum(len(eje.get_children()) for eje in figura.axes)
+
+def medir_escena(nombre, num_cuadros=100, calentamiento=2, cuadros_memoria=20):
+    """Renderiza la escena y devuelve sus estadísticas de tiempo, artistas y memoria"""
+    figura, dibujar = ESCENAS[nombre]()
+    lienzo = figura.canvas
+    for i in range(calentamiento):  # caché de fuentes, primera disposición de los ejes...
+        dibujar(i, num_cuadros)
+        lienzo.draw()
+
+    tiempos, tiempos_dibujo, artistas = [], [], []
+    for i in range(num_cuadros):
+        inicio = time.perf_counter()
+        dibujar(i, num_cuadros)
+        antes_de_dibujar = time.perf_counter()
+        lienzo.draw()
+        fin = time.perf_counter()
+        tiempos.append(fin - inicio)
+        tiempos_dibujo.append(fin - antes_de_dibujar)
+        artistas.append(contar_artistas(figura))
+
+    # tracemalloc ralentiza cada asignación: el pico se mide en una pasada aparte
+    tracemalloc.start()
+    for i in range(min(cuadros_memoria, num_cuadros)):
+        dibujar(i, num_cuadros)
+        lienzo.draw()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    plt.close(figura)
+
+    tiempos_ms = np.array(tiempos) * 1e3
+    return {
+        'escena': nombre,
+        'cuadros': num_cuadros,
+        'media_ms': float(tiempos_ms.mean()),
+        'p95_ms': float(np.percentile(tiempos_ms, 95)),
+        'p99_ms': float(np.percentile(tiempos_ms, 99)),
+        'maximo_ms': float(tiempos_ms.max()),
+        'media_dibujo_ms': float(np.mean(tiempos_dibujo) * 1e3),
+        'artistas_medios': float(np.mean(artistas)),
+        'artistas_maximos': int(max(artistas)),
+        'memoria_pico_mb': pico / 2**20,
+    }
+
+def ejecutar_benchmark(num_cuadros=100, patron="*"):
+    """Mide todas las escenas cuyo nombre encaja con `patron`"""
+    resultados = []
+    for nombre in ESCENAS:
+        if not fnmatch.fnmatch(nombre, patron):
+            continue
+        resultado = medir_escena(nombre, num_cuadros)
+        resultados.append(resultado)
+        print(f"{nombre:18s} media {resultado['media_ms']:8.2f} ms  p95 {resultado['p95_ms']:8.2f} ms  "
+              f"p99 {resultado['p99_ms']:8.2f} ms  draw {resultado['media_dibujo_ms']:8.2f} ms  "
+              f"{resultado['artistas_medios']:5.0f} artistas  {resultado['memoria_pico_mb']:6.2f} MB")
+    return resultados
+
+def comparar(resultados, referencia, umbral=0.2):
+    """Compara el p95 de cada escena con la referencia; devuelve las regresiones (escena, razón)"""
+    base = {r['escena']: r['p95_ms'] for r in referencia}
+    regresiones = []
+    for resultado in resultados:
+        if resultado['escena'] not in base:
+            continue
+        razon = resultado['p95_ms'] / base[resultado['escena']]
+        marca = "REGRESIÓN" if razon > 1 + umbral else ("mejora" if razon < 1 - umbral else "")
+        print(f"{resultado['escena']:18s} p95 x{razon:6.2f}  {marca}")
+        if razon > 1 + umbral:
+            regresiones.append((resultado['escena'], razon))
+    return regresiones
+
+# ------------------ Programa Principal ------------------
+def main(argumentos=None):
+    analizador = argparse.ArgumentParser(description="Benchmark de renderizado sin pantalla (Agg)")
+    analizador.add_argument('--cuadros', type=int, default=100, help="cuadros medidos por escena")
+    analizador.add_argument('--escenas', default="*", help="patrón de nombres de escena (fnmatch)")
+    analizador.add_argument('--salida', help="archivo JSON donde guardar los resultados")
+    analizador.add_argument('--comparar', help="JSON de referencia con el que comparar")
+    analizador.add_argument('--umbral', type=float, default=0.2, help="empeoramiento tolerado del p95 (0.2 = 20 %%)")
+    opciones = analizador.parse_args(argumentos)
+
+    resultados = ejecutar_benchmark(opciones.cuadros, opciones.escenas)
+    # ru_maxrss viene en KiB en Linux: pico de memoria de todo el proceso, fuera de tracemalloc
+    rss_maximo_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Memoria residente máxima del proceso: {rss_maximo_mb:.1f} MB")
+
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'entorno': dict(entorno(), backend=matplotlib.get_backend(), rss_maximo_mb=rss_maximo_mb),
+                       'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {opciones.salida}")
+
+    if opciones.comparar:
+        with open(opciones.comparar, encoding='utf-8') as archivo:
+            referencia = json.load(archivo)['resultados']
+        regresiones = comparar(resultados, referencia, opciones.umbral)
+        if regresiones:
+            print(f"{len(regresiones)} escena(s) con p95 peor que la referencia en más de un {opciones.umbral:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+CARGA DE SCRIPTS DEL CURSO COMO MÓDULOS
+
+Los scripts de la clase tienen espacios en el nombre (o no tienen extensión)
+y no se pueden importar con `import`. cargar_script los ejecuta como módulo a
+partir de su ruta para reutilizar sus funciones; solo sirve con los scripts
+que protegen su programa principal con `if __name__ == "__main__":`.
+"""
+
+import os
+import sys
+import importlib.util
+from importlib.machinery import SourceFileLoader
+
+CARPETA_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+
+def cargar_script(nombre_archivo):
+    """Carga (una sola vez) un script de la carpeta del curso y devuelve el módulo"""
+    ruta = os.path.join(CARPETA_SCRIPTS, nombre_archivo)
+    nombre_modulo = "script_" + "".join(c if c.isalnum() else "_" for c in nombre_archivo)
+    if nombre_modulo in sys.modules:
+        return sys.modules[nombre_modulo]
+
+    cargador = SourceFileLoader(nombre_modulo, ruta)
+    especificacion = importlib.util.spec_from_loader(nombre_modulo, cargador)
+    modulo = importlib.util.module_from_spec(especificacion)
+    sys.modules[nombre_modulo] = modulo
+    try:
+        cargador.exec_module(modulo)
+    except BaseException:
+        del sys.modules[nombre_modulo]
+        raise
+    return modulo
@@ -158,28 +158,30 @@ def transform_sequence(angle, dx=0, dy=0, dz=0):
 - dx, dy, dz: -3.0 a 3.0 unidades
 """
 
-# 🔹 Ejemplo 1: Rotación en X de 90° (sin traslación)
-transform_sequence(angle=90)
+# Al cargarse como módulo (p. ej. desde los benchmarks) no se ejecuta ningún ejemplo
+if __name__ == "__main__":
+    # 🔹 Ejemplo 1: Rotación en X de 90° (sin traslación)
+    transform_sequence(angle=90)
 
-# 🔹 Ejemplo 2: Rotación en X + Traslación en Y
-# transform_sequence(angle=45, dy=1.5)
+    # 🔹 Ejemplo 2: Rotación en X + Traslación en Y
+    # transform_sequence(angle=45, dy=1.5)
 
-# 🔹 Ejemplo 3: Rotación en X + Traslación en Z
-# transform_sequence(angle=60, dz=1.2)
+    # 🔹 Ejemplo 3: Rotación en X + Traslación en Z
+    # transform_sequence(angle=60, dz=1.2)
 
-# 🔹 Ejemplo 4: Rotación en X + Traslación completa
-# transform_sequence(angle=75, dx=1.0, dy=0.5, dz=0.8)
+    # 🔹 Ejemplo 4: Rotación en X + Traslación completa
+    # transform_sequence(angle=75, dx=1.0, dy=0.5, dz=0.8)
 
-# 🔹 Ejemplo 5: Rotación en X de 180°
-# transform_sequence(angle=180)
+    # 🔹 Ejemplo 5: Rotación en X de 180°
+    # transform_sequence(angle=180)
 
-# 🔹 Ejemplo 6: Rotación en X negativa
-# transform_sequence(angle=-45, dx=1.0)
+    # 🔹 Ejemplo 6: Rotación en X negativa
+    # transform_sequence(angle=-45, dx=1.0)
 
-# 🔹 Ejemplo 7: Experimenta con tus propios valores
-# transform_sequence(angle=120, dx=1.5, dy=-1.0, dz=0.5)
+    # 🔹 Ejemplo 7: Experimenta con tus propios valores
+    # transform_sequence(angle=120, dx=1.5, dy=-1.0, dz=0.5)
 
-# =============================================================================
-# 🎯 SECCIÓN 5: EJECUCIÓN FINAL - NO MODIFICAR
-# =============================================================================
-plt.show()
\ No newline at end of file
+    # =============================================================================
+    # 🎯 SECCIÓN 5: EJECUCIÓN FINAL - NO MODIFICAR
+    # =============================================================================
+    plt.show()
\ No newline at end of file
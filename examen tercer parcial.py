@@ -4,10 +4,27 @@ SIMULACIÓN CINEMÁTICA DE ROBOT SCARA (RRPR - 4-DOF)
  Línea de orientación añadida al gripper.)
 """
 
+from functools import lru_cache, partial
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import tomllib
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import animation
 
+from exportacion import exportar_animacion
+from instrumentacion import contar, instrumentar_figura, medir
+from formato_trayectoria import guardar_trayectoria
+from perfiles_movimiento import LIMITES_SCARA, PERFILES, Movimiento
+
+LONGITUD_HERRAMIENTA = 300.0 # Longitud fija del vástago
+ALTURA_BASE = 800.0          # Altura de la base de la simulación animada
+
 # ------------------ Módulo de Entrada de Datos ------------------
 def solicitar_valor_numerico(mensaje, valor_por_defecto=None):
     """Solicita y valida entrada numérica del usuario"""
@@ -36,77 +53,277 @@ def matriz_transformacion_DH(angulo_grados, desplazamiento, longitud, angulo_tor
         [0,           0,                    0,                    1]
     ], dtype=np.float64)
 
+class CadenaDH:
+    """Cadena cinemática precompilada a partir de una tabla DH
+
+    Cada fila de la tabla es (tipo, theta_grados, desplazamiento, longitud,
+    angulo_torsion_grados) con tipo 'R' (rotacional) o 'P' (prismática).
+    La variable articular se suma al theta de la fila si es rotacional o al
+    desplazamiento si es prismática. Las partes constantes de cada eslabón
+    (longitud, torsión y, en las prismáticas, la rotación) se calculan una
+    sola vez al construir la cadena.
+    """
+
+    def __init__(self, tabla_DH):
+        self.tabla_DH = tuple((fila[0].upper(), *(float(valor) for valor in fila[1:])) for fila in tabla_DH)
+        self.num_eslabones = len(tabla_DH)
+        self.tipos = tuple(fila[0].upper() for fila in tabla_DH)
+        if any(tipo not in ('R', 'P') for tipo in self.tipos):
+            raise ValueError("El tipo de cada eslabón debe ser 'R' o 'P'.")
+
+        self._theta0 = np.radians([float(fila[1]) for fila in tabla_DH])
+        self._desplazamiento0 = np.array([float(fila[2]) for fila in tabla_DH])
+        self._longitud = np.array([float(fila[3]) for fila in tabla_DH])
+        alpha = np.radians([float(fila[4]) for fila in tabla_DH])
+        self._cos_alpha = np.cos(alpha)
+        self._sin_alpha = np.sin(alpha)
+        self._es_rotacional = tuple(tipo == 'R' for tipo in self.tipos)
+        # Constantes como flotantes de Python para el camino escalar de evaluar()
+        self._constantes = tuple(
+            (float(self._theta0[i]), float(self._desplazamiento0[i]), float(self._longitud[i]),
+             float(self._cos_alpha[i]), float(self._sin_alpha[i]))
+            for i in range(self.num_eslabones))
+
+        # Matrices de eslabón con las entradas constantes ya rellenadas
+        self._T_eslabon = np.zeros((self.num_eslabones, 4, 4), dtype=np.float64)
+        for i in range(self.num_eslabones):
+            self._T_eslabon[i] = matriz_transformacion_DH(
+                float(tabla_DH[i][1]), float(tabla_DH[i][2]),
+                float(tabla_DH[i][3]), float(tabla_DH[i][4]))
+
+    def _actualizar_eslabon(self, i, variable):
+        """Reescribe solo las entradas de la matriz i que dependen de la variable articular"""
+        theta0, desplazamiento0, longitud, cos_alpha, sin_alpha = self._constantes[i]
+        T = self._T_eslabon
+        if self._es_rotacional[i]:
+            # Asignaciones escalares: no se crea ningún array intermedio
+            theta = theta0 + math.radians(variable)
+            cos_theta, sin_theta = math.cos(theta), math.sin(theta)
+            T[i, 0, 0] = cos_theta
+            T[i, 0, 1] = -sin_theta*cos_alpha
+            T[i, 0, 2] = sin_theta*sin_alpha
+            T[i, 0, 3] = longitud*cos_theta
+            T[i, 1, 0] = sin_theta
+            T[i, 1, 1] = cos_theta*cos_alpha
+            T[i, 1, 2] = -cos_theta*sin_alpha
+            T[i, 1, 3] = longitud*sin_theta
+        else:
+            T[i, 2, 3] = desplazamiento0 + variable
+
+    def evaluar(self, variables, salida=None):
+        """Devuelve las transformaciones acumuladas T0_a_i como una pila (n,4,4)
+
+        Si se pasa `salida` (n,4,4) se escribe en ella y no se reserva memoria.
+        Usa matrices de trabajo propias de la cadena: una cadena compartida
+        (obtener_cadena_scara) no debe evaluarse así; cada bucle crea la suya.
+        """
+        if salida is None:
+            salida = np.empty((self.num_eslabones, 4, 4), dtype=np.float64)
+        for i in range(self.num_eslabones):
+            self._actualizar_eslabon(i, float(variables[i]))
+        salida[0] = self._T_eslabon[0]
+        for i in range(1, self.num_eslabones):
+            np.dot(salida[i - 1], self._T_eslabon[i], out=salida[i])  # para 4x4, dot cuesta menos que matmul
+        return salida
+
+    def evaluar_lote(self, variables, salida=None):
+        """Evalúa la cadena para N configuraciones (N,n) y devuelve una pila (N,n,4,4)"""
+        variables = np.asarray(variables, dtype=np.float64).reshape(-1, self.num_eslabones)
+        num_muestras = variables.shape[0]
+        if salida is None:
+            salida = np.empty((num_muestras, self.num_eslabones, 4, 4), dtype=np.float64)
+
+        T = np.empty((num_muestras, 4, 4), dtype=np.float64)
+        for i in range(self.num_eslabones):
+            if self._es_rotacional[i]:
+                matriz_transformacion_DH_lote(self.tabla_DH[i][1] + variables[:, i], self._desplazamiento0[i],
+                                              self._longitud[i], self.tabla_DH[i][4], salida=T)
+            else:
+                # La rotación de una prismática es constante: solo cambia el desplazamiento
+                T[:] = self._T_eslabon[i]
+                T[:, 2, 3] = self._desplazamiento0[i] + variables[:, i]
+
+            if i == 0:
+                salida[:, 0] = T
+            else:
+                np.matmul(salida[:, i - 1], T, out=salida[:, i])
+        return salida
+
 # ------------------ Módulo de Visualización de Ejes ------------------
-def dibujar_ejes(ax, matriz_T, longitud=150):
-    """Dibuja los ejes X (rojo), Y (verde), Z (azul) para una matriz dada"""
+def crear_ejes(ax):
+    """Crea las líneas vacías de un sistema de ejes X (rojo), Y (verde), Z (azul)
+
+    Su posición, orientación y longitud se fijan con actualizar_ejes.
+    """
+    return [ax.plot([], [], [], color=color, linewidth=2.5)[0]
+            for color in ('red', 'green', 'blue')]
+
+def actualizar_ejes(lineas, matriz_T, longitud=150):
+    """Mueve las líneas creadas con crear_ejes a la posición y orientación de una matriz dada"""
     origen = matriz_T[:3, 3]
-    eje_x_dir = matriz_T[:3, 0]
-    eje_y_dir = matriz_T[:3, 1]
-    eje_z_dir = matriz_T[:3, 2]
-
-    ax.plot([origen[0], origen[0] + longitud * eje_x_dir[0]],
-            [origen[1], origen[1] + longitud * eje_x_dir[1]],
-            [origen[2], origen[2] + longitud * eje_x_dir[2]], color='red', linewidth=2.5)
-    ax.plot([origen[0], origen[0] + longitud * eje_y_dir[0]],
-            [origen[1], origen[1] + longitud * eje_y_dir[1]],
-            [origen[2], origen[2] + longitud * eje_y_dir[2]], color='green', linewidth=2.5)
-    ax.plot([origen[0], origen[0] + longitud * eje_z_dir[0]],
-            [origen[1], origen[1] + longitud * eje_z_dir[1]],
-            [origen[2], origen[2] + longitud * eje_z_dir[2]], color='blue', linewidth=2.5)
+    for columna, linea in enumerate(lineas):
+        extremo = origen + longitud * matriz_T[:3, columna]
+        linea.set_data_3d([origen[0], extremo[0]], [origen[1], extremo[1]], [origen[2], extremo[2]])
 
 # ------------------ Módulo de Cálculo Cinemático ------------------
+@lru_cache(maxsize=32)
+def obtener_cadena_scara(longitud_eslabon1, longitud_eslabon2, altura_base, offset_vertical):
+    """Devuelve (y reutiliza) la cadena DH del modelo RRPR para unos parámetros dados
+
+    Variables articulares: θ1 [°], θ2 [°], altura Z de la articulación 3 [mm], θ4 [°].
+    La cadena es compartida: solo se usa para evaluar_lote y tabla_DH, que no
+    la modifican. Para evaluar configuración a configuración, CinematicaSCARA.
+    """
+    return CadenaDH([
+        ('R', 0.0, 0.0,            longitud_eslabon1, 0.0),
+        ('R', 0.0, offset_vertical, longitud_eslabon2, 0.0),
+        ('P', 0.0, -altura_base,    0.0,               0.0),
+        ('R', 0.0, 0.0,            0.0,               0.0),
+    ])
+
+class CinematicaSCARA:
+    """Cinemática directa (modelo RRPR) de un SCARA concreto, configuración a configuración
+
+    Tiene su propia CadenaDH y deja calculado todo lo que no depende de las
+    articulaciones: el origen, el punto de la base y la circunferencia del
+    gripper. Los bucles de animación y planificación crean una y llaman a
+    evaluar() en cada cuadro; por llamada solo se reservan los resultados.
+    """
+
+    PUNTOS_CIRCULO = 60
+
+    def __init__(self, longitud_eslabon1, longitud_eslabon2, altura_base, offset_vertical, radio_efector):
+        self.cadena = CadenaDH(obtener_cadena_scara(float(longitud_eslabon1), float(longitud_eslabon2),
+                                                    float(altura_base), float(offset_vertical)).tabla_DH)
+        self.altura_base = float(altura_base)
+        self.radio_efector = float(radio_efector)
+
+        # Puntos fijos (de solo lectura: se devuelven en cada llamada)
+        self.origen = np.zeros(3)
+        self.punto_base = np.array([0.0, 0.0, self.altura_base])
+        self.origen.flags.writeable = False
+        self.punto_base.flags.writeable = False
+
+        # (0, 0, altura_base, 1) solo tiene dos componentes que no se anulan en T @ P
+        self._base_homogenea = np.array([self.altura_base, 1.0])
+        # Circunferencia del gripper en coordenadas homogéneas (r·cos, r·sin, 1)
+        angulos_circulo = np.linspace(0, 2*np.pi, self.PUNTOS_CIRCULO)
+        self._circulo = np.array([self.radio_efector * np.cos(angulos_circulo),
+                                  self.radio_efector * np.sin(angulos_circulo),
+                                  np.ones(self.PUNTOS_CIRCULO)])
+
+    def evaluar(self, angulo_articulacion1, angulo_articulacion2,
+                desplazamiento_articulacion3_z, angulo_articulacion4):
+        """Misma salida que calcular_cinematica_directa (16 elementos)"""
+        T = self.cadena.evaluar((angulo_articulacion1, angulo_articulacion2,
+                                 desplazamiento_articulacion3_z, angulo_articulacion4))
+
+        # T0_a_i @ (0, 0, altura_base, 1): articulación 1, articulación 2 y muñeca de una vez
+        puntos = T[:3, :3, 2:] @ self._base_homogenea
+        punto_muñeca = puntos[2]
+
+        # Punta de la herramienta (Efector final)
+        extremo_efector = punto_muñeca + T[3, :3, 2] * LONGITUD_HERRAMIENTA
+
+        # Geometría del efector: la circunferencia precalculada girada θ4 y llevada a la punta
+        angulo_actual = math.radians(angulo_articulacion4)
+        cos_actual, sin_actual = math.cos(angulo_actual), math.sin(angulo_actual)
+        x, y, z = extremo_efector.tolist()
+        circulo_x, circulo_y, circulo_z = np.dot(
+            np.array(((cos_actual, -sin_actual, x), (sin_actual, cos_actual, y), (0.0, 0.0, z))), self._circulo)
+
+        punto_referencia_x = extremo_efector[0] + self.radio_efector * cos_actual
+        punto_referencia_y = extremo_efector[1] + self.radio_efector * sin_actual
+        punto_referencia_z = extremo_efector[2]
+
+        return (self.origen, self.punto_base,
+                puntos[0], puntos[1], punto_muñeca,
+                extremo_efector, circulo_x, circulo_y, circulo_z,
+                punto_referencia_x, punto_referencia_y, punto_referencia_z,
+                T[0], T[1], T[2], T[3])
+
+# Una CinematicaSCARA por hilo y juego de parámetros para calcular_cinematica_directa
+_cinematicas_por_hilo = threading.local()
+
 def calcular_cinematica_directa(angulo_articulacion1, angulo_articulacion2,
                                 desplazamiento_articulacion3_z, angulo_articulacion4,
                                 longitud_eslabon1, longitud_eslabon2,
                                 altura_base, offset_vertical, radio_efector):
-    """Calcula la posición y orientación (modelo RRPR)"""
-
-    LONGITUD_HERRAMIENTA = 300.0 # Longitud fija del vástago
-    variacion_altura = float(desplazamiento_articulacion3_z - altura_base)
-
-    # Cadena cinemática (RRPR)
-    T0_a_1 = matriz_transformacion_DH(angulo_articulacion1, 0.0, longitud_eslabon1, 0.0)
-    T1_a_2 = matriz_transformacion_DH(angulo_articulacion2, offset_vertical, longitud_eslabon2, 0.0)
-    T2_a_3 = matriz_transformacion_DH(0.0, variacion_altura, 0.0, 0.0)
-    T3_a_4 = matriz_transformacion_DH(angulo_articulacion4, 0.0, 0.0, 0.0)
-
-    # Cadena de transformación completa
-    T0_a_2 = T0_a_1 @ T1_a_2
-    T0_a_3 = T0_a_2 @ T2_a_3
-    T0_a_4 = T0_a_3 @ T3_a_4
-
-    # Puntos de referencia
-    origen_sistema = np.array([0, 0, 0])
-    punto_base = np.array([0, 0, altura_base])
-
-    P_base_global = np.array([0, 0, altura_base, 1])
-
-    posicion_articulacion1 = (T0_a_1 @ P_base_global)[:3]
-    posicion_articulacion2 = (T0_a_2 @ P_base_global)[:3]
-
-    # Punto de la muñeca (base del vástago)
-    punto_muñeca = (T0_a_3 @ P_base_global)[:3]
+    """Calcula la posición y orientación (modelo RRPR)
+
+    Para llamadas sueltas; en un bucle es más rápido guardar una
+    CinematicaSCARA y llamar a su evaluar().
+    """
+    cinematicas = _cinematicas_por_hilo.__dict__
+    clave = (longitud_eslabon1, longitud_eslabon2, altura_base, offset_vertical, radio_efector)
+    cinematica = cinematicas.get(clave)
+    if cinematica is None:
+        if len(cinematicas) >= 32:
+            cinematicas.clear()
+        cinematica = cinematicas[clave] = CinematicaSCARA(*clave)
+    return cinematica.evaluar(angulo_articulacion1, angulo_articulacion2,
+                              desplazamiento_articulacion3_z, angulo_articulacion4)
+
+# ------------------ Módulo de Cálculo Cinemático por Lotes ------------------
+def matriz_transformacion_DH_lote(angulos_grados, desplazamientos, longitudes, angulo_torsion_grados=0.0,
+                                  salida=None):
+    """Versión vectorizada de matriz_transformacion_DH: devuelve una pila (N,4,4)
+
+    Si se pasa `salida` (N,4,4) se escribe en ella y no se reserva memoria.
+    """
+    theta = np.radians(np.asarray(angulos_grados, dtype=np.float64))
+    desplazamientos = np.asarray(desplazamientos, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    forma = np.broadcast_shapes(theta.shape, desplazamientos.shape, longitudes.shape) or (1,)
+    alpha = math.radians(angulo_torsion_grados)
 
-    # Punta de la herramienta (Efector final)
-    eje_z_efector = T0_a_4[:3, 2]
-    extremo_efector = punto_muñeca + eje_z_efector * LONGITUD_HERRAMIENTA
-
-    # Geometría del efector (círculo)
-    angulo_actual = np.radians(angulo_articulacion4)
-    angulos_circulo = np.linspace(0, 2*np.pi, 60)
-
-    circulo_x = extremo_efector[0] + radio_efector * np.cos(angulos_circulo + angulo_actual)
-    circulo_y = extremo_efector[1] + radio_efector * np.sin(angulos_circulo + angulo_actual)
-    circulo_z = np.full_like(circulo_x, extremo_efector[2])
-
-    punto_referencia_x = extremo_efector[0] + radio_efector * np.cos(angulo_actual)
-    punto_referencia_y = extremo_efector[1] + radio_efector * np.sin(angulo_actual)
-    punto_referencia_z = extremo_efector[2]
-
-    return (origen_sistema, punto_base,
-            posicion_articulacion1, posicion_articulacion2, punto_muñeca,
-            extremo_efector, circulo_x, circulo_y, circulo_z,
-            punto_referencia_x, punto_referencia_y, punto_referencia_z,
+    cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+    cos_alpha, sin_alpha = math.cos(alpha), math.sin(alpha)
+
+    T = np.empty(forma + (4, 4), dtype=np.float64) if salida is None else salida
+    T[..., 2, :] = (0.0, sin_alpha, cos_alpha, 0.0)
+    T[..., 3, :] = (0.0, 0.0, 0.0, 1.0)
+    T[..., 0, 0] = cos_theta
+    T[..., 0, 1] = -sin_theta*cos_alpha
+    T[..., 0, 2] = sin_theta*sin_alpha
+    T[..., 0, 3] = longitudes*cos_theta
+    T[..., 1, 0] = sin_theta
+    T[..., 1, 1] = cos_theta*cos_alpha
+    T[..., 1, 2] = -cos_theta*sin_alpha
+    T[..., 1, 3] = longitudes*sin_theta
+    T[..., 2, 3] = desplazamientos
+    return T
+
+def calcular_cinematica_directa_lote(angulos_art1, angulos_art2,
+                                     desplazamientos_art3_z, angulos_art4,
+                                     longitud_eslabon1, longitud_eslabon2,
+                                     altura_base, offset_vertical):
+    """Calcula la cinemática directa (modelo RRPR) de una trayectoria completa de N muestras
+
+    Devuelve las posiciones (N,3) de articulación 1, articulación 2, muñeca y
+    efector, seguidas de las pilas (N,4,4) T0_a_1, T0_a_2, T0_a_3 y T0_a_4.
+    """
+    variables = np.column_stack(np.broadcast_arrays(
+        np.atleast_1d(np.asarray(angulos_art1, dtype=np.float64)),
+        np.atleast_1d(np.asarray(angulos_art2, dtype=np.float64)),
+        np.atleast_1d(np.asarray(desplazamientos_art3_z, dtype=np.float64)),
+        np.atleast_1d(np.asarray(angulos_art4, dtype=np.float64))))
+
+    # Cadena cinemática (RRPR), una pila de matrices por muestra
+    cadena = obtener_cadena_scara(float(longitud_eslabon1), float(longitud_eslabon2),
+                                  float(altura_base), float(offset_vertical))
+    T_acumuladas = cadena.evaluar_lote(variables)
+    T0_a_1, T0_a_2, T0_a_3, T0_a_4 = (T_acumuladas[:, i] for i in range(4))
+
+    P_base_global = np.array([0, 0, altura_base, 1], dtype=np.float64)
+
+    posiciones_articulacion1 = (T0_a_1 @ P_base_global)[:, :3]
+    posiciones_articulacion2 = (T0_a_2 @ P_base_global)[:, :3]
+    puntos_muñeca = (T0_a_3 @ P_base_global)[:, :3]
+    extremos_efector = puntos_muñeca + T0_a_4[:, :3, 2] * LONGITUD_HERRAMIENTA
+
+    return (posiciones_articulacion1, posiciones_articulacion2,
+            puntos_muñeca, extremos_efector,
             T0_a_1, T0_a_2, T0_a_3, T0_a_4)
 
 # ------------------ Módulo de Visualización (Gripper con Línea de Orientación) ------------------
@@ -116,171 +333,422 @@ def visualizar_configuracion_robot(eje_3d, origen, base,
                                    punto_ref_x, punto_ref_y, punto_ref_z,
                                    limite,
                                    T0_a_1, T0_a_2, T0_a_3, T_efector): # T_efector IS T0_a_4
-    """Dibuja el robot SCARA (RRPR) con línea de orientación en el gripper"""
-
-    eje_3d.set_xlim(-limite, limite)
-    eje_3d.set_ylim(-limite, limite)
-    eje_3d.set_zlim(0, max(1600, limite))
-    eje_3d.set_xlabel('Coordenada X (mm)')
-    eje_3d.set_ylabel('Coordenada Y (mm)')
-    eje_3d.set_zlabel('Coordenada Z (mm)')
-    eje_3d.set_title("Robot SCARA - Configuración Cinemática")
-    eje_3d.set_facecolor('white')
-    eje_3d.view_init(elev=25, azim=45)
-
-    # --- DIBUJAR EJES DE COORDENADAS ---
-    T_Base = np.eye(4)
-    T_Base[:3, 3] = base
-    dibujar_ejes(eje_3d, T_Base, longitud=200) # Eje Base
-
-    T_Frame1 = T0_a_1.copy()
-    T_Frame1[:3, 3] = art1
-    dibujar_ejes(eje_3d, T_Frame1, longitud=150) # Eje Articulación 1
-
-    T_Frame2 = T0_a_2.copy()
-    T_Frame2[:3, 3] = art2
-    dibujar_ejes(eje_3d, T_Frame2, longitud=150) # Eje Articulación 2
-
-    T_Frame_Efector = T_efector.copy() # T_efector es T0_a_4
-    T_Frame_Efector[:3, 3] = efector   # Posición = punta
-    dibujar_ejes(eje_3d, T_Frame_Efector, longitud=100) # Eje Articulación 4 (Rotación)
-    # --- FIN DIBUJAR EJES ---
-
-    # Eslabón 0 (Base)
-    eje_3d.scatter(*origen, color='red', s=80)
-    eje_3d.plot([origen[0], base[0]], [origen[1], base[1]],
-                [origen[2], base[2]], color='red', linewidth=4)
-    eje_3d.text(base[0] + 50, base[1] + 50, base[2] + 20, "Eslabón 0 (Base)", color='black', fontsize=9,
-                bbox=dict(facecolor='white', alpha=0.7, pad=0.5, edgecolor='none'))
-
-
-    # Eslabón 1
-    eje_3d.plot([base[0], art1[0]], [base[1], art1[1]],
-                [base[2], art1[2]], color='#FF5733', linewidth=6)
-    eje_3d.text((base[0] + art1[0]) / 2 + 30, (base[1] + art1[1]) / 2 + 30, (base[2] + art1[2]) / 2 + 20,
-                "Eslabón 1", color='black', fontsize=9,
-                bbox=dict(facecolor='white', alpha=0.7, pad=0.5, edgecolor='none'))
-
-    # Eslabón 2
-    eje_3d.plot([art1[0], art2[0]], [art1[1], art2[1]],
-                [art1[2], art2[2]], color='#33FF57', linewidth=6)
-    eje_3d.text((art1[0] + art2[0]) / 2 + 30, (art1[1] + art2[1]) / 2 + 30,
-                (art1[2] + art2[2]) / 2 + 20,
-                "Eslabón 2", color='black', fontsize=9,
-                bbox=dict(facecolor='white', alpha=0.7, pad=0.5, edgecolor='none'))
-
-
-    # 1. Guía/Collarín (Sleeve) en el Eslabón 2
-    alto_guia = 60.0
-    punto_arriba = [art2[0], art2[1], art2[2] + alto_guia / 2]
-    punto_abajo = [art2[0], art2[1], art2[2] - alto_guia / 2]
-    eje_3d.plot([punto_arriba[0], punto_abajo[0]], [punto_arriba[1], punto_abajo[1]],
-                [punto_arriba[2], punto_abajo[2]], color='#303030', linewidth=12) # Gris oscuro
-    eje_3d.text(art2[0] + 50, art2[1] + 50, art2[2], "Guía Z", color='black', fontsize=8,
-                bbox=dict(facecolor='white', alpha=0.7, pad=0.5, edgecolor='none'))
-
-
-    # 2. Articulación 3 (Pistón / Actuador Z) - OCULTO
-
-    # 3. Eslabón 3 (Vástago Rígido)
-    eje_3d.plot([muñeca[0], efector[0]], [muñeca[1], efector[1]],
-                [muñeca[2], efector[2]], color='#C0C0C0', linewidth=6) # <-- Color Plateado
-    eje_3d.text((muñeca[0] + efector[0]) / 2 + 30, (muñeca[1] + efector[1]) / 2 + 30,
-                (muñeca[2] + efector[2]) / 2,
-                "Eslabón 3 (Vástago)", color='black', fontsize=9,
-                bbox=dict(facecolor='white', alpha=0.7, pad=0.5, edgecolor='none'))
-
-
-    # Efector final (Gripper)
-    eje_3d.plot(circ_x, circ_y, circ_z, color='green', linewidth=4) # Círculo
-    eje_3d.scatter(punto_ref_x, punto_ref_y, punto_ref_z, color='red', s=50) # Punto rojo
-
-    # --- NUEVA LÍNEA DE ORIENTACIÓN ---
-    # Dibuja una línea desde el centro del efector (efector) hasta el punto rojo
-    eje_3d.plot([efector[0], punto_ref_x], [efector[1], punto_ref_y], [efector[2], punto_ref_z],
-                color='purple', linewidth=3) # Línea morada gruesa
-    # --- FIN NUEVA LÍNEA ---
-
-    # Puntos de articulación
-    eje_3d.scatter(art1[0], art1[1], art1[2], color='black', s=25)
-    eje_3d.scatter(art2[0], art2[1], art2[2], color='black', s=40) #Punto de la guía
-    eje_3d.scatter(muñeca[0], muñeca[1], muñeca[2], color='black', s=25)
-    eje_3d.text(efector[0] + 50, efector[1] + 50, efector[2] + 20,
-                "Efector Final", color='black', fontsize=9,
-                bbox=dict(facecolor='white', alpha=0.7, pad=0.5, edgecolor='none'))
-
+    """Dibuja el robot SCARA (RRPR) con línea de orientación en el gripper
+
+    Dibujo puntual de una configuración: crea un RenderizadorSCARA sobre el
+    eje y lo coloca en la pose dada. Para animar conviene reutilizar un
+    mismo RenderizadorSCARA y llamar solo a actualizar() en cada cuadro.
+    """
+    renderizador = RenderizadorSCARA(eje_3d, limite)
+    renderizador.actualizar(origen, base, art1, art2, muñeca, efector,
+                            circ_x, circ_y, circ_z, punto_ref_x, punto_ref_y, punto_ref_z,
+                            T0_a_1, T0_a_2, T0_a_3, T_efector)
+    return renderizador
+
+# ------------------ Módulo de Visualización Persistente ------------------
+class RenderizadorSCARA:
+    """Dibuja el robot SCARA creando los artistas una sola vez
+
+    Las líneas, puntos y textos se crean vacíos y en cada cuadro solo se
+    actualizan sus datos. La base (ejes, origen y eslabón 0) no se mueve:
+    forma parte del fondo y solo artistas_moviles se devuelven para el
+    blitting.
+    """
+
+    ESTILO_TEXTO = dict(color='black', fontsize=9,
+                        bbox=dict(facecolor='white', alpha=0.7, pad=0.5, edgecolor='none'))
+
+    def __init__(self, eje_3d, limite):
+        self.eje_3d = eje_3d
+
+        eje_3d.set_xlim(-limite, limite)
+        eje_3d.set_ylim(-limite, limite)
+        eje_3d.set_zlim(0, max(1600, limite))
+        eje_3d.set_xlabel('Coordenada X (mm)')
+        eje_3d.set_ylabel('Coordenada Y (mm)')
+        eje_3d.set_zlabel('Coordenada Z (mm)')
+        eje_3d.set_title("Robot SCARA - Configuración Cinemática")
+        eje_3d.set_facecolor('white')
+        eje_3d.view_init(elev=25, azim=45)
+
+        def linea(color, ancho, **kwargs):
+            return eje_3d.plot([], [], [], color=color, linewidth=ancho, **kwargs)[0]
+
+        def punto(color, tamaño):
+            return eje_3d.plot([], [], [], 'o', color=color, markersize=tamaño, linestyle='none')[0]
+
+        def texto(contenido, fontsize=9):
+            return eje_3d.text(0, 0, 0, contenido, **dict(self.ESTILO_TEXTO, fontsize=fontsize))
+
+        # Sistemas de ejes (Base, Articulación 1, Articulación 2, Efector)
+        self.ejes_base = crear_ejes(eje_3d)
+        self.ejes_art1 = crear_ejes(eje_3d)
+        self.ejes_art2 = crear_ejes(eje_3d)
+        self.ejes_efector = crear_ejes(eje_3d)
+
+        self.punto_origen = punto('red', 9)
+        self.eslabon0 = linea('red', 4)
+        self.texto_eslabon0 = texto("Eslabón 0 (Base)")
+        self.eslabon1 = linea('#FF5733', 6)
+        self.texto_eslabon1 = texto("Eslabón 1")
+        self.eslabon2 = linea('#33FF57', 6)
+        self.texto_eslabon2 = texto("Eslabón 2")
+        self.guia = linea('#303030', 12)
+        self.texto_guia = texto("Guía Z", fontsize=8)
+        self.vastago = linea('#C0C0C0', 6)
+        self.texto_vastago = texto("Eslabón 3 (Vástago)")
+        self.circulo_efector = linea('green', 4)
+        self.punto_referencia = punto('red', 7)
+        self.linea_orientacion = linea('purple', 3)
+        self.punto_art1 = punto('black', 5)
+        self.punto_art2 = punto('black', 6.3)
+        self.punto_muñeca = punto('black', 5)
+        self.texto_efector = texto("Efector Final")
+
+        self._base_dibujada = None
+        self.artistas_estaticos = self.ejes_base + [self.punto_origen, self.eslabon0, self.texto_eslabon0]
+        self.artistas_moviles = self.ejes_art1 + self.ejes_art2 + self.ejes_efector + [
+            self.eslabon1, self.texto_eslabon1, self.eslabon2, self.texto_eslabon2,
+            self.guia, self.texto_guia, self.vastago, self.texto_vastago,
+            self.circulo_efector, self.punto_referencia, self.linea_orientacion,
+            self.punto_art1, self.punto_art2, self.punto_muñeca, self.texto_efector]
+        self.artistas = self.artistas_estaticos + self.artistas_moviles
+
+    def actualizar(self, origen, base, art1, art2, muñeca, efector,
+                   circ_x, circ_y, circ_z, punto_ref_x, punto_ref_y, punto_ref_z,
+                   T0_a_1, T0_a_2, T0_a_3, T_efector):
+        """Actualiza la escena con la salida de calcular_cinematica_directa y devuelve los artistas móviles"""
+
+        def segmento(linea, p, q):
+            linea.set_data_3d([p[0], q[0]], [p[1], q[1]], [p[2], q[2]])
+
+        # --- BASE (fondo estático): solo se redibuja si cambia su posición ---
+        if self._base_dibujada is None or not np.array_equal(self._base_dibujada, base):
+            self._base_dibujada = np.array(base, dtype=float)
+            T_Base = np.eye(4)
+            T_Base[:3, 3] = base
+            actualizar_ejes(self.ejes_base, T_Base, longitud=200)
+            self.punto_origen.set_data_3d([origen[0]], [origen[1]], [origen[2]])
+            segmento(self.eslabon0, origen, base)
+            self.texto_eslabon0.set_position_3d((base[0] + 50, base[1] + 50, base[2] + 20))
+
+        # --- EJES DE COORDENADAS ---
+        T_Frame1 = T0_a_1.copy()
+        T_Frame1[:3, 3] = art1
+        actualizar_ejes(self.ejes_art1, T_Frame1, longitud=150)
+
+        T_Frame2 = T0_a_2.copy()
+        T_Frame2[:3, 3] = art2
+        actualizar_ejes(self.ejes_art2, T_Frame2, longitud=150)
+
+        T_Frame_Efector = T_efector.copy()
+        T_Frame_Efector[:3, 3] = efector
+        actualizar_ejes(self.ejes_efector, T_Frame_Efector, longitud=100)
+
+        # Eslabones
+        segmento(self.eslabon1, base, art1)
+        self.texto_eslabon1.set_position_3d(((base[0] + art1[0]) / 2 + 30, (base[1] + art1[1]) / 2 + 30,
+                                             (base[2] + art1[2]) / 2 + 20))
+
+        segmento(self.eslabon2, art1, art2)
+        self.texto_eslabon2.set_position_3d(((art1[0] + art2[0]) / 2 + 30, (art1[1] + art2[1]) / 2 + 30,
+                                             (art1[2] + art2[2]) / 2 + 20))
+
+        # Guía/Collarín y vástago
+        alto_guia = 60.0
+        segmento(self.guia, (art2[0], art2[1], art2[2] + alto_guia / 2),
+                 (art2[0], art2[1], art2[2] - alto_guia / 2))
+        self.texto_guia.set_position_3d((art2[0] + 50, art2[1] + 50, art2[2]))
+
+        segmento(self.vastago, muñeca, efector)
+        self.texto_vastago.set_position_3d(((muñeca[0] + efector[0]) / 2 + 30, (muñeca[1] + efector[1]) / 2 + 30,
+                                            (muñeca[2] + efector[2]) / 2))
+
+        # Efector final (Gripper) con línea de orientación
+        self.circulo_efector.set_data_3d(circ_x, circ_y, circ_z)
+        self.punto_referencia.set_data_3d([punto_ref_x], [punto_ref_y], [punto_ref_z])
+        segmento(self.linea_orientacion, efector, (punto_ref_x, punto_ref_y, punto_ref_z))
+
+        # Puntos de articulación
+        self.punto_art1.set_data_3d([art1[0]], [art1[1]], [art1[2]])
+        self.punto_art2.set_data_3d([art2[0]], [art2[1]], [art2[2]])
+        self.punto_muñeca.set_data_3d([muñeca[0]], [muñeca[1]], [muñeca[2]])
+        self.texto_efector.set_position_3d((efector[0] + 50, efector[1] + 50, efector[2] + 20))
+
+        return self.artistas_moviles
 
 # ------------------ Módulo de Animación ------------------
-def ejecutar_simulacion_movimiento(long_eslabon1, long_eslabon2,
-                                   longitud_minima_brazo, longitud_maxima_brazo, radio_efector,
-                                   offset_vertical, num_frames=180,
-                                   angulo_inicial_art1=0.0, angulo_final_art1=90.0,
-                                   angulo_final_art2=120.0,
-                                   rotacion_total_art4=270.0):
-    """Ejecuta la simulación animada del movimiento del robot con todos los ejes móviles"""
-
-    ALTURA_BASE = 800.0
-
+def generar_secuencias_movimiento(longitud_minima_brazo, longitud_maxima_brazo, num_frames=180,
+                                  angulo_inicial_art1=0.0, angulo_final_art1=90.0,
+                                  angulo_final_art2=120.0, rotacion_total_art4=270.0,
+                                  perfil='lineal', fps=25):
+    """Devuelve las secuencias (θ1, θ2, Z, θ4) de la simulación, una muestra por cuadro
+
+    Con perfil 'lineal' cada articulación avanza lo mismo en cada cuadro. Con
+    un perfil de perfiles_movimiento ('trapezoidal', 'quintico', 'curva_s')
+    el movimiento se planifica con LIMITES_SCARA y se muestrea a `fps`
+    cuadros/s: dura (num_frames - 1)/fps o, si los límites no dan para
+    tanto, lo que necesite el perfil (y entonces hay más cuadros).
+    """
     if longitud_maxima_brazo < longitud_minima_brazo:
         longitud_minima_brazo, longitud_maxima_brazo = longitud_maxima_brazo, longitud_minima_brazo
 
-    # Secuencias de movimiento
     punto_medio_z = (longitud_maxima_brazo + longitud_minima_brazo) / 2.0
+    if perfil != 'lineal':
+        movimiento = Movimiento((angulo_inicial_art1, 0.0, longitud_maxima_brazo, 0.0),
+                                (angulo_final_art1, angulo_final_art2, punto_medio_z, rotacion_total_art4),
+                                LIMITES_SCARA['v_max'], LIMITES_SCARA['a_max'], LIMITES_SCARA['j_max'], perfil)
+        duracion = max((num_frames - 1) / fps, movimiento.duracion)
+        num_cuadros = max(num_frames, int(np.ceil(duracion * fps - 1e-9)) + 1)
+        # Estirar el perfil en el tiempo (factor <= 1) solo reduce velocidad, aceleración y jerk
+        escala = movimiento.duracion / duracion if duracion > 0 else 0.0
+        posiciones, _, _ = movimiento.evaluar(np.arange(num_cuadros) / fps * escala)
+        return tuple(posiciones.T)
+
     valores_longitud = np.linspace(longitud_maxima_brazo, punto_medio_z, num_frames) # Movimiento Articulación 3 (Z)
     valores_angulo_art1 = np.linspace(angulo_inicial_art1, angulo_final_art1, num_frames) # Movimiento Articulación 1
     valores_angulo_art2 = np.linspace(0, angulo_final_art2, num_frames)                     # Movimiento Articulación 2
     valores_angulo_art4 = np.linspace(0, rotacion_total_art4, num_frames)                   # Movimiento Articulación 4 (Muñeca)
+    return valores_angulo_art1, valores_angulo_art2, valores_longitud, valores_angulo_art4
+
+def ejecutar_simulacion_movimiento(long_eslabon1, long_eslabon2,
+                                   longitud_minima_brazo, longitud_maxima_brazo, radio_efector,
+                                   offset_vertical, num_frames=180,
+                                   angulo_inicial_art1=0.0, angulo_final_art1=90.0,
+                                   angulo_final_art2=120.0,
+                                   rotacion_total_art4=270.0, perfil='lineal', blit=True):
+    """Ejecuta la simulación animada del movimiento del robot con todos los ejes móviles
+
+    Los artistas se crean una sola vez (RenderizadorSCARA); con `blit` y un
+    backend que lo permita la base queda en el fondo cacheado y solo se
+    redibujan los artistas móviles en cada cuadro.
+    """
+
+    # Secuencias de movimiento
+    valores_angulo_art1, valores_angulo_art2, valores_longitud, valores_angulo_art4 = \
+        generar_secuencias_movimiento(longitud_minima_brazo, longitud_maxima_brazo, num_frames,
+                                      angulo_inicial_art1, angulo_final_art1,
+                                      angulo_final_art2, rotacion_total_art4, perfil)
 
     figura = plt.figure(figsize=(10, 8))
     eje_3d = figura.add_subplot(111, projection='3d')
     limite_visualizacion = max(1600, long_eslabon1 + long_eslabon2 + 300)
 
+    renderizador = RenderizadorSCARA(eje_3d, limite_visualizacion)
+    cinematica = CinematicaSCARA(long_eslabon1, long_eslabon2, ALTURA_BASE, offset_vertical, radio_efector)
+    instrumentar_figura(figura)  # con INSTRUMENTAR: mide cada dibujado del lienzo
+
     def actualizar_cuadro(indice):
-        eje_3d.cla()
-        (origen, base, art1, art2, muñeca, efector,
-         cx, cy, cz, px, py, pz,
-         T0_a_1, T0_a_2, T0_a_3, T_efector) = calcular_cinematica_directa(
-            valores_angulo_art1[indice], # Usa el ángulo variable
-            valores_angulo_art2[indice],
-            valores_longitud[indice],
-            valores_angulo_art4[indice],
-            long_eslabon1, long_eslabon2, ALTURA_BASE,
-            offset_vertical, radio_efector)
-
-        visualizar_configuracion_robot(eje_3d, origen, base, art1, art2, muñeca, efector,
-                                       cx, cy, cz, px, py, pz,
-                                       limite_visualizacion,
-                                       T0_a_1, T0_a_2, T0_a_3, T_efector)
-        return []
-
-    animacion = animation.FuncAnimation(figura, actualizar_cuadro, frames=num_frames,
-                                        interval=40, blit=False, repeat=False)
+        contar("cuadros")
+        with medir("cinematica"):
+            datos = cinematica.evaluar(
+                valores_angulo_art1[indice], # Usa el ángulo variable
+                valores_angulo_art2[indice],
+                valores_longitud[indice],
+                valores_angulo_art4[indice])
+        with medir("artistas"):
+            return renderizador.actualizar(*datos)
+
+    animacion = animation.FuncAnimation(figura, actualizar_cuadro, frames=len(valores_angulo_art1),
+                                        interval=40, blit=blit and figura.canvas.supports_blit,
+                                        repeat=False)
     plt.show()
 
-# ------------------ Programa Principal ------------------
-if __name__ == "__main__":
-
-    print("CONFIGURACIÓN DEL ROBOT SCARA (RRPR) - MODELO INDUSTRIAL")
-    print("=" * 50)
-
-    longitud_eslabon1 = solicitar_valor_numerico("Longitud del brazo proximal (Eslabón 1) [650]: ", 650.0)
-    longitud_eslabon2 = solicitar_valor_numerico("Longitud del brazo distal (Eslabón 2) [720]: ", 720.0)
-    longitud_min_brazo = solicitar_valor_numerico("Altura mínima de trabajo (Art. 3 - Z) [350]: ", 350.0)
-    longitud_max_brazo = solicitar_valor_numerico("Altura máxima de trabajo (Art. 3 - Z) [820]: ", 820.0)
-    radio_efector = solicitar_valor_numerico("Diámetro del gripper [85]: ", 85.0)
-    offset_z = solicitar_valor_numerico("Compensación vertical (Eslabón 2) [-35]: ", -35.0)
-
-    num_frames = int(solicitar_valor_numerico("Número de frames [180]: ", 180))
+# ------------------ Módulo de Exportación sin Ventana ------------------
+def _crear_escena_scara(figura, limite):
+    eje_3d = figura.add_subplot(111, projection='3d')
+    return RenderizadorSCARA(eje_3d, limite)
+
+def _dibujar_cuadro_scara(renderizador, indice, secuencias, cinematica):
+    # `cinematica` llega en el partial: cada proceso trabaja con su propia copia
+    valores_angulo_art1, valores_angulo_art2, valores_longitud, valores_angulo_art4 = secuencias
+    with medir("cinematica"):
+        datos = cinematica.evaluar(
+            valores_angulo_art1[indice], valores_angulo_art2[indice],
+            valores_longitud[indice], valores_angulo_art4[indice])
+    with medir("artistas"):
+        renderizador.actualizar(*datos)
+
+def exportar_simulacion_movimiento(ruta, long_eslabon1, long_eslabon2,
+                                   longitud_minima_brazo, longitud_maxima_brazo, radio_efector,
+                                   offset_vertical, num_frames=180,
+                                   angulo_inicial_art1=0.0, angulo_final_art1=90.0,
+                                   angulo_final_art2=120.0,
+                                   rotacion_total_art4=270.0, perfil='lineal', fps=25, procesos=1):
+    """Renderiza la simulación sin ventana y la guarda como MP4, GIF o secuencia PNG
+
+    Con procesos > 1 los cuadros se reparten entre varios procesos y se
+    reensamblan en orden (ver exportacion.exportar_animacion).
+    """
+    secuencias = generar_secuencias_movimiento(longitud_minima_brazo, longitud_maxima_brazo, num_frames,
+                                               angulo_inicial_art1, angulo_final_art1,
+                                               angulo_final_art2, rotacion_total_art4, perfil, fps)
+    limite_visualizacion = max(1600, long_eslabon1 + long_eslabon2 + 300)
 
-    angulo_inicial_art1 = solicitar_valor_numerico("Ángulo inicial articulación 1 [0]: ", 0.0)
-    angulo_final_art1 = solicitar_valor_numerico("Ángulo final articulación 1 [90]: ", 90.0)
+    return exportar_animacion(
+        ruta,
+        partial(_crear_escena_scara, limite=limite_visualizacion),
+        partial(_dibujar_cuadro_scara, secuencias=secuencias,
+                cinematica=CinematicaSCARA(long_eslabon1, long_eslabon2, ALTURA_BASE,
+                                           offset_vertical, radio_efector)),
+        len(secuencias[0]), fps=fps, figsize=(10, 8), procesos=procesos)
 
-    angulo_final_art2 = solicitar_valor_numerico("Ángulo final articulación 2 [120]: ", 120.0)
-    rotacion_total_art4 = solicitar_valor_numerico("Rotación total articulación 4 (Muñeca) [270]: ", 270.0)
+def guardar_trayectoria_simulacion(ruta, long_eslabon1, long_eslabon2,
+                                   longitud_minima_brazo, longitud_maxima_brazo, radio_efector,
+                                   offset_vertical, num_frames=180,
+                                   angulo_inicial_art1=0.0, angulo_final_art1=90.0,
+                                   angulo_final_art2=120.0,
+                                   rotacion_total_art4=270.0, perfil='lineal', fps=25):
+    """Guarda la trayectoria de la simulación en un archivo .tray (ver formato_trayectoria)
+
+    Cada cuadro es una muestra a 1/fps s con (θ1, θ2, Z, θ4) y la pose de la
+    herramienta (orientación del efector con origen en la punta).
+    """
+    secuencias = generar_secuencias_movimiento(longitud_minima_brazo, longitud_maxima_brazo, num_frames,
+                                               angulo_inicial_art1, angulo_final_art1,
+                                               angulo_final_art2, rotacion_total_art4, perfil, fps)
+    salida_cinematica = calcular_cinematica_directa_lote(*secuencias, long_eslabon1, long_eslabon2,
+                                                         ALTURA_BASE, offset_vertical)
+    poses = salida_cinematica[7].copy()
+    poses[:, :3, 3] = salida_cinematica[3]
+
+    cadena = obtener_cadena_scara(float(long_eslabon1), float(long_eslabon2),
+                                  float(ALTURA_BASE), float(offset_vertical))
+    parametros = dict(long_eslabon1=long_eslabon1, long_eslabon2=long_eslabon2,
+                      longitud_minima_brazo=longitud_minima_brazo, longitud_maxima_brazo=longitud_maxima_brazo,
+                      radio_efector=radio_efector, offset_vertical=offset_vertical,
+                      altura_base=ALTURA_BASE, longitud_herramienta=LONGITUD_HERRAMIENTA)
+    return guardar_trayectoria(ruta, np.arange(len(secuencias[0])) / fps, np.column_stack(secuencias), poses,
+                               modelo="SCARA RRPR", tabla_dh=cadena.tabla_DH, parametros=parametros,
+                               unidades={'tiempo': 's', 'articulaciones': ['°', '°', 'mm', '°'], 'poses': 'mm'})
+
+# ------------------ Módulo de Configuración por Lotes ------------------
+# Parámetros de ejecutar_simulacion_movimiento con sus valores por defecto
+PARAMETROS_POR_DEFECTO = {
+    'long_eslabon1': 650.0,
+    'long_eslabon2': 720.0,
+    'longitud_minima_brazo': 350.0,
+    'longitud_maxima_brazo': 820.0,
+    'radio_efector': 85.0,
+    'offset_vertical': -35.0,
+    'num_frames': 180,
+    'angulo_inicial_art1': 0.0,
+    'angulo_final_art1': 90.0,
+    'angulo_final_art2': 120.0,
+    'rotacion_total_art4': 270.0,
+    'perfil': 'lineal',
+}
+PERFILES_SIMULACION = ('lineal',) + PERFILES
+
+def solicitar_parametros():
+    """Pide los parámetros de la simulación uno a uno (modo interactivo original)"""
+    return {
+        'long_eslabon1': solicitar_valor_numerico("Longitud del brazo proximal (Eslabón 1) [650]: ", 650.0),
+        'long_eslabon2': solicitar_valor_numerico("Longitud del brazo distal (Eslabón 2) [720]: ", 720.0),
+        'longitud_minima_brazo': solicitar_valor_numerico("Altura mínima de trabajo (Art. 3 - Z) [350]: ", 350.0),
+        'longitud_maxima_brazo': solicitar_valor_numerico("Altura máxima de trabajo (Art. 3 - Z) [820]: ", 820.0),
+        'radio_efector': solicitar_valor_numerico("Diámetro del gripper [85]: ", 85.0),
+        'offset_vertical': solicitar_valor_numerico("Compensación vertical (Eslabón 2) [-35]: ", -35.0),
+
+        'num_frames': int(solicitar_valor_numerico("Número de frames [180]: ", 180)),
+
+        'angulo_inicial_art1': solicitar_valor_numerico("Ángulo inicial articulación 1 [0]: ", 0.0),
+        'angulo_final_art1': solicitar_valor_numerico("Ángulo final articulación 1 [90]: ", 90.0),
+
+        'angulo_final_art2': solicitar_valor_numerico("Ángulo final articulación 2 [120]: ", 120.0),
+        'rotacion_total_art4': solicitar_valor_numerico("Rotación total articulación 4 (Muñeca) [270]: ", 270.0),
+    }
+
+def normalizar_parametros(conjunto, base=None):
+    """Completa un conjunto de parámetros con `base` (o los valores por defecto) y valida sus claves"""
+    desconocidas = set(conjunto) - set(PARAMETROS_POR_DEFECTO) - {'exportar'}
+    if desconocidas:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(sorted(desconocidas))}")
+    parametros = dict(PARAMETROS_POR_DEFECTO if base is None else base)
+    parametros.update(conjunto)
+    for clave, valor_por_defecto in PARAMETROS_POR_DEFECTO.items():
+        parametros[clave] = type(valor_por_defecto)(parametros[clave])
+    if parametros['perfil'] not in PERFILES_SIMULACION:
+        raise ValueError(f"Perfil desconocido: {parametros['perfil']} (opciones: {', '.join(PERFILES_SIMULACION)})")
+    return parametros
+
+def cargar_conjuntos_parametros(ruta, base=None):
+    """Lee uno o varios conjuntos de parámetros de un archivo JSON o TOML
+
+    El archivo puede contener un único conjunto (objeto/tabla) o una lista
+    bajo la clave "simulaciones" (en TOML, tablas [[simulaciones]]); un
+    JSON también puede ser directamente una lista. Cada conjunto puede
+    incluir "exportar" con la ruta de salida de esa simulación.
+    """
+    if str(ruta).lower().endswith('.toml'):
+        with open(ruta, 'rb') as archivo:
+            contenido = tomllib.load(archivo)
+    else:
+        with open(ruta, encoding='utf-8') as archivo:
+            contenido = json.load(archivo)
+
+    if isinstance(contenido, dict):
+        contenido = contenido.get('simulaciones', [contenido])
+    return [normalizar_parametros(conjunto, base) for conjunto in contenido]
+
+def ejecutar_lote_simulaciones(conjuntos, exportar=None, procesos=1, ruta_trayectoria=None):
+    """Ejecuta varios conjuntos de parámetros seguidos en el mismo proceso
+
+    `exportar` puede contener "{indice}" para numerar las salidas; si no hay
+    ruta de exportación la simulación se muestra en una ventana. Con
+    `ruta_trayectoria` (que también admite "{indice}") la trayectoria de
+    cada simulación se guarda además en un archivo .tray.
+    """
+    for indice, parametros in enumerate(conjuntos):
+        parametros = dict(parametros)
+        ruta = parametros.pop('exportar', None) or exportar
+        print(f"Simulación {indice + 1}/{len(conjuntos)}: " +
+              ", ".join(f"{clave}={valor}" for clave, valor in parametros.items()))
+        if ruta_trayectoria:
+            ruta_guardada = guardar_trayectoria_simulacion(ruta_trayectoria.format(indice=indice), **parametros)
+            print(f"Trayectoria guardada en {ruta_guardada}")
+        if ruta:
+            ruta = ruta.format(indice=indice)
+            exportar_simulacion_movimiento(ruta, procesos=procesos, **parametros)
+            print(f"Simulación exportada en {ruta}")
+        else:
+            ejecutar_simulacion_movimiento(**parametros)
+
+def crear_analizador_argumentos():
+    """Construye el analizador de la línea de órdenes del simulador"""
+    analizador = argparse.ArgumentParser(
+        description="Simulación cinemática de robot SCARA (RRPR). Sin argumentos "
+                    "pide los parámetros de forma interactiva.")
+    analizador.add_argument('--config', help="archivo JSON o TOML con uno o varios conjuntos de parámetros")
+    analizador.add_argument('--exportar', help="ruta de salida (.mp4, .gif o carpeta PNG); admite {indice}")
+    analizador.add_argument('--procesos', type=int, default=1, help="procesos para renderizar al exportar")
+    analizador.add_argument('--guardar-trayectoria', help="archivo .tray donde guardar la trayectoria; admite {indice}")
+    for clave, valor_por_defecto in PARAMETROS_POR_DEFECTO.items():
+        analizador.add_argument('--' + clave.replace('_', '-'), dest=clave,
+                                type=type(valor_por_defecto), default=None,
+                                choices=PERFILES_SIMULACION if clave == 'perfil' else None,
+                                help=f"por defecto {valor_por_defecto}")
+    return analizador
+
+def main(argumentos=None):
+    argumentos = sys.argv[1:] if argumentos is None else argumentos
+
+    if not argumentos:
+        print("CONFIGURACIÓN DEL ROBOT SCARA (RRPR) - MODELO INDUSTRIAL")
+        print("=" * 50)
+        # EXPORTAR_ANIMACION=salida.mp4 renderiza sin ventana en lugar de animar
+        ejecutar_lote_simulaciones([solicitar_parametros()],
+                                   exportar=os.environ.get("EXPORTAR_ANIMACION"),
+                                   procesos=int(os.environ.get("EXPORTAR_PROCESOS", 1)))
+        return
+
+    opciones = crear_analizador_argumentos().parse_args(argumentos)
+    base = normalizar_parametros({clave: getattr(opciones, clave) for clave in PARAMETROS_POR_DEFECTO
+                                  if getattr(opciones, clave) is not None})
+    conjuntos = cargar_conjuntos_parametros(opciones.config, base) if opciones.config else [base]
+    ejecutar_lote_simulaciones(conjuntos, exportar=opciones.exportar, procesos=opciones.procesos,
+                               ruta_trayectoria=opciones.guardar_trayectoria)
 
-    ejecutar_simulacion_movimiento(longitud_eslabon1, longitud_eslabon2,
-                                   longitud_min_brazo, longitud_max_brazo, radio_efector, offset_z,
-                                   num_frames=num_frames,
-                                   angulo_inicial_art1=angulo_inicial_art1, angulo_final_art1=angulo_final_art1,
-                                   angulo_final_art2=angulo_final_art2,
-                                   rotacion_total_art4=rotacion_total_art4)
\ No newline at end of file
+# ------------------ Programa Principal ------------------
+if __name__ == "__main__":
+    main()
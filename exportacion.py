@@ -0,0 +1,325 @@
+"""
+EXPORTACIÓN DE ANIMACIONES SIN VENTANA (Agg)
+
+Renderiza los cuadros de una animación en un lienzo Agg y los envía a un
+vídeo MP4 (ffmpeg), a un GIF (Pillow) o a una secuencia numerada de PNG, sin
+abrir ninguna ventana y sin esperar el tiempo real de la animación.
+
+Uso desde los scripts con bucles de animación:
+    EXPORTAR_ANIMACION=salida.gif python "tarea parcial 2.py"
+"""
+
+import collections
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib
+
+# Con exportación activa se usa Agg antes de que los scripts creen figuras
+if os.environ.get("EXPORTAR_ANIMACION"):
+    matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import GifImagePlugin, Image
+
+from instrumentacion import contar, instrumentar_figura, medir
+from planificador_cuadros import PlanificadorCuadros
+
+EXTENSIONES_VIDEO = ('.mp4', '.mkv', '.mov', '.avi')
+
+# ------------------ Escritores de Cuadros ------------------
+class EscritorCuadros:
+    """Recibe imágenes RGBA (alto, ancho, 4) en orden y las escribe en `ruta`
+
+    - .mp4/.mkv/.mov/.avi: vídeo vía ffmpeg (tubería rawvideo)
+    - .gif: GIF animado vía Pillow, escrito cuadro a cuadro (cada uno con su paleta)
+    - cualquier otra ruta: secuencia PNG; si no contiene un patrón '%d' se
+      trata como carpeta y se escriben cuadro_00000.png, cuadro_00001.png, ...
+    """
+
+    def __init__(self, ruta, fps=25):
+        self.ruta = str(ruta)
+        self.fps = fps
+        self.num_cuadros = 0
+        self._proceso = None
+        self._archivo_gif = None
+
+        extension = os.path.splitext(self.ruta)[1].lower()
+        if extension in EXTENSIONES_VIDEO + ('.gif',):
+            os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+        if extension in EXTENSIONES_VIDEO:
+            self.formato = 'video'
+            self._ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+            if self._ffmpeg is None:
+                raise RuntimeError("No se encontró ffmpeg; exporta a .gif o a una secuencia PNG.")
+        elif extension == '.gif':
+            self.formato = 'gif'
+        else:
+            self.formato = 'png'
+            if '%' not in self.ruta:
+                os.makedirs(self.ruta, exist_ok=True)
+                self.ruta = os.path.join(self.ruta, 'cuadro_%05d.png')
+            else:
+                os.makedirs(os.path.dirname(self.ruta) or '.', exist_ok=True)
+
+    def _abrir_video(self, alto, ancho):
+        self._proceso = subprocess.Popen(
+            [self._ffmpeg, '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{ancho}x{alto}', '-r', str(self.fps),
+             '-i', '-',
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', self.ruta],
+            stdin=subprocess.PIPE)
+
+    def _escribir_gif(self, imagen):
+        # Cabecera (con la extensión de bucle) al llegar el primer cuadro; el resto
+        # se añade al archivo según llega, así no se guardan los cuadros en memoria
+        cuadro = Image.fromarray(imagen).convert('RGB').quantize(method=Image.Quantize.FASTOCTREE)
+        if self._archivo_gif is None:
+            self._archivo_gif = open(self.ruta, 'wb')
+            cabecera, _ = GifImagePlugin.getheader(cuadro, info={'loop': 0})
+            self._archivo_gif.write(b''.join(cabecera))
+        datos = GifImagePlugin.getdata(cuadro, duration=int(round(1000 / self.fps)), include_color_table=True)
+        self._archivo_gif.write(b''.join(datos))
+
+    def escribir(self, imagen):
+        """Añade un cuadro RGBA al final de la salida"""
+        imagen = np.ascontiguousarray(imagen, dtype=np.uint8)
+        if self.formato == 'video':
+            if self._proceso is None:
+                self._abrir_video(*imagen.shape[:2])
+            self._proceso.stdin.write(imagen.tobytes())
+        elif self.formato == 'gif':
+            self._escribir_gif(imagen)
+        else:
+            Image.fromarray(imagen).save(self.ruta % self.num_cuadros)
+        self.num_cuadros += 1
+
+    def cerrar(self):
+        """Termina la escritura (cierra ffmpeg o el archivo GIF)"""
+        if self._proceso is not None:
+            self._proceso.stdin.close()
+            if self._proceso.wait() != 0:
+                raise RuntimeError(f"ffmpeg terminó con error al escribir {self.ruta}")
+            self._proceso = None
+        if self._archivo_gif is not None:
+            self._archivo_gif.write(b';')  # fin del GIF
+            self._archivo_gif.close()
+            self._archivo_gif = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+# ------------------ Renderizado sin Ventana ------------------
+def crear_figura_sin_ventana(figsize=(10, 8), dpi=100):
+    """Crea una figura con lienzo Agg que no depende de pyplot ni abre ventanas"""
+    figura = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figura)
+    return figura
+
+def capturar_cuadro(figura, capa=None):
+    """Dibuja la figura (o solo su capa móvil) y devuelve una copia de su imagen RGBA"""
+    if capa is None:
+        figura.canvas.draw()
+    else:
+        capa.actualizar()
+    return np.array(figura.canvas.buffer_rgba())
+
+def _capa_de_escena(figura, escena):
+    # Las escenas que declaran sus artistas móviles se dibujan sobre un fondo cacheado
+    moviles = getattr(escena, 'artistas_moviles', None)
+    return FondoEstatico(figura, moviles) if moviles else None
+
+def renderizar_cuadros(crear_escena, dibujar_cuadro, indices, figsize=(10, 8), dpi=100):
+    """Renderiza los cuadros `indices` en una figura propia y va devolviendo sus imágenes (generador)"""
+    figura = crear_figura_sin_ventana(figsize, dpi)
+    escena = crear_escena(figura)
+    instrumentar_figura(figura)
+    capa = None
+    for indice in indices:
+        contar("cuadros")
+        dibujar_cuadro(escena, indice)
+        if capa is None:
+            capa = _capa_de_escena(figura, escena)
+        yield capturar_cuadro(figura, capa)
+
+def _renderizar_bloque(argumentos):
+    # Un bloque viaja entero de vuelta al proceso principal
+    return list(renderizar_cuadros(*argumentos))
+
+def exportar_animacion(ruta, crear_escena, dibujar_cuadro, num_cuadros, fps=25,
+                       figsize=(10, 8), dpi=100, procesos=1, cuadros_por_bloque=16):
+    """Renderiza `num_cuadros` sin ventana y los escribe en `ruta`
+
+    crear_escena(figura) prepara los artistas y devuelve la escena;
+    dibujar_cuadro(escena, indice) la actualiza para un cuadro. Con
+    procesos > 1 ambas deben poder serializarse (funciones de módulo o
+    functools.partial): cada proceso renderiza bloques contiguos de cuadros
+    y los bloques se escriben en orden conforme van llegando. Como mucho hay
+    2*procesos bloques pendientes a la vez, así que la memoria no crece con
+    num_cuadros.
+    """
+    with EscritorCuadros(ruta, fps) as escritor:
+        if procesos <= 1:
+            for imagen in renderizar_cuadros(crear_escena, dibujar_cuadro, range(num_cuadros), figsize, dpi):
+                escritor.escribir(imagen)
+        else:
+            bloques = ((crear_escena, dibujar_cuadro, range(inicio, min(inicio + cuadros_por_bloque, num_cuadros)),
+                        figsize, dpi)
+                       for inicio in range(0, num_cuadros, cuadros_por_bloque))
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                pendientes = collections.deque()
+                for bloque in bloques:
+                    pendientes.append(ejecutor.submit(_renderizar_bloque, bloque))
+                    if len(pendientes) >= 2 * procesos:
+                        for imagen in pendientes.popleft().result():
+                            escritor.escribir(imagen)
+                while pendientes:
+                    for imagen in pendientes.popleft().result():
+                        escritor.escribir(imagen)
+    return escritor.num_cuadros
+
+# ------------------ Fondo Estático (blitting) ------------------
+class FondoEstatico:
+    """Separa una figura en un fondo estático cacheado y una capa de artistas móviles
+
+    El fondo (ejes, geometría de referencia...) se dibuja completo una vez y
+    se guarda con copy_from_bbox; en cada cuadro se restaura y solo se
+    redibujan los artistas móviles. Cualquier redibujado completo (cambio de
+    tamaño, rotación de la vista) vuelve a capturar el fondo.
+    """
+
+    def __init__(self, figura, artistas_moviles):
+        self.figura = figura
+        self.canvas = figura.canvas
+        self.artistas_moviles = list(artistas_moviles)
+        for artista in self.artistas_moviles:
+            artista.set_animated(True)
+        self._fondo = None
+        self._conexion = self.canvas.mpl_connect('draw_event', self._al_dibujar)
+
+    def _al_dibujar(self, evento):
+        self._fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+        self._dibujar_moviles()
+
+    def _dibujar_moviles(self):
+        for artista in self.artistas_moviles:
+            # Las colecciones 3D solo se proyectan durante el dibujado completo del eje
+            if hasattr(artista, 'do_3d_projection'):
+                artista.do_3d_projection()
+            self.figura.draw_artist(artista)
+
+    def actualizar(self):
+        """Compone el cuadro actual: fondo cacheado + capa móvil"""
+        if self._fondo is None or not self.canvas.supports_blit:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._fondo)
+            self._dibujar_moviles()
+            self.canvas.blit(self.figura.bbox)
+
+    def desactivar(self):
+        """Devuelve los artistas móviles al dibujado normal de la figura"""
+        self.canvas.mpl_disconnect(self._conexion)
+        for artista in self.artistas_moviles:
+            artista.set_animated(False)
+
+# ------------------ Sustituto de plt.pause ------------------
+class GrabadorAnimacion:
+    """Sustituye a plt.pause en los bucles de animación de los scripts
+
+    Sin ruta se comporta igual que antes (plt.pause). Con ruta captura la
+    figura en cada llamada y la escribe en la salida; una pausa larga se
+    conserva repitiendo el cuadro round(pausa * fps) veces.
+    """
+
+    def __init__(self, ruta=None, fps=25):
+        self.fps = fps
+        self.escritor = EscritorCuadros(ruta, fps) if ruta else None
+        self._ventana_abierta = False
+
+    def cuadro(self, pausa=0.05, figura=None, capa=None):
+        """Muestra (o graba) el estado actual de la figura
+
+        Con una `capa` (FondoEstatico) solo se redibujan sus artistas móviles.
+        """
+        figura = capa.figura if capa is not None else (figura if figura is not None else plt.gcf())
+        instrumentar_figura(figura)
+        contar("cuadros")
+        if self.escritor is None:
+            if capa is None:
+                # plt.pause dibuja la figura (intervalos 'dibujo') y luego espera
+                with medir("pausa"):
+                    plt.pause(pausa)
+                return
+            if not self._ventana_abierta:
+                plt.show(block=False)
+                self._ventana_abierta = True
+            capa.actualizar()
+            with medir("pausa"):
+                capa.canvas.start_event_loop(pausa)
+            return
+        with medir("captura"):
+            imagen = capturar_cuadro(figura, capa)
+        with medir("escritura"):
+            for _ in range(max(1, int(round(pausa * self.fps)))):
+                self.escritor.escribir(imagen)
+
+    def recorrer(self, num_cuadros, fps=None, figura=None, capa=None, saltar_cuadros=True):
+        """Itera los índices de cuadro y presenta (o graba) cada uno al terminar el cuerpo del bucle
+
+        En modo interactivo el ritmo lo marca un PlanificadorCuadros a `fps`
+        de reloj (no plt.pause): si el dibujado se retrasa se saltan cuadros
+        y al final se imprime el fps logrado y el jitter. Al exportar se
+        graban todos los cuadros, cada uno durante 1/fps segundos.
+        """
+        fps = fps or self.fps
+        if self.escritor is not None:
+            for indice in range(num_cuadros):
+                yield indice
+                self.cuadro(1.0 / fps, figura, capa)
+            return
+
+        figura = capa.figura if capa is not None else (figura if figura is not None else plt.gcf())
+        instrumentar_figura(figura)
+        if not self._ventana_abierta:
+            plt.show(block=False)
+            self._ventana_abierta = True
+
+        def esperar(segundos):
+            with medir("espera"):
+                figura.canvas.start_event_loop(segundos)
+
+        planificador = PlanificadorCuadros(fps, saltar_cuadros, esperar=esperar)
+        for indice in planificador.recorrer(num_cuadros):
+            yield indice
+            contar("cuadros")
+            if capa is not None:
+                capa.actualizar()
+            else:
+                figura.canvas.draw()
+            with medir("eventos"):
+                figura.canvas.flush_events()
+        print(planificador.texto_informe())
+
+    def mostrar(self, pausa_final=1.0, figura=None):
+        """En modo interactivo llama a plt.show(); al exportar graba el estado final y cierra"""
+        if self.escritor is None:
+            plt.show()
+        else:
+            self.cuadro(pausa_final, figura)
+            self.escritor.cerrar()
+            print(f"Animación exportada: {self.escritor.num_cuadros} cuadros en {self.escritor.ruta}")
+
+def grabador_desde_entorno(fps=None):
+    """Crea un GrabadorAnimacion según EXPORTAR_ANIMACION y EXPORTAR_FPS"""
+    if fps is None:
+        fps = float(os.environ.get("EXPORTAR_FPS", 25))
+    return GrabadorAnimacion(os.environ.get("EXPORTAR_ANIMACION") or None, fps)
@@ -0,0 +1,265 @@
+"""
+FLUJO DE TRAYECTORIAS POR TRAMOS (GENERADORES)
+
+ejecutar_simulacion_movimiento materializa cada secuencia articular con
+np.linspace(..., num_frames) antes de empezar. Aquí la trayectoria es una
+cadena de generadores que se pasan tramos de tamaño fijo, así que la
+memoria no depende de la duración y el movimiento puede no tener fin:
+
+    fuente (perfil articular) -> cinemática -> métricas -> sumideros
+
+Cada tramo es un diccionario de arrays con las mismas filas:
+
+    'tiempo'          (k,)       s
+    'articulaciones'  (k, 4)     θ1 [°], θ2 [°], Z [mm], θ4 [°]
+    'punta'           (k, 3)     mm, tras cinematica_scara
+    'poses'           (k, 4, 4)  pose de la herramienta, tras cinematica_scara
+
+Ejemplo: una hora de recoger y colocar a 100 Hz guardada en disco
+    metricas = AcumuladorMetricas()
+    tramos = perfil_por_puntos(PUNTOS_RECOGER_COLOCAR, [1.0, 0.5, 1.0, 0.5], fps=100, repetir=True)
+    tramos = cinematica_scara(limitar_duracion(tramos, 3600.0))
+    consumir(guardar_en_archivo(metricas(tramos), "registro.tray", capacidad=360_001))
+"""
+
+import argparse
+
+import numpy as np
+
+from cargador_scripts import cargar_script
+from formato_trayectoria import EscritorTrayectoria
+
+def _simulador():
+    return cargar_script("examen tercer parcial.py")
+
+# ------------------ Fuentes (Perfiles Articulares) ------------------
+def perfil_por_puntos(puntos, duraciones, fps=25, tamaño_tramo=1024, repetir=False, t_inicio=0.0):
+    """Interpola linealmente entre puntos articulares (m, 4) y entrega tramos a `fps` muestras/s
+
+    duraciones[i] es el tiempo [s] entre puntos[i] y puntos[i+1]. Con
+    repetir=True el recorrido se cierra (del último punto se vuelve al
+    primero, con duraciones de longitud m) y se repite sin fin.
+    """
+    puntos = np.asarray(puntos, dtype=np.float64)
+    if repetir:
+        puntos = np.vstack((puntos, puntos[:1]))
+    duraciones = np.asarray(duraciones, dtype=np.float64)
+    if len(duraciones) != len(puntos) - 1:
+        raise ValueError("Se necesita una duración por cada segmento entre puntos")
+    if repetir and duraciones.sum() <= 0:
+        raise ValueError("Para repetir un recorrido su duración debe ser mayor que 0")
+    if np.any(duraciones <= 0):
+        raise ValueError("La duración de cada segmento entre puntos debe ser mayor que 0")
+    inicios = np.concatenate(([0.0], np.cumsum(duraciones)))
+    total = inicios[-1]
+    # Con fin, la última muestra cae exactamente en el último punto
+    num_muestras = None if repetir else int(np.floor(total * fps + 1e-9)) + 1
+
+    muestra = 0
+    while num_muestras is None or muestra < num_muestras:
+        k = np.arange(muestra, muestra + tamaño_tramo if num_muestras is None
+                      else min(muestra + tamaño_tramo, num_muestras))
+        tiempo = k / fps
+        t_recorrido = np.mod(tiempo, total) if repetir else tiempo
+        segmento = np.clip(np.searchsorted(inicios, t_recorrido, side='right') - 1, 0, len(duraciones) - 1)
+        fraccion = ((t_recorrido - inicios[segmento]) / duraciones[segmento])[:, None]
+        articulaciones = puntos[segmento] + fraccion * (puntos[segmento + 1] - puntos[segmento])
+        yield {'tiempo': t_inicio + tiempo, 'articulaciones': articulaciones}
+        muestra += len(k)
+
+def perfil_simulacion(parametros, fps=25, tamaño_tramo=1024):
+    """Mismo movimiento que generar_secuencias_movimiento (un cuadro por muestra), por tramos"""
+    if parametros.get('perfil', 'lineal') != 'lineal':
+        # Un perfil temporizado de la simulación dura segundos: se genera entero y se trocea
+        secuencias = _simulador().generar_secuencias_movimiento(
+            parametros['longitud_minima_brazo'], parametros['longitud_maxima_brazo'], parametros['num_frames'],
+            parametros['angulo_inicial_art1'], parametros['angulo_final_art1'],
+            parametros['angulo_final_art2'], parametros['rotacion_total_art4'], parametros['perfil'], fps)
+        articulaciones = np.column_stack(secuencias)
+        return ({'tiempo': np.arange(inicio, min(inicio + tamaño_tramo, len(articulaciones))) / fps,
+                 'articulaciones': articulaciones[inicio:inicio + tamaño_tramo]}
+                for inicio in range(0, len(articulaciones), tamaño_tramo))
+    altura_minima = min(parametros['longitud_minima_brazo'], parametros['longitud_maxima_brazo'])
+    altura_maxima = max(parametros['longitud_minima_brazo'], parametros['longitud_maxima_brazo'])
+    inicio = (parametros['angulo_inicial_art1'], 0.0, altura_maxima, 0.0)
+    fin = (parametros['angulo_final_art1'], parametros['angulo_final_art2'],
+           (altura_maxima + altura_minima) / 2.0, parametros['rotacion_total_art4'])
+    return perfil_por_puntos([inicio, fin], [(parametros['num_frames'] - 1) / fps], fps, tamaño_tramo)
+
+def perfil_temporizado(recorrido, fps=1000, tamaño_tramo=8192, repetir=False, t_inicio=0.0):
+    """Muestrea por tramos un perfiles_movimiento.Recorrido (trapezoidal, quíntico o curva S)
+
+    Con repetir=True el recorrido (cerrado con cerrar=True) se repite sin fin.
+    """
+    total = recorrido.duracion
+    if repetir and total <= 0:
+        raise ValueError("Para repetir un recorrido su duración debe ser mayor que 0")
+    num_muestras = None if repetir else int(np.floor(total * fps + 1e-9)) + 1
+    muestra = 0
+    while num_muestras is None or muestra < num_muestras:
+        k = np.arange(muestra, muestra + tamaño_tramo if num_muestras is None
+                      else min(muestra + tamaño_tramo, num_muestras))
+        tiempo = k / fps
+        articulaciones, _, _ = recorrido.evaluar(np.mod(tiempo, total) if repetir else tiempo)
+        yield {'tiempo': t_inicio + tiempo, 'articulaciones': articulaciones}
+        muestra += len(k)
+
+def desde_archivo(trayectoria, tamaño_tramo=65536):
+    """Lee por tramos una Trayectoria (.tray) abierta con np.memmap"""
+    for inicio in range(0, len(trayectoria), tamaño_tramo):
+        tramo = slice(inicio, inicio + tamaño_tramo)
+        datos = {'tiempo': np.asarray(trayectoria.tiempo[tramo]),
+                 'articulaciones': np.asarray(trayectoria.articulaciones[tramo])}
+        if trayectoria.poses is not None:
+            datos['poses'] = np.asarray(trayectoria.poses[tramo])
+            datos['punta'] = datos['poses'][:, :3, 3]
+        yield datos
+
+def limitar_duracion(tramos, duracion):
+    """Corta un flujo (posiblemente infinito) tras la muestra con t = duracion [s]"""
+    for tramo in tramos:
+        dentro = tramo['tiempo'] <= duracion + 1e-9
+        if not dentro.all():
+            if dentro.any():
+                yield {clave: valor[dentro] for clave, valor in tramo.items()}
+            return
+        yield tramo
+
+# ------------------ Etapas ------------------
+def cinematica_scara(tramos, long_eslabon1=650.0, long_eslabon2=720.0, altura_base=800.0, offset_vertical=-35.0):
+    """Añade a cada tramo la punta de herramienta y su pose (calcular_cinematica_directa_lote)"""
+    calcular_cinematica_directa_lote = _simulador().calcular_cinematica_directa_lote
+    for tramo in tramos:
+        salida = calcular_cinematica_directa_lote(*tramo['articulaciones'].T, long_eslabon1, long_eslabon2,
+                                                  altura_base, offset_vertical)
+        poses = salida[7]
+        poses[:, :3, 3] = salida[3]
+        yield dict(tramo, punta=salida[3], poses=poses)
+
+class AcumuladorMetricas:
+    """Etapa que deja pasar los tramos y acumula las métricas de la punta
+
+    Las mismas métricas que barrido_scara, pero incrementales: la longitud
+    del recorrido enlaza el último punto de un tramo con el primero del
+    siguiente.
+    """
+
+    def __init__(self):
+        self.num_muestras = 0
+        self.longitud_trayectoria = 0.0
+        self.alcance_maximo = 0.0
+        self.minimo = np.full(3, np.inf)
+        self.maximo = np.full(3, -np.inf)
+        self._ultimo_punto = None
+
+    def __call__(self, tramos):
+        for tramo in tramos:
+            self.actualizar(tramo['punta'])
+            yield tramo
+
+    def actualizar(self, punta):
+        if len(punta) == 0:
+            return
+        if self._ultimo_punto is not None:
+            self.longitud_trayectoria += float(np.linalg.norm(punta[0] - self._ultimo_punto))
+        self.longitud_trayectoria += float(np.linalg.norm(np.diff(punta, axis=0), axis=1).sum())
+        self.alcance_maximo = max(self.alcance_maximo, float(np.hypot(punta[:, 0], punta[:, 1]).max()))
+        np.minimum(self.minimo, punta.min(axis=0), out=self.minimo)
+        np.maximum(self.maximo, punta.max(axis=0), out=self.maximo)
+        self._ultimo_punto = punta[-1].copy()
+        self.num_muestras += len(punta)
+
+    def resultados(self):
+        extension = self.maximo - self.minimo
+        return {
+            'num_muestras': self.num_muestras,
+            'alcance_maximo': self.alcance_maximo,
+            'longitud_trayectoria': self.longitud_trayectoria,
+            'extension_x': float(extension[0]),
+            'extension_y': float(extension[1]),
+            'extension_z': float(extension[2]),
+            'altura_minima': float(self.minimo[2]),
+        }
+
+# ------------------ Sumideros ------------------
+def guardar_en_archivo(tramos, ruta, capacidad, **metadatos):
+    """Escribe los tramos en un archivo .tray (con poses si el flujo las trae) y los deja pasar"""
+    escritor = None
+    try:
+        for tramo in tramos:
+            if escritor is None:
+                escritor = EscritorTrayectoria(ruta, capacidad, tramo['articulaciones'].shape[1],
+                                               con_poses='poses' in tramo, **metadatos)
+            escritor.agregar(tramo['tiempo'], tramo['articulaciones'], tramo.get('poses'))
+            yield tramo
+    finally:
+        if escritor is not None:
+            escritor.cerrar()
+
+def renderizar(tramos, grabador, long_eslabon1=650.0, long_eslabon2=720.0, offset_vertical=-35.0,
+               radio_efector=85.0, fps=25, cada=1):
+    """Dibuja cada `cada` muestras con RenderizadorSCARA y las presenta (o graba) con `grabador`
+
+    grabador es un exportacion.GrabadorAnimacion: en pantalla o, con ruta
+    .mp4/.gif/PNG, exportando sin ventana y con memoria acotada. Llama a
+    grabador.mostrar() al acabar.
+    """
+    import matplotlib.pyplot as plt
+    from exportacion import FondoEstatico
+
+    simulador = _simulador()
+    figura = plt.figure(figsize=(10, 8))
+    renderizador = simulador.RenderizadorSCARA(figura.add_subplot(111, projection='3d'),
+                                               max(1600, long_eslabon1 + long_eslabon2 + 300))
+    cinematica = simulador.CinematicaSCARA(long_eslabon1, long_eslabon2, simulador.ALTURA_BASE,
+                                           offset_vertical, radio_efector)
+    capa = None
+    for tramo in tramos:
+        for q in tramo['articulaciones'][::cada]:
+            renderizador.actualizar(*cinematica.evaluar(*q))
+            if capa is None:
+                capa = FondoEstatico(figura, renderizador.artistas_moviles)
+            grabador.cuadro(cada / fps, capa=capa)
+        yield tramo
+    if capa is not None:
+        capa.desactivar()
+    grabador.mostrar(figura=figura)
+
+def consumir(tramos):
+    """Recorre el flujo hasta el final (lo que pone en marcha toda la cadena) y devuelve cuántas muestras pasaron"""
+    return sum(len(tramo['tiempo']) for tramo in tramos)
+
+# ------------------ Recoger y Colocar ------------------
+# Ciclo de ejemplo (θ1, θ2, Z, θ4): aproximación a la recogida, recogida, aproximación a la entrega, entrega
+PUNTOS_RECOGER_COLOCAR = [
+    (-30.0, 60.0, 820.0, 0.0),
+    (-30.0, 60.0, 500.0, 0.0),
+    (45.0, -40.0, 820.0, 90.0),
+    (45.0, -40.0, 500.0, 90.0),
+]
+
+def main(argumentos=None):
+    analizador = argparse.ArgumentParser(description="Simulación continua de recoger y colocar por tramos")
+    analizador.add_argument('--horas', type=float, default=1.0, help="duración simulada")
+    analizador.add_argument('--fps', type=float, default=100.0, help="muestras por segundo")
+    analizador.add_argument('--guardar', help="archivo .tray donde registrar la trayectoria")
+    opciones = analizador.parse_args(argumentos)
+
+    duracion = opciones.horas * 3600.0
+    metricas = AcumuladorMetricas()
+    tramos = perfil_por_puntos(PUNTOS_RECOGER_COLOCAR, [1.0, 0.5, 1.0, 0.5], opciones.fps,
+                               tamaño_tramo=8192, repetir=True)
+    tramos = metricas(cinematica_scara(limitar_duracion(tramos, duracion)))
+    if opciones.guardar:
+        tabla_dh = _simulador().obtener_cadena_scara(650.0, 720.0, 800.0, -35.0).tabla_DH
+        # Misma cuenta de muestras que los generadores de tramos
+        capacidad = int(np.floor(duracion * opciones.fps + 1e-9)) + 1
+        tramos = guardar_en_archivo(tramos, opciones.guardar, capacidad,
+                                    modelo="SCARA RRPR", tabla_dh=tabla_dh,
+                                    unidades={'tiempo': 's', 'articulaciones': ['°', '°', 'mm', '°']})
+    consumir(tramos)
+    for clave, valor in metricas.resultados().items():
+        print(f"{clave}: {valor}")
+
+if __name__ == "__main__":
+    main()
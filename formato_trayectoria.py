@@ -0,0 +1,190 @@
+"""
+FORMATO DE ARCHIVO DE TRAYECTORIAS (.tray) MAPEADO EN MEMORIA
+
+Guarda trayectorias articulares (simuladas o registradas) en un único
+archivo binario que se lee con np.memmap: abrir un registro de varios GB es
+instantáneo y solo se leen del disco las muestras de la ventana consultada.
+
+Estructura del archivo (little-endian):
+
+    bytes 0-7     firma b"TRAYECT\\0"
+    bytes 8-11    versión del formato (uint32, actualmente 1)
+    bytes 12-15   longitud L de la cabecera JSON (uint32)
+    bytes 16-16+L cabecera JSON en UTF-8, rellenada con espacios
+    ...           arrays contiguos, cada uno alineado a 64 bytes
+
+La cabecera JSON contiene:
+
+    modelo              nombre del brazo (p. ej. "SCARA RRPR")
+    tabla_dh            filas (tipo, theta [°], d, a, alpha [°]) de la cadena DH
+    parametros          parámetros libres del modelo o de la simulación
+    unidades            unidades de tiempo y de cada articulación
+    num_muestras        muestras válidas N
+    num_articulaciones  n
+    arrays              {nombre: {"offset", "dtype", "shape"}} con offset en
+                        bytes desde el inicio del archivo y shape real
+
+Arrays:
+
+    tiempo          (N,)      float64, segundos, creciente
+    articulaciones  (N, n)    float64, en el orden de la tabla DH
+    poses           (N, 4, 4) float64, opcional: pose de la herramienta en cada muestra
+
+El espacio se reserva para una capacidad máxima al crear el archivo; al
+cerrarlo se reescribe la cabecera con el N real, así que un registro puede
+escribirse por tramos sin conocer su longitud final.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+FIRMA = b"TRAYECT\0"
+VERSION = 1
+_PREAMBULO = struct.Struct("<8sII")
+_ALINEACION = 64
+_BLOQUE_CABECERA = 4096
+
+def _alinear(posicion, alineacion=_ALINEACION):
+    return -(-posicion // alineacion) * alineacion
+
+def _leer_cabecera(ruta):
+    with open(ruta, 'rb') as archivo:
+        firma, version, longitud = _PREAMBULO.unpack(archivo.read(_PREAMBULO.size))
+        if firma != FIRMA:
+            raise ValueError(f"{ruta} no es un archivo de trayectoria")
+        if version != VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        return json.loads(archivo.read(longitud).decode('utf-8'))
+
+# ------------------ Escritura ------------------
+class EscritorTrayectoria:
+    """Crea un archivo de trayectoria con espacio para `capacidad` muestras y lo rellena por tramos"""
+
+    def __init__(self, ruta, capacidad, num_articulaciones, modelo="", tabla_dh=(), parametros=None,
+                 unidades=None, con_poses=False):
+        self.ruta = str(ruta)
+        self.capacidad = int(capacidad)
+        self.num_muestras = 0
+        self.cabecera = {
+            'modelo': modelo,
+            'tabla_dh': [list(fila) for fila in tabla_dh],
+            'parametros': parametros or {},
+            'unidades': unidades or {},
+            'num_muestras': self.capacidad,
+            'num_articulaciones': int(num_articulaciones),
+            'arrays': {},
+        }
+        formas = {'tiempo': (self.capacidad,), 'articulaciones': (self.capacidad, int(num_articulaciones))}
+        if con_poses:
+            formas['poses'] = (self.capacidad, 4, 4)
+
+        # Se reserva sitio para la cabecera escrita con la capacidad (más holgura para
+        # los offsets): la definitiva, con N <= capacidad, nunca ocupa más
+        for nombre, forma in formas.items():
+            self.cabecera['arrays'][nombre] = {'offset': 0, 'dtype': '<f8', 'shape': list(forma)}
+        holgura = 20 * len(formas)
+        longitud = _alinear(_PREAMBULO.size + len(self._json()) + holgura, _BLOQUE_CABECERA) - _PREAMBULO.size
+        posicion = _PREAMBULO.size + longitud
+        for nombre, forma in formas.items():
+            self.cabecera['arrays'][nombre]['offset'] = posicion
+            posicion = _alinear(posicion + int(np.prod(forma)) * 8)
+        self._longitud_cabecera = longitud
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+        with open(self.ruta, 'wb') as archivo:
+            archivo.truncate(posicion)
+        self._escribir_cabecera()
+        self.arrays = {nombre: np.memmap(self.ruta, dtype='<f8', mode='r+',
+                                         offset=self.cabecera['arrays'][nombre]['offset'], shape=forma)
+                       for nombre, forma in formas.items()}
+
+    def _json(self):
+        return json.dumps(self.cabecera, ensure_ascii=False).encode('utf-8')
+
+    def _escribir_cabecera(self):
+        contenido = self._json()
+        if len(contenido) > self._longitud_cabecera:
+            raise ValueError("La cabecera de la trayectoria no cabe en el espacio reservado")
+        with open(self.ruta, 'r+b') as archivo:
+            archivo.write(_PREAMBULO.pack(FIRMA, VERSION, self._longitud_cabecera))
+            archivo.write(contenido.ljust(self._longitud_cabecera, b' '))
+
+    def agregar(self, tiempo, articulaciones, poses=None):
+        """Añade un tramo de muestras al final de lo ya escrito"""
+        tiempo = np.atleast_1d(np.asarray(tiempo, dtype=np.float64))
+        inicio, fin = self.num_muestras, self.num_muestras + len(tiempo)
+        if fin > self.capacidad:
+            raise ValueError(f"La trayectoria supera su capacidad ({self.capacidad} muestras)")
+        self.arrays['tiempo'][inicio:fin] = tiempo
+        self.arrays['articulaciones'][inicio:fin] = articulaciones
+        if 'poses' in self.arrays:
+            if poses is None:
+                raise ValueError("Este archivo guarda poses: hay que pasarlas en cada tramo")
+            self.arrays['poses'][inicio:fin] = poses
+        self.num_muestras = fin
+
+    def cerrar(self):
+        """Vuelca los datos y fija en la cabecera el número real de muestras"""
+        for array in self.arrays.values():
+            array.flush()
+        self.arrays = {}
+        self.cabecera['num_muestras'] = self.num_muestras
+        for descripcion in self.cabecera['arrays'].values():
+            descripcion['shape'][0] = self.num_muestras
+        self._escribir_cabecera()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+def guardar_trayectoria(ruta, tiempo, articulaciones, poses=None, **metadatos):
+    """Escribe de una vez una trayectoria completa (metadatos: modelo, tabla_dh, parametros, unidades)"""
+    articulaciones = np.asarray(articulaciones, dtype=np.float64)
+    with EscritorTrayectoria(ruta, len(articulaciones), articulaciones.shape[1],
+                             con_poses=poses is not None, **metadatos) as escritor:
+        escritor.agregar(tiempo, articulaciones, poses)
+    return ruta
+
+# ------------------ Lectura ------------------
+class Trayectoria:
+    """Trayectoria abierta con np.memmap: los arrays se leen bajo demanda"""
+
+    def __init__(self, ruta, modo='r'):
+        self.ruta = str(ruta)
+        self.cabecera = _leer_cabecera(self.ruta)
+        self.modelo = self.cabecera['modelo']
+        self.tabla_dh = [tuple(fila) for fila in self.cabecera['tabla_dh']]
+        self.parametros = self.cabecera['parametros']
+        self.unidades = self.cabecera['unidades']
+        self.num_muestras = self.cabecera['num_muestras']
+
+        self.arrays = {}
+        for nombre, descripcion in self.cabecera['arrays'].items():
+            forma = tuple(descripcion['shape'])
+            if self.num_muestras == 0:
+                self.arrays[nombre] = np.empty(forma, dtype=descripcion['dtype'])
+            else:
+                self.arrays[nombre] = np.memmap(self.ruta, dtype=descripcion['dtype'], mode=modo,
+                                                offset=descripcion['offset'], shape=forma)
+        self.tiempo = self.arrays['tiempo']
+        self.articulaciones = self.arrays['articulaciones']
+        self.poses = self.arrays.get('poses')
+
+    def __len__(self):
+        return self.num_muestras
+
+    def indices_ventana(self, t_inicio, t_fin):
+        """Tramo [inicio, fin) de las muestras con t_inicio <= t < t_fin (búsqueda binaria)"""
+        return slice(int(np.searchsorted(self.tiempo, t_inicio, side='left')),
+                     int(np.searchsorted(self.tiempo, t_fin, side='left')))
+
+    def ventana(self, t_inicio, t_fin):
+        """Vistas (tiempo, articulaciones, poses o None) de la ventana de tiempo pedida"""
+        tramo = self.indices_ventana(t_inicio, t_fin)
+        return (self.tiempo[tramo], self.articulaciones[tramo],
+                None if self.poses is None else self.poses[tramo])
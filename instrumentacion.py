@@ -0,0 +1,168 @@
+"""
+INSTRUMENTACIÓN OPCIONAL DE LOS BUCLES DE ANIMACIÓN
+
+Temporizadores (gestores de contexto) y contadores para saber en qué se va
+el tiempo de cada cuadro: cinemática, creación/actualización de artistas,
+dibujado del lienzo y presentación en pantalla. Los intervalos pueden
+anidarse (plt.pause incluye el dibujado de la figura), así que los totales
+de distintas etapas no siempre se suman.
+
+    with medir("cinematica"):
+        datos = calcular_cinematica_directa(...)
+    contar("cuadros_saltados", 3)
+
+Desactivada (lo normal) medir() devuelve siempre el mismo contexto vacío y
+contar() vuelve sin hacer nada: el coste es una llamada y una comprobación.
+Se activa con activar() o con la variable de entorno INSTRUMENTAR:
+
+    INSTRUMENTAR=1 python "examen tercer parcial.py"            informe al salir
+    INSTRUMENTAR=traza.json python "examen tercer parcial.py"   además, traza de Chrome
+
+La traza (formato Trace Event de Chrome) se abre en chrome://tracing o en
+https://ui.perfetto.dev y muestra cada intervalo sobre la línea de tiempo.
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+_NULO = contextlib.nullcontext()
+_activa = False
+_ruta_traza = None
+_intervalos = []   # (etapa, inicio_ns, duracion_ns, hilo)
+_contadores = {}
+_eventos_contador = []   # (nombre, instante_ns, valor acumulado) para la traza
+_origen_ns = time.perf_counter_ns()
+
+class _Intervalo:
+    __slots__ = ('etapa', 'inicio')
+
+    def __init__(self, etapa):
+        self.etapa = etapa
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        fin = time.perf_counter_ns()
+        _intervalos.append((self.etapa, self.inicio, fin - self.inicio, threading.get_ident()))
+        return False
+
+# ------------------ Activación ------------------
+def activar(ruta_traza=None):
+    """Empieza a registrar; al salir del programa se imprime el informe (y se exporta la traza)"""
+    global _activa, _ruta_traza
+    if not _activa:
+        atexit.register(_al_salir)
+    _activa = True
+    _ruta_traza = ruta_traza
+
+def desactivar():
+    global _activa
+    _activa = False
+
+def activa():
+    return _activa
+
+def reiniciar():
+    """Descarta lo registrado (p. ej. entre dos ejecuciones que se quieren comparar)"""
+    global _origen_ns
+    _intervalos.clear()
+    _contadores.clear()
+    _eventos_contador.clear()
+    _origen_ns = time.perf_counter_ns()
+
+# ------------------ Temporizadores y Contadores ------------------
+def medir(etapa):
+    """Gestor de contexto que mide el tiempo del bloque como un intervalo de `etapa`"""
+    if not _activa:
+        return _NULO
+    return _Intervalo(etapa)
+
+def contar(nombre, cantidad=1):
+    """Suma `cantidad` al contador `nombre`"""
+    if not _activa:
+        return
+    valor = _contadores.get(nombre, 0) + cantidad
+    _contadores[nombre] = valor
+    _eventos_contador.append((nombre, time.perf_counter_ns(), valor))
+
+def instrumentar_figura(figura):
+    """Mide cada dibujado completo de la figura ('dibujo'), cada draw_artist del blitting
+    ('dibujo_artista') y cada volcado a pantalla ('presentacion')
+
+    Envuelve los métodos en la propia instancia (solo si la instrumentación
+    está activa y una sola vez por figura), así que los ejes deben existir ya.
+    """
+    if not _activa or getattr(figura, '_instrumentada', False):
+        return figura
+
+    def envolver(objeto, metodo, etapa):
+        original = getattr(objeto, metodo)
+
+        def medido(*args, **kwargs):
+            with _Intervalo(etapa):
+                return original(*args, **kwargs)
+        setattr(objeto, metodo, medido)
+
+    envolver(figura, 'draw', 'dibujo')
+    envolver(figura, 'draw_artist', 'dibujo_artista')
+    for eje in figura.axes:
+        envolver(eje, 'draw_artist', 'dibujo_artista')
+    envolver(figura.canvas, 'blit', 'presentacion')
+    figura._instrumentada = True
+    return figura
+
+# ------------------ Informe ------------------
+def informe():
+    """Estadísticas por etapa (llamadas, total, media, p95 y máximo en ms) y contadores"""
+    duraciones = {}
+    for etapa, _, duracion, _ in _intervalos:
+        duraciones.setdefault(etapa, []).append(duracion)
+    etapas = {}
+    for etapa, valores in duraciones.items():
+        ms = np.asarray(valores) / 1e6
+        etapas[etapa] = {'llamadas': len(ms), 'total_ms': float(ms.sum()), 'media_ms': float(ms.mean()),
+                         'p95_ms': float(np.percentile(ms, 95)), 'maximo_ms': float(ms.max())}
+    return {'etapas': etapas, 'contadores': dict(_contadores)}
+
+def texto_informe():
+    """Tabla legible del informe, con las etapas ordenadas por tiempo total"""
+    datos = informe()
+    lineas = [f"{'etapa':16s} {'llamadas':>9s} {'total ms':>11s} {'media ms':>9s} {'p95 ms':>9s} {'máx ms':>9s}"]
+    for etapa, e in sorted(datos['etapas'].items(), key=lambda par: -par[1]['total_ms']):
+        lineas.append(f"{etapa:16s} {e['llamadas']:9d} {e['total_ms']:11.1f} {e['media_ms']:9.3f} "
+                      f"{e['p95_ms']:9.3f} {e['maximo_ms']:9.3f}")
+    for nombre, valor in datos['contadores'].items():
+        lineas.append(f"{nombre}: {valor}")
+    return "\n".join(lineas)
+
+def exportar_traza_chrome(ruta):
+    """Escribe los intervalos y contadores en formato Trace Event de Chrome (tiempos en µs)"""
+    pid = os.getpid()
+    eventos = [{'name': etapa, 'cat': 'animacion', 'ph': 'X', 'pid': pid, 'tid': hilo,
+                'ts': (inicio - _origen_ns) / 1e3, 'dur': duracion / 1e3}
+               for etapa, inicio, duracion, hilo in _intervalos]
+    eventos += [{'name': nombre, 'ph': 'C', 'pid': pid, 'ts': (instante - _origen_ns) / 1e3,
+                 'args': {nombre: valor}}
+                for nombre, instante, valor in _eventos_contador]
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, archivo)
+    return ruta
+
+def _al_salir():
+    if not (_intervalos or _contadores):
+        return
+    print("\nInstrumentación:\n" + texto_informe())
+    if _ruta_traza:
+        print(f"Traza de Chrome guardada en {exportar_traza_chrome(_ruta_traza)}")
+
+_entorno = os.environ.get("INSTRUMENTAR", "")
+if _entorno and _entorno != "0":
+    activar(None if _entorno.lower() in ("1", "si", "sí", "true") else _entorno)
@@ -0,0 +1,272 @@
+"""
+MAPA PRECALCULADO DEL ESPACIO DE TRABAJO
+
+Muestrea el espacio articular de un brazo, acumula en una rejilla regular
+(píxeles en 2D, vóxeles en 3D) qué celdas alcanza el efector y la mayor
+manipulabilidad de Yoshikawa, sqrt(det(J·Jᵀ)), observada en cada una, y
+responde en O(1) si un punto es alcanzable.
+
+El mapa se guarda como una carpeta con dos .npy (alcanzable uint8 y
+manipulabilidad float32) más meta.json; al recargarlo los arrays se abren
+con np.load(mmap_mode='r'), así que incluso rejillas grandes cargan al
+instante y solo se leen las celdas consultadas.
+
+Al ser un muestreo sobre celdas, la consulta puede fallar en los dos
+sentidos: una celda cuenta como alcanzable en cuanto alguna muestra cae en
+ella, así que en las celdas que corta el borde del espacio de trabajo los
+puntos de su parte inalcanzable salen como alcanzables (falsos positivos);
+y las celdas alcanzables sin ninguna muestra quedan marcadas como no
+alcanzables (falsos negativos), de ahí que la resolución y el número de
+muestras deban ir acordes. Con es_alcanzable(puntos, exacto=True), los
+puntos de celdas en la frontera de la rejilla se resuelven con la prueba
+exacta del brazo (un test de radio para los brazos del curso).
+"""
+
+import json
+import os
+
+import numpy as np
+
+from cargador_scripts import cargar_script
+
+# ------------------ Cinemáticas Directas por Lotes ------------------
+def cinematica_brazo_planar(l1, l2):
+    """Efector (N,2) del brazo planar de 'tarea parcial 2.py' para q = (theta1, theta2) [rad]"""
+    cinematica_directa = cargar_script("tarea parcial 2.py").cinematica_directa
+
+    def posiciones(q):
+        _, _, (x_ef, y_ef) = cinematica_directa(q[:, 0], q[:, 1], l1, l2)
+        return np.column_stack((x_ef, y_ef))
+    return posiciones
+
+def cinematica_brazo_base_giratoria(l1, l2):
+    """Efector (N,3) del brazo de 'tarea 2 parcial 2.py' para q = (theta_base, theta1, theta2) [rad]"""
+    def posiciones(q):
+        theta_base, theta1, theta2 = q[:, 0], q[:, 1], q[:, 2]
+        x_ef = l1*np.cos(theta1) + l2*np.cos(theta1 + theta2)
+        z_ef = l1*np.sin(theta1) + l2*np.sin(theta1 + theta2)
+        return np.column_stack((x_ef*np.cos(theta_base), x_ef*np.sin(theta_base), z_ef))
+    return posiciones
+
+def cinematica_scara(longitud_eslabon1, longitud_eslabon2, altura_base, offset_vertical):
+    """Punta de herramienta (N,3) del SCARA de 'examen tercer parcial.py' para q = (θ1, θ2, Z, θ4)"""
+    calcular_cinematica_directa_lote = cargar_script("examen tercer parcial.py").calcular_cinematica_directa_lote
+
+    def posiciones(q):
+        return calcular_cinematica_directa_lote(q[:, 0], q[:, 1], q[:, 2], q[:, 3],
+                                                longitud_eslabon1, longitud_eslabon2,
+                                                altura_base, offset_vertical)[3]
+    return posiciones
+
+# ------------------ Pruebas Exactas de Alcance ------------------
+def alcance_anular(l1, l2):
+    """Prueba exacta |l1 - l2| <= ||p|| <= l1 + l2 de un brazo de dos eslabones con giros completos"""
+    def alcanzable(puntos):
+        radio = np.linalg.norm(puntos, axis=1)
+        return (radio >= abs(l1 - l2)) & (radio <= l1 + l2)
+    return alcanzable
+
+def alcance_scara(longitud_eslabon1, longitud_eslabon2, altura_minima, altura_maxima):
+    """Prueba exacta del SCARA: anillo en XY y altura de herramienta entre sus extremos"""
+    en_anillo = alcance_anular(longitud_eslabon1, longitud_eslabon2)
+
+    def alcanzable(puntos):
+        return en_anillo(puntos[:, :2]) & (puntos[:, 2] >= altura_minima) & (puntos[:, 2] <= altura_maxima)
+    return alcanzable
+
+def manipulabilidad(cinematica, q, paso=1e-6):
+    """Índice de Yoshikawa sqrt(det(J·Jᵀ)) con el jacobiano por diferencias centrales"""
+    columnas = []
+    for j in range(q.shape[1]):
+        delta = np.zeros(q.shape[1])
+        delta[j] = paso
+        columnas.append((cinematica(q + delta) - cinematica(q - delta)) / (2*paso))
+    J = np.stack(columnas, axis=-1)  # (N, dimension, grados_libertad)
+    return np.sqrt(np.clip(np.linalg.det(J @ J.transpose(0, 2, 1)), 0.0, None))
+
+# ------------------ Mapa del Espacio de Trabajo ------------------
+def _vecindad(rejilla, reducir):
+    """Aplica `reducir` (np.logical_or o np.logical_and) a la vecindad 3^d de cada celda; fuera de la rejilla es False"""
+    resultado = np.pad(np.asarray(rejilla, dtype=bool), 1)
+    for eje in range(resultado.ndim):
+        n = resultado.shape[eje]
+        resultado = reducir.reduce([np.take(resultado, np.arange(k, n - 2 + k), axis=eje) for k in range(3)])
+    return resultado
+
+class MapaEspacioTrabajo:
+    """Rejilla de alcanzabilidad y manipulabilidad con consultas O(1)
+
+    `prueba_exacta(puntos) -> máscara (N,)` es opcional y no se guarda con
+    el mapa: la asignan las funciones mapa_* al construirlo o cargarlo.
+    """
+
+    def __init__(self, alcanzable, manipulabilidad, origen, resolucion, parametros=None, prueba_exacta=None):
+        self.alcanzable = alcanzable
+        self.manipulabilidad = manipulabilidad
+        self.origen = np.asarray(origen, dtype=float)
+        self.resolucion = float(resolucion)
+        self.forma = np.array(alcanzable.shape)
+        self.parametros = parametros or {}
+        self.prueba_exacta = prueba_exacta
+        self._frontera = None
+
+    @classmethod
+    def construir(cls, cinematica, rangos_articulares, limites, resolucion,
+                  num_muestras=1_000_000, tamaño_bloque=100_000, semilla=0, parametros=None):
+        """Muestrea uniformemente el espacio articular y rellena la rejilla
+
+        rangos_articulares: [(min, max), ...] por articulación.
+        limites: [(min, max), ...] por eje cartesiano de la rejilla.
+        """
+        rangos_articulares = np.asarray(rangos_articulares, dtype=float)
+        limites = np.asarray(limites, dtype=float)
+        origen = limites[:, 0]
+        forma = tuple(np.ceil((limites[:, 1] - limites[:, 0]) / resolucion).astype(int))
+
+        alcanzable = np.zeros(forma, dtype=np.uint8)
+        manip = np.zeros(forma, dtype=np.float32)
+        mapa = cls(alcanzable, manip, origen, resolucion, parametros)
+
+        generador = np.random.default_rng(semilla)
+        for inicio in range(0, num_muestras, tamaño_bloque):
+            n = min(tamaño_bloque, num_muestras - inicio)
+            q = generador.uniform(rangos_articulares[:, 0], rangos_articulares[:, 1],
+                                  size=(n, len(rangos_articulares)))
+            indices, dentro = mapa.indices(cinematica(q))
+            lineales = np.ravel_multi_index(tuple(indices[dentro].T), forma)
+            alcanzable.flat[lineales] = 1
+            np.maximum.at(manip.reshape(-1), lineales,
+                          manipulabilidad(cinematica, q[dentro]).astype(np.float32))
+        return mapa
+
+    def indices(self, puntos):
+        """Índices de celda (N,d) de unos puntos y máscara de los que caen dentro de la rejilla"""
+        puntos = np.asarray(puntos, dtype=float).reshape(-1, len(self.forma))
+        indices = np.floor((puntos - self.origen) / self.resolucion).astype(np.int64)
+        dentro = np.all((indices >= 0) & (indices < self.forma), axis=1)
+        return indices, dentro
+
+    def _consultar(self, rejilla, puntos, valor_fuera):
+        indices, dentro = self.indices(puntos)
+        resultado = np.full(len(indices), valor_fuera, dtype=rejilla.dtype)
+        resultado[dentro] = rejilla[tuple(indices[dentro].T)]
+        return resultado
+
+    def frontera(self):
+        """Máscara de las celdas cuya vecindad mezcla celdas alcanzables y no alcanzables"""
+        if self._frontera is None:
+            # Se dilata un paso más para cubrir celdas que el borde real corta solo por una esquina
+            mezcla = _vecindad(self.alcanzable, np.logical_or) & ~_vecindad(self.alcanzable, np.logical_and)
+            self._frontera = _vecindad(mezcla, np.logical_or)
+        return self._frontera
+
+    def es_alcanzable(self, puntos, exacto=False):
+        """Máscara booleana (N,) de alcanzabilidad; fuera de la rejilla es False
+
+        Con exacto=True los puntos en celdas de frontera se resuelven con
+        `prueba_exacta`, lo que elimina los falsos positivos del borde y los
+        falsos negativos de celdas sin muestras junto a él.
+        """
+        if not exacto:
+            return self._consultar(self.alcanzable, puntos, 0).astype(bool)
+        if self.prueba_exacta is None:
+            raise ValueError("Este mapa no tiene prueba exacta de alcance")
+        puntos = np.asarray(puntos, dtype=float).reshape(-1, len(self.forma))
+        resultado = self._consultar(self.alcanzable, puntos, 0).astype(bool)
+        en_frontera = self._consultar(self.frontera(), puntos, False)
+        resultado[en_frontera] = self.prueba_exacta(puntos[en_frontera])
+        return resultado
+
+    def manipulabilidad_en(self, puntos):
+        """Mayor manipulabilidad muestreada en la celda de cada punto (0 si no alcanzable)"""
+        return self._consultar(self.manipulabilidad, puntos, 0)
+
+    def guardar(self, ruta):
+        """Guarda el mapa en la carpeta `ruta` (alcanzable.npy, manipulabilidad.npy, meta.json)"""
+        os.makedirs(ruta, exist_ok=True)
+        np.save(os.path.join(ruta, "alcanzable.npy"), np.asarray(self.alcanzable))
+        np.save(os.path.join(ruta, "manipulabilidad.npy"), np.asarray(self.manipulabilidad))
+        with open(os.path.join(ruta, "meta.json"), "w", encoding="utf-8") as archivo:
+            json.dump({"origen": self.origen.tolist(), "resolucion": self.resolucion,
+                       "parametros": self.parametros}, archivo, indent=2)
+
+    @classmethod
+    def cargar(cls, ruta, mmap=True):
+        """Carga un mapa guardado; con mmap los arrays quedan mapeados en memoria (solo lectura)"""
+        modo = 'r' if mmap else None
+        with open(os.path.join(ruta, "meta.json"), encoding="utf-8") as archivo:
+            meta = json.load(archivo)
+        return cls(np.load(os.path.join(ruta, "alcanzable.npy"), mmap_mode=modo),
+                   np.load(os.path.join(ruta, "manipulabilidad.npy"), mmap_mode=modo),
+                   meta["origen"], meta["resolucion"], meta["parametros"])
+
+def obtener_mapa(ruta, parametros, construir):
+    """Devuelve el mapa guardado en `ruta` si se generó con los mismos parámetros; si no, lo construye y guarda"""
+    parametros = json.loads(json.dumps(parametros))
+    if os.path.exists(os.path.join(ruta, "meta.json")):
+        mapa = MapaEspacioTrabajo.cargar(ruta)
+        if mapa.parametros == parametros:
+            return mapa
+    construir(parametros).guardar(ruta)
+    return MapaEspacioTrabajo.cargar(ruta)
+
+# ------------------ Mapas de los Brazos del Curso ------------------
+def mapa_brazo_planar(l1, l2, resolucion=0.05, num_muestras=1_000_000, ruta_cache=None):
+    """Mapa 2D del brazo planar de 'tarea parcial 2.py'"""
+    alcance = l1 + l2
+    parametros = dict(brazo="planar", l1=l1, l2=l2, resolucion=resolucion, num_muestras=num_muestras)
+
+    def construir(parametros):
+        return MapaEspacioTrabajo.construir(
+            cinematica_brazo_planar(l1, l2), [(-np.pi, np.pi)] * 2,
+            [(-alcance, alcance)] * 2, resolucion, num_muestras, parametros=parametros)
+    mapa = obtener_mapa(ruta_cache, parametros, construir) if ruta_cache else construir(parametros)
+    mapa.prueba_exacta = alcance_anular(l1, l2)
+    return mapa
+
+def mapa_brazo_base_giratoria(l1, l2, resolucion=0.1, num_muestras=2_000_000, ruta_cache=None):
+    """Mapa 3D del brazo con base giratoria de 'tarea 2 parcial 2.py'"""
+    alcance = l1 + l2
+    parametros = dict(brazo="base_giratoria", l1=l1, l2=l2, resolucion=resolucion, num_muestras=num_muestras)
+
+    def construir(parametros):
+        return MapaEspacioTrabajo.construir(
+            cinematica_brazo_base_giratoria(l1, l2), [(-np.pi, np.pi)] * 3,
+            [(-alcance, alcance)] * 3, resolucion, num_muestras, parametros=parametros)
+    mapa = obtener_mapa(ruta_cache, parametros, construir) if ruta_cache else construir(parametros)
+    mapa.prueba_exacta = alcance_anular(l1, l2)
+    return mapa
+
+def mapa_scara(longitud_eslabon1=650.0, longitud_eslabon2=720.0, altura_minima=350.0, altura_maxima=820.0,
+               offset_vertical=-35.0, altura_base=800.0, resolucion=25.0, num_muestras=2_000_000,
+               ruta_cache=None):
+    """Mapa 3D de la punta de herramienta del SCARA de 'examen tercer parcial.py' (mm)"""
+    alcance = longitud_eslabon1 + longitud_eslabon2
+    parametros = dict(brazo="scara", longitud_eslabon1=longitud_eslabon1, longitud_eslabon2=longitud_eslabon2,
+                      altura_minima=altura_minima, altura_maxima=altura_maxima,
+                      offset_vertical=offset_vertical, altura_base=altura_base,
+                      resolucion=resolucion, num_muestras=num_muestras)
+
+    cinematica = cinematica_scara(longitud_eslabon1, longitud_eslabon2, altura_base, offset_vertical)
+    # La altura de la herramienta depende solo de Z: se acota con los extremos del recorrido
+    alturas = cinematica(np.array([[0.0, 0.0, altura_minima, 0.0],
+                                   [0.0, 0.0, altura_maxima, 0.0]]))[:, 2]
+
+    def construir(parametros):
+        return MapaEspacioTrabajo.construir(
+            cinematica, [(-180.0, 180.0), (-180.0, 180.0), (altura_minima, altura_maxima), (0.0, 0.0)],
+            [(-alcance, alcance), (-alcance, alcance), (alturas.min(), alturas.max() + resolucion)],
+            resolucion, num_muestras, parametros=parametros)
+    mapa = obtener_mapa(ruta_cache, parametros, construir) if ruta_cache else construir(parametros)
+    mapa.prueba_exacta = alcance_scara(longitud_eslabon1, longitud_eslabon2, alturas.min(), alturas.max())
+    return mapa
+
+if __name__ == "__main__":
+    import time
+
+    inicio = time.perf_counter()
+    mapa = mapa_scara(ruta_cache="mapas/scara")
+    print(f"Mapa SCARA {tuple(mapa.forma)} listo en {time.perf_counter() - inicio:.2f} s "
+          f"({int(np.count_nonzero(mapa.alcanzable))} celdas alcanzables)")
+    puntos = np.array([[1000.0, 0.0, 800.0], [3000.0, 0.0, 800.0]])
+    print("¿Alcanzables?", mapa.es_alcanzable(puntos), "exacto:", mapa.es_alcanzable(puntos, exacto=True))
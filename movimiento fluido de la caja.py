@@ -1,8 +1,15 @@
 # Import libraries and packages
 import matplotlib.pyplot as plt
 from mpl_toolkits import mplot3d
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import numpy as np
 
+from exportacion import FondoEstatico, grabador_desde_entorno
+from instrumentacion import medir
+
+# plt.pause or headless export (EXPORTAR_ANIMACION=salida.gif)
+grabador = grabador_desde_entorno()
+
 # create the fig and ax objects to handle figure and axes of the fixed frame
 fig, ax = plt.subplots()
 
@@ -63,81 +70,118 @@ def drawVector(p_fin, p_init=[0, 0, 0], color='black', linewidth=1):
     deltaZ = [p_init[2], p_fin[2]]
     ax.plot3D(deltaX, deltaY, deltaZ, color=color, linewidth=linewidth)
 
+# Aristas de la caja como pares de índices de vértices (p1..p8 -> 0..7)
+BOX_EDGES = np.array([[0, 1], [1, 2], [2, 3], [3, 0],
+                      [4, 5], [5, 6], [6, 7], [7, 4],
+                      [3, 7], [0, 4], [2, 6], [1, 5]])
+
+class BoxArtist:
+    """Caja dibujada con dos artistas: un Line3DCollection con las 12 aristas
+    y un único conjunto de marcadores con los 8 vértices. update() mueve la
+    caja entre cuadros sin crear artistas nuevos."""
+
+    def __init__(self, points, color='black', alpha=1.0, linewidth=1):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.edges = Line3DCollection(points[BOX_EDGES], colors=color,
+                                      linewidths=linewidth, alpha=alpha)
+        ax.add_collection3d(self.edges)
+        self.vertices, = ax.plot(points[:, 0], points[:, 1], points[:, 2], 'o',
+                                 color=color, alpha=alpha, linestyle='none')
+
+    def update(self, points):
+        """Mueve la caja a unos nuevos vértices (8,3)"""
+        with medir("artistas"):
+            points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+            self.edges.set_segments(points[BOX_EDGES])
+            self.vertices.set_data_3d(points[:, 0], points[:, 1], points[:, 2])
+
+    @property
+    def artists(self):
+        return [self.edges, self.vertices]
+
 def drawBox(p1, p2, p3, p4, p5, p6, p7, p8, color='black', alpha=1.0):
-    drawScatter(p1, color=color)
-    drawScatter(p2, color=color)
-    drawScatter(p3, color=color)
-    drawScatter(p4, color=color)
-    drawScatter(p5, color=color)
-    drawScatter(p6, color=color)
-    drawScatter(p7, color=color)
-    drawScatter(p8, color=color)
-
-    drawVector(p1, p2, color=color)
-    drawVector(p2, p3, color=color)
-    drawVector(p3, p4, color=color)
-    drawVector(p4, p1, color=color)
-    drawVector(p5, p6, color=color)
-    drawVector(p6, p7, color=color)
-    drawVector(p7, p8, color=color)
-    drawVector(p8, p5, color=color)
-    drawVector(p4, p8, color=color)
-    drawVector(p1, p5, color=color)
-    drawVector(p3, p7, color=color)
-    drawVector(p2, p6, color=color)
-
-def drawScatter(point, color='black', marker='o'):
-    ax.scatter(point[0], point[1], point[2], marker=marker, color=color)
-
-def rotate_box_simultaneous(points, angle_z=0, angle_y=0, angle_x=0):
-    """Aplica rotaciones simultáneas en los tres ejes"""
+    """Dibuja una caja con 2 artistas (antes 20) y la devuelve como BoxArtist"""
+    return BoxArtist([p1, p2, p3, p4, p5, p6, p7, p8], color=color, alpha=alpha)
+
+def rotate_box_simultaneous(points, angle_z=0, angle_y=0, angle_x=0, out=None):
+    """Aplica rotaciones simultáneas en los tres ejes a un array (N,3) de puntos
+
+    Devuelve un array (N,3) contiguo de float64; si se pasa `out` (N,3) el
+    resultado se escribe ahí sin reservar memoria.
+    """
     # Matriz de rotación compuesta: Rz * Ry * Rx
     R_total = RotZ(angle_z) @ RotY(angle_y) @ RotX(angle_x)
-    
-    rotated_points = []
-    for point in points:
-        rotated_points.append(R_total.dot(point))
-    
-    return rotated_points
+
+    # p' = R·p para cada fila  <=>  P' = P·Rᵀ en una sola multiplicación
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return np.matmul(points, R_total.T, out=out)
+
+def rotation_trajectory(angles_z, angles_y, angles_x):
+    """Matrices compuestas Rz * Ry * Rx de todos los pasos como una pila (steps,3,3)
+
+    Los ángulos (en grados) son arrays de la misma longitud; senos y cosenos
+    se calculan de una vez sobre todo el array.
+    """
+    cz, sz = cosd(np.asarray(angles_z, dtype=np.float64)), sind(np.asarray(angles_z, dtype=np.float64))
+    cy, sy = cosd(np.asarray(angles_y, dtype=np.float64)), sind(np.asarray(angles_y, dtype=np.float64))
+    cx, sx = cosd(np.asarray(angles_x, dtype=np.float64)), sind(np.asarray(angles_x, dtype=np.float64))
+
+    # Producto Rz @ Ry @ Rx desarrollado término a término
+    R = np.empty(np.broadcast(cz, cy, cx).shape + (3, 3))
+    R[..., 0, 0] = cz*cy
+    R[..., 0, 1] = cz*sy*sx - sz*cx
+    R[..., 0, 2] = cz*sy*cx + sz*sx
+    R[..., 1, 0] = sz*cy
+    R[..., 1, 1] = sz*sy*sx + cz*cx
+    R[..., 1, 2] = sz*sy*cx - cz*sx
+    R[..., 2, 0] = -sy
+    R[..., 2, 1] = cy*sx
+    R[..., 2, 2] = cy*cx
+    return R
+
+def transform_trajectory(points, rotations, out=None):
+    """Aplica una pila de rotaciones (steps,3,3) a un array (N,3): devuelve (steps,N,3)"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return np.matmul(points, np.swapaxes(rotations, -1, -2), out=out)
 
 def animate_simultaneous_rotation(total_angle_z=45, total_angle_y=30, total_angle_x=15, steps=60, delay=0.02):
     """Anima rotaciones simultáneas en los tres ejes"""
-    angle_step_z = total_angle_z / steps
-    angle_step_y = total_angle_y / steps
-    angle_step_x = total_angle_x / steps
-    
-    for step in range(steps + 1):
-        ax.cla()
-        
-        # Configurar ejes y vista
-        setaxis(-15, 15, -15, 15, -15, 15)
-        fix_system(10, 1)
+    # Precalcular ángulos, matrices y vértices de todos los pasos
+    fractions = np.arange(steps + 1) / steps
+    angles_z = fractions * total_angle_z
+    angles_y = fractions * total_angle_y
+    angles_x = fractions * total_angle_x
+    with medir("cinematica"):
+        trajectory = transform_trajectory(original_points,
+                                          rotation_trajectory(angles_z, angles_y, angles_x))
+
+    # Configurar ejes y vista, caja original (en gris) y caja móvil una sola vez
+    ax.cla()
+    setaxis(-15, 15, -15, 15, -15, 15)
+    fix_system(10, 1)
+    drawBox(*original_points, color='gray', alpha=0.5)
+    box = drawBox(*trajectory[0], color='red')
+
+    # Ejes, sistema fijo y caja gris quedan en un fondo cacheado: por cuadro
+    # solo se redibujan la caja móvil y el título
+    layer = FondoEstatico(ax.figure, box.artists + [ax.title])
+
+    for step in grabador.recorrer(steps + 1, fps=1 / delay, capa=layer):
+        # Ángulos actuales
+        current_angle_z = angles_z[step]
+        current_angle_y = angles_y[step]
+        current_angle_x = angles_x[step]
         
-        # Calcular ángulos actuales
-        current_angle_z = step * angle_step_z
-        current_angle_y = step * angle_step_y
-        current_angle_x = step * angle_step_x
+        # Mover la caja rotada (precalculada)
+        rotated_points = trajectory[step]
+        box.update(rotated_points)
         
-        # Dibujar la caja original (en gris)
-        drawBox(*original_points, color='gray', alpha=0.5)
-        
-        # Aplicar rotaciones simultáneas y dibujar la caja rotada
-        rotated_points = rotate_box_simultaneous(
-            original_points,
-            angle_z=current_angle_z,
-            angle_y=current_angle_y,
-            angle_x=current_angle_x
-        )
-        drawBox(*rotated_points, color='red')
-        
-        # Actualizar título con los ángulos actuales
-        ax.set_title(f'Rotación Simultánea:\nZ: {current_angle_z:.1f}° / {total_angle_z}°\n'
+        # Actualizar título con los ángulos actuales (set_text conserva su posición en el fondo)
+        ax.title.set_text(f'Rotación Simultánea:\nZ: {current_angle_z:.1f}° / {total_angle_z}°\n'
                     f'Y: {current_angle_y:.1f}° / {total_angle_y}°\n'
                     f'X: {current_angle_x:.1f}° / {total_angle_x}°')
-        
-        plt.draw()
-        plt.pause(delay)
     
+    layer.desactivar()
     return rotated_points
 
 # Puntos iniciales de la caja
@@ -152,38 +196,39 @@ p8_init = [0, 2, 3]
 
 original_points = [p1_init, p2_init, p3_init, p4_init, p5_init, p6_init, p7_init, p8_init]
 
-# Animación de rotaciones simultáneas
-print("Animación de rotaciones simultáneas: 45° Z + 30° Y + 15° X")
-final_points = animate_simultaneous_rotation(
-    total_angle_z=45,
-    total_angle_y=30, 
-    total_angle_x=15,
-    steps=90,      # Más pasos para mayor fluidez
-    delay=0.015    # Menor delay para mayor fluidez
-)
-
-# Mostrar el resultado final con posición inicial y final
-ax.cla()
-setaxis(-15, 15, -15, 15, -15, 15)
-fix_system(10, 1)
-
-# Dibujar la caja inicial (gris) y final (rojo)
-drawBox(*original_points, color='gray', alpha=0.5)
-drawBox(*final_points, color='red')
-
-ax.set_title('Resultado Final: Rotación Simultánea\n45° Z + 30° Y + 15° X')
-plt.draw()
-
-# Mostrar la ventana al final
-plt.show()
-
-# Imprimir coordenadas finales
-print("\nCoordenadas finales después de rotación simultánea:")
-print("45° Z + 30° Y + 15° X")
-for i, point in enumerate(final_points, 1):
-    print(f"P{i}: [{point[0]:.2f}, {point[1]:.2f}, {point[2]:.2f}]")
-
-# También mostrar la matriz de rotación compuesta final
-print("\nMatriz de rotación compuesta final (Rz * Ry * Rx):")
-R_final = RotZ(45) @ RotY(30) @ RotX(15)
-print(R_final)
\ No newline at end of file
+if __name__ == "__main__":
+    # Animación de rotaciones simultáneas
+    print("Animación de rotaciones simultáneas: 45° Z + 30° Y + 15° X")
+    final_points = animate_simultaneous_rotation(
+        total_angle_z=45,
+        total_angle_y=30, 
+        total_angle_x=15,
+        steps=90,      # Más pasos para mayor fluidez
+        delay=0.015    # Menor delay para mayor fluidez
+    )
+
+    # Mostrar el resultado final con posición inicial y final
+    ax.cla()
+    setaxis(-15, 15, -15, 15, -15, 15)
+    fix_system(10, 1)
+
+    # Dibujar la caja inicial (gris) y final (rojo)
+    drawBox(*original_points, color='gray', alpha=0.5)
+    drawBox(*final_points, color='red')
+
+    ax.set_title('Resultado Final: Rotación Simultánea\n45° Z + 30° Y + 15° X')
+    plt.draw()
+
+    # Mostrar la ventana al final
+    grabador.mostrar()
+
+    # Imprimir coordenadas finales
+    print("\nCoordenadas finales después de rotación simultánea:")
+    print("45° Z + 30° Y + 15° X")
+    for i, point in enumerate(final_points, 1):
+        print(f"P{i}: [{point[0]:.2f}, {point[1]:.2f}, {point[2]:.2f}]")
+
+    # También mostrar la matriz de rotación compuesta final
+    print("\nMatriz de rotación compuesta final (Rz * Ry * Rx):")
+    R_final = RotZ(45) @ RotY(30) @ RotX(15)
+    print(R_final)
\ No newline at end of file
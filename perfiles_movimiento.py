@@ -0,0 +1,278 @@
+"""
+PERFILES DE MOVIMIENTO PARAMETRIZADOS EN EL TIEMPO
+
+Los bucles de animación interpolan linealmente en el índice de cuadro
+(np.linspace, i / num_steps): no hay modelo de tiempo y la velocidad salta
+al empezar y al acabar cada movimiento. Este módulo genera movimientos
+articulares punto a punto con tiempo real y respetando, por articulación,
+límites de velocidad, aceleración y (en la curva S) jerk:
+
+    trapezoidal   aceleración constante, crucero, deceleración (3 tramos)
+    quintico      polinomio de grado 5 con velocidad y aceleración nulas en los extremos
+    curva_s       jerk limitado, 7 tramos (aceleración continua)
+
+Cada articulación calcula su perfil de tiempo mínimo; el movimiento dura lo
+que la más lenta y las demás se escalan en el tiempo para terminar a la vez
+(escalar el tiempo por r <= 1 multiplica la velocidad por r, la aceleración
+por r² y el jerk por r³: nunca se superan los límites). Las duraciones son
+analíticas, así que el tiempo de ciclo no depende de la frecuencia de
+muestreo. La evaluación es por tramos polinómicos con arrays: un movimiento
+de un minuto a 1 kHz no recorre ninguna muestra en Python.
+
+Unidades: las de las articulaciones (° o mm) y segundos; v_max en
+unidades/s, a_max en unidades/s², j_max en unidades/s³.
+
+Ejemplo:
+    recorrido = planificar_recorrido(PUNTOS, LIMITES_SCARA['v_max'], LIMITES_SCARA['a_max'],
+                                     LIMITES_SCARA['j_max'], perfil='curva_s', pausa=0.2)
+    print(recorrido.duracion)                       # tiempo de ciclo [s]
+    t, q, dq, ddq = recorrido.muestrear(1000.0)     # 1 kHz
+"""
+
+import argparse
+
+import numpy as np
+
+PERFILES = ('trapezoidal', 'quintico', 'curva_s')
+
+# Límites de ejemplo para el SCARA (θ1 [°], θ2 [°], Z [mm], θ4 [°])
+LIMITES_SCARA = {
+    'v_max': (180.0, 240.0, 1000.0, 720.0),
+    'a_max': (720.0, 960.0, 5000.0, 2880.0),
+    'j_max': (5000.0, 7000.0, 40000.0, 20000.0),
+}
+
+# ------------------ Perfiles de Tiempo Mínimo por Articulación ------------------
+# Los perfiles por tramos se describen con, para cada tramo k, su duración, la
+# aceleración al empezar y el jerk (constante): arrays (n, k) para n articulaciones
+
+def _tramos_trapezoidales(distancia, v_max, a_max):
+    # Sin crucero (triangular) si no da tiempo a alcanzar v_max
+    triangular = distancia * a_max < v_max**2
+    v_pico = np.where(triangular, np.sqrt(distancia * a_max), v_max)
+    t_acel = v_pico / a_max
+    t_crucero = np.where(triangular, 0.0, distancia / v_max - v_max / a_max)
+    cero = np.zeros_like(distancia)
+    duraciones = np.stack((t_acel, t_crucero, t_acel), axis=-1)
+    aceleraciones = np.stack((a_max, cero, -a_max), axis=-1)
+    return duraciones, aceleraciones, np.zeros_like(duraciones)
+
+def _fase_aceleracion(v_pico, a_max, j_max):
+    # Tiempos de jerk y de aceleración constante para pasar de 0 a v_pico
+    satura = v_pico * j_max >= a_max**2
+    t_jerk = np.where(satura, a_max / j_max, np.sqrt(v_pico / j_max))
+    t_constante = np.where(satura, v_pico / a_max - a_max / j_max, 0.0)
+    return t_jerk, t_constante
+
+def _tramos_curva_s(distancia, v_max, a_max, j_max):
+    t_jerk, t_constante = _fase_aceleracion(v_max, a_max, j_max)
+    distancia_acel = v_max * (2*t_jerk + t_constante) / 2
+    crucero = 2*distancia_acel <= distancia
+
+    # Sin crucero: velocidad de pico con aceleración saturada (d = v²/a + v·a/j) ...
+    v_saturada = (-a_max**2 / j_max + np.sqrt(a_max**4 / j_max**2 + 4*a_max*distancia)) / 2
+    # ... o, si ni siquiera se llega a a_max, solo tramos de jerk (d = 2·j·tj³)
+    t_jerk_corto = np.cbrt(distancia / (2*j_max))
+    v_pico = np.where(crucero, v_max,
+                      np.where(v_saturada * j_max >= a_max**2, v_saturada, j_max * t_jerk_corto**2))
+
+    t_jerk, t_constante = _fase_aceleracion(v_pico, a_max, j_max)
+    t_crucero = np.where(crucero, (distancia - 2*distancia_acel) / np.where(v_max > 0, v_max, 1.0), 0.0)
+    a_pico = j_max * t_jerk
+    cero = np.zeros_like(distancia)
+    duraciones = np.stack((t_jerk, t_constante, t_jerk, t_crucero, t_jerk, t_constante, t_jerk), axis=-1)
+    aceleraciones = np.stack((cero, a_pico, a_pico, cero, cero, -a_pico, -a_pico), axis=-1)
+    jerks = np.stack((j_max, cero, -j_max, cero, -j_max, cero, j_max), axis=-1)
+    return duraciones, aceleraciones, jerks
+
+def _duracion_quintica(distancia, v_max, a_max, j_max=None):
+    # Picos de s(τ) = 10τ³ - 15τ⁴ + 6τ⁵: s' = 15/8, s'' = 10/√3, s''' = 60 (por d/T, d/T², d/T³)
+    duracion = np.maximum(15*distancia / (8*v_max), np.sqrt(10*distancia / (np.sqrt(3)*a_max)))
+    if j_max is not None:
+        duracion = np.maximum(duracion, np.cbrt(60*distancia / j_max))
+    return duracion
+
+def _estados_tramos(duraciones, aceleraciones, jerks):
+    # Posición y velocidad al empezar cada tramo (se integra tramo a tramo, no muestra a muestra)
+    posiciones = np.zeros_like(duraciones)
+    velocidades = np.zeros_like(duraciones)
+    for k in range(duraciones.shape[-1] - 1):
+        d, a, j = duraciones[..., k], aceleraciones[..., k], jerks[..., k]
+        posiciones[..., k + 1] = posiciones[..., k] + velocidades[..., k]*d + a*d**2/2 + j*d**3/6
+        velocidades[..., k + 1] = velocidades[..., k] + a*d + j*d**2/2
+    return posiciones, velocidades
+
+# ------------------ Movimiento Punto a Punto ------------------
+class Movimiento:
+    """Movimiento sincronizado de todas las articulaciones entre dos puntos"""
+
+    def __init__(self, q_inicio, q_fin, v_max, a_max, j_max=None, perfil='trapezoidal'):
+        if perfil not in PERFILES:
+            raise ValueError(f"Perfil desconocido: {perfil} (opciones: {', '.join(PERFILES)})")
+        if perfil == 'curva_s' and j_max is None:
+            raise ValueError("El perfil curva_s necesita j_max")
+        self.q_inicio = np.atleast_1d(np.asarray(q_inicio, dtype=np.float64))
+        self.q_fin = np.atleast_1d(np.asarray(q_fin, dtype=np.float64))
+        num_articulaciones = len(self.q_inicio)
+        self.v_max = np.broadcast_to(np.asarray(v_max, dtype=np.float64), (num_articulaciones,))
+        self.a_max = np.broadcast_to(np.asarray(a_max, dtype=np.float64), (num_articulaciones,))
+        self.j_max = None if j_max is None else np.broadcast_to(np.asarray(j_max, dtype=np.float64),
+                                                                (num_articulaciones,))
+        if np.any(self.v_max <= 0) or np.any(self.a_max <= 0) or (self.j_max is not None and np.any(self.j_max <= 0)):
+            raise ValueError("Los límites de velocidad, aceleración y jerk deben ser positivos")
+        self.perfil = perfil
+
+        desplazamiento = self.q_fin - self.q_inicio
+        self.sentido = np.sign(desplazamiento)
+        self.distancia = np.abs(desplazamiento)
+
+        if perfil == 'quintico':
+            self.duraciones_articulaciones = _duracion_quintica(self.distancia, self.v_max, self.a_max, self.j_max)
+        else:
+            if perfil == 'trapezoidal':
+                tramos = _tramos_trapezoidales(self.distancia, self.v_max, self.a_max)
+            else:
+                tramos = _tramos_curva_s(self.distancia, self.v_max, self.a_max, self.j_max)
+            self._duraciones_tramos, self._aceleraciones, self._jerks = tramos
+            self._posiciones, self._velocidades = _estados_tramos(*tramos)
+            self._inicios_tramos = np.cumsum(self._duraciones_tramos, axis=-1) - self._duraciones_tramos
+            self.duraciones_articulaciones = self._duraciones_tramos.sum(axis=-1)
+
+        # Todas terminan con la más lenta: factor de escala temporal r = T_i / T de cada una
+        self.duracion = float(self.duraciones_articulaciones.max(initial=0.0))
+        self.escala = (self.duraciones_articulaciones / self.duracion if self.duracion > 0
+                       else np.zeros(num_articulaciones))
+
+    def _normalizado(self, tiempo):
+        # Perfil de tiempo mínimo (sin sentido ni escala) de cada articulación en sus propios tiempos (N, n)
+        if self.perfil == 'quintico':
+            tau = np.clip(tiempo / np.where(self.duracion > 0, self.duracion, 1.0), 0.0, 1.0)
+            T = self.duracion if self.duracion > 0 else 1.0
+            s = tau**3 * (10 - 15*tau + 6*tau**2)
+            ds = 30 * tau**2 * (1 - tau)**2 / T
+            dds = 60 * tau * (1 - tau) * (1 - 2*tau) / T**2
+            return s * self.distancia, ds * self.distancia, dds * self.distancia
+
+        tiempo = np.clip(tiempo, 0.0, self.duraciones_articulaciones)
+        posicion = np.empty_like(tiempo)
+        velocidad = np.empty_like(tiempo)
+        aceleracion = np.empty_like(tiempo)
+        for i in range(tiempo.shape[1]):
+            # Tramo de cada muestra por búsqueda binaria (un bucle por articulación, no por muestra)
+            k = np.clip(np.searchsorted(self._inicios_tramos[i], tiempo[:, i], side='right') - 1,
+                        0, self._duraciones_tramos.shape[-1] - 1)
+            dt = tiempo[:, i] - self._inicios_tramos[i, k]
+            p, v, a, j = self._posiciones[i, k], self._velocidades[i, k], self._aceleraciones[i, k], self._jerks[i, k]
+            posicion[:, i] = p + v*dt + a*dt**2/2 + j*dt**3/6
+            velocidad[:, i] = v + a*dt + j*dt**2/2
+            aceleracion[:, i] = a + j*dt
+        return posicion, velocidad, aceleracion
+
+    def evaluar(self, tiempo):
+        """Posición, velocidad y aceleración (N, n) en los instantes `tiempo` (N,) desde el inicio"""
+        tiempo = np.atleast_1d(np.asarray(tiempo, dtype=np.float64))
+        if self.perfil == 'quintico':
+            posicion, velocidad, aceleracion = self._normalizado(tiempo[:, None])
+        else:
+            posicion, velocidad, aceleracion = self._normalizado(tiempo[:, None] * self.escala)
+            velocidad = velocidad * self.escala
+            aceleracion = aceleracion * self.escala**2
+        return (self.q_inicio + self.sentido * posicion, self.sentido * velocidad, self.sentido * aceleracion)
+
+    def muestrear(self, frecuencia=1000.0):
+        """(tiempo, posición, velocidad, aceleración) a `frecuencia` Hz, incluido el instante final"""
+        tiempo = _instantes(self.duracion, frecuencia)
+        return (tiempo, *self.evaluar(tiempo))
+
+    @property
+    def velocidad_pico(self):
+        """Velocidad máxima que alcanza cada articulación (sin signo)"""
+        if self.perfil == 'quintico':
+            return 15*self.distancia / (8*self.duracion) if self.duracion > 0 else np.zeros_like(self.distancia)
+        # El pico está al empezar el crucero (o donde estaría, con crucero nulo)
+        return self._velocidades.max(axis=-1) * self.escala
+
+    @property
+    def aceleracion_pico(self):
+        """Aceleración máxima que alcanza cada articulación (sin signo)"""
+        if self.perfil == 'quintico':
+            return (10*self.distancia / (np.sqrt(3)*self.duracion**2) if self.duracion > 0
+                    else np.zeros_like(self.distancia))
+        return np.abs(self._aceleraciones).max(axis=-1) * self.escala**2
+
+def _instantes(duracion, frecuencia):
+    num_muestras = int(np.floor(duracion * frecuencia + 1e-9)) + 1
+    tiempo = np.arange(num_muestras) / frecuencia
+    if tiempo[-1] < duracion:
+        tiempo = np.append(tiempo, duracion)
+    return tiempo
+
+def planificar_movimiento(q_inicio, q_fin, v_max, a_max, j_max=None, perfil='trapezoidal'):
+    """Movimiento sincronizado de q_inicio a q_fin (ver Movimiento)"""
+    return Movimiento(q_inicio, q_fin, v_max, a_max, j_max, perfil)
+
+# ------------------ Recorrido por Varios Puntos ------------------
+class Recorrido:
+    """Secuencia de movimientos punto a punto, parando en cada punto `pausa` segundos"""
+
+    def __init__(self, movimientos, pausa=0.0):
+        self.movimientos = list(movimientos)
+        self.pausa = float(pausa)
+        duraciones = np.array([m.duracion + self.pausa for m in self.movimientos])
+        self.inicios = np.concatenate(([0.0], np.cumsum(duraciones)[:-1]))
+        self.duracion = float(duraciones.sum())
+
+    def evaluar(self, tiempo):
+        """Posición, velocidad y aceleración (N, n) del recorrido en los instantes `tiempo`"""
+        tiempo = np.atleast_1d(np.asarray(tiempo, dtype=np.float64))
+        num_articulaciones = len(self.movimientos[0].q_inicio)
+        posicion = np.empty((len(tiempo), num_articulaciones))
+        velocidad = np.empty_like(posicion)
+        aceleracion = np.empty_like(posicion)
+        tramo = np.clip(np.searchsorted(self.inicios, tiempo, side='right') - 1, 0, len(self.movimientos) - 1)
+        for numero, movimiento in enumerate(self.movimientos):
+            # Las muestras de la pausa quedan en el punto final (evaluar satura en la duración)
+            seleccion = tramo == numero
+            if seleccion.any():
+                resultado = movimiento.evaluar(tiempo[seleccion] - self.inicios[numero])
+                posicion[seleccion], velocidad[seleccion], aceleracion[seleccion] = resultado
+        return posicion, velocidad, aceleracion
+
+    def muestrear(self, frecuencia=1000.0):
+        """(tiempo, posición, velocidad, aceleración) de todo el recorrido a `frecuencia` Hz"""
+        tiempo = _instantes(self.duracion, frecuencia)
+        return (tiempo, *self.evaluar(tiempo))
+
+def planificar_recorrido(puntos, v_max, a_max, j_max=None, perfil='trapezoidal', pausa=0.0, cerrar=False):
+    """Recorrido por los puntos articulares (m, n); con cerrar=True vuelve al primero"""
+    puntos = np.asarray(puntos, dtype=np.float64)
+    if cerrar:
+        puntos = np.vstack((puntos, puntos[:1]))
+    if len(puntos) < 2:
+        raise ValueError("Un recorrido necesita al menos dos puntos")
+    return Recorrido([Movimiento(q0, q1, v_max, a_max, j_max, perfil) for q0, q1 in zip(puntos[:-1], puntos[1:])],
+                     pausa)
+
+def tiempo_ciclo(puntos, v_max, a_max, j_max=None, perfil='trapezoidal', pausa=0.0, cerrar=True):
+    """Duración analítica [s] del ciclo por los puntos (sin muestrear)"""
+    return planificar_recorrido(puntos, v_max, a_max, j_max, perfil, pausa, cerrar).duracion
+
+# ------------------ Programa Principal ------------------
+def main(argumentos=None):
+    from flujo_trayectorias import PUNTOS_RECOGER_COLOCAR
+
+    analizador = argparse.ArgumentParser(description="Tiempo de ciclo del SCARA con cada perfil de movimiento")
+    analizador.add_argument('--pausa', type=float, default=0.2, help="parada en cada punto [s]")
+    analizador.add_argument('--frecuencia', type=float, default=1000.0, help="frecuencia de muestreo [Hz]")
+    opciones = analizador.parse_args(argumentos)
+
+    for perfil in PERFILES:
+        recorrido = planificar_recorrido(PUNTOS_RECOGER_COLOCAR, **LIMITES_SCARA, perfil=perfil,
+                                         pausa=opciones.pausa, cerrar=True)
+        tiempo, posicion, velocidad, aceleracion = recorrido.muestrear(opciones.frecuencia)
+        print(f"{perfil:12s} ciclo {recorrido.duracion:7.3f} s  {len(tiempo)} muestras  "
+              f"|v|/v_max {np.max(np.abs(velocidad) / LIMITES_SCARA['v_max']):.3f}  "
+              f"|a|/a_max {np.max(np.abs(aceleracion) / LIMITES_SCARA['a_max']):.3f}")
+
+if __name__ == "__main__":
+    main()
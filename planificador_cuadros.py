@@ -0,0 +1,112 @@
+"""
+PLANIFICADOR DE CUADROS A PASO FIJO
+
+Con plt.pause(delay) el periodo real de cada cuadro es delay + tiempo de
+dibujado, así que la velocidad de la animación depende de la escena y de la
+carga de la máquina. PlanificadorCuadros fija el instante de cada cuadro en
+el reloj (inicio + i / fps): si el dibujado va adelantado espera hasta el
+siguiente instante y, si se retrasa, salta directamente al cuadro que
+corresponde a la hora actual. Al terminar informa del fps logrado y del
+jitter del periodo entre cuadros.
+
+Uso:
+    planificador = PlanificadorCuadros(fps=25)
+    for indice in planificador.recorrer(num_cuadros):
+        dibujar(indice)
+        presentar()
+    print(planificador.texto_informe())
+"""
+
+import time
+
+import numpy as np
+
+from instrumentacion import contar
+
+class PlanificadorCuadros:
+    """Entrega índices de cuadro al ritmo de `fps` cuadros por segundo de reloj
+
+    esperar(segundos) se usa para los tiempos muertos; por defecto
+    time.sleep, pero puede ser el bucle de eventos de la ventana
+    (canvas.start_event_loop) para que siga respondiendo. Con
+    saltar_cuadros=False nunca se omiten cuadros y la animación se
+    ralentiza en lugar de perder pasos.
+    """
+
+    def __init__(self, fps=25, saltar_cuadros=True, esperar=time.sleep, reloj=time.perf_counter):
+        if fps <= 0:
+            raise ValueError("fps debe ser positivo")
+        self.fps = float(fps)
+        self.periodo = 1.0 / self.fps
+        self.saltar_cuadros = saltar_cuadros
+        self.esperar = esperar
+        self.reloj = reloj
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self.instantes = []   # momento (desde el inicio) en que se presentó cada cuadro
+        self.retrasos = []    # retraso de cada cuadro respecto a su instante previsto
+        self.cuadros_saltados = 0
+
+    def _esperar_hasta(self, limite):
+        restante = limite - self.reloj()
+        if restante > 0:
+            self.esperar(restante)
+            # El bucle de eventos puede volver antes de tiempo (su resolución es gruesa)
+            restante = limite - self.reloj()
+            if restante > 0:
+                time.sleep(restante)
+
+    def recorrer(self, num_cuadros):
+        """Generador de índices 0..num_cuadros-1; el último cuadro siempre se entrega
+
+        El cuerpo del bucle debe dibujar y presentar el cuadro: el tiempo se
+        mide cuando el generador recupera el control.
+        """
+        self._reiniciar()
+        if num_cuadros <= 0:
+            return
+        inicio = self.reloj()
+        indice = 0
+        while True:
+            yield indice
+            ahora = self.reloj() - inicio
+            self.instantes.append(ahora)
+            self.retrasos.append(ahora - indice * self.periodo)
+            if indice == num_cuadros - 1:
+                break
+
+            siguiente = indice + 1
+            if ahora < siguiente * self.periodo:
+                self._esperar_hasta(inicio + siguiente * self.periodo)
+            elif self.saltar_cuadros:
+                # Cuadro que corresponde a la hora actual (sin pasar del último)
+                siguiente = min(max(siguiente, int(ahora * self.fps)), num_cuadros - 1)
+            self.cuadros_saltados += siguiente - indice - 1
+            if siguiente - indice > 1:
+                contar("cuadros_saltados", siguiente - indice - 1)
+            indice = siguiente
+
+    def informe(self):
+        """Diccionario con fps objetivo/logrado, cuadros mostrados/saltados y jitter (ms)"""
+        instantes = np.asarray(self.instantes)
+        periodos = np.diff(instantes)
+        duracion = instantes[-1] if len(instantes) else 0.0
+        return {
+            "fps_objetivo": self.fps,
+            "fps_logrado": (len(periodos) / (instantes[-1] - instantes[0])
+                            if len(periodos) and instantes[-1] > instantes[0] else 0.0),
+            "cuadros_mostrados": len(instantes),
+            "cuadros_saltados": self.cuadros_saltados,
+            "duracion_s": float(duracion),
+            "periodo_medio_ms": float(periodos.mean() * 1e3) if len(periodos) else 0.0,
+            "jitter_ms": float(periodos.std() * 1e3) if len(periodos) else 0.0,
+            "retraso_maximo_ms": float(max(self.retrasos) * 1e3) if self.retrasos else 0.0,
+        }
+
+    def texto_informe(self):
+        """Resumen de una línea del informe"""
+        datos = self.informe()
+        return (f"Reproducción: {datos['fps_logrado']:.1f}/{datos['fps_objetivo']:.1f} fps, "
+                f"{datos['cuadros_mostrados']} cuadros mostrados, {datos['cuadros_saltados']} saltados, "
+                f"jitter {datos['jitter_ms']:.1f} ms, retraso máximo {datos['retraso_maximo_ms']:.1f} ms")
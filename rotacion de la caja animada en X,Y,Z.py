@@ -1,8 +1,15 @@
 # Import libraries and packages
 import matplotlib.pyplot as plt
 from mpl_toolkits import mplot3d
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import numpy as np
 
+from exportacion import FondoEstatico, grabador_desde_entorno
+from instrumentacion import medir
+
+# plt.pause or headless export (EXPORTAR_ANIMACION=salida.gif)
+grabador = grabador_desde_entorno()
+
 # create the fig and ax objects to handle figure and axes of the fixed frame
 fig, ax = plt.subplots()
 
@@ -63,34 +70,45 @@ def drawVector(p_fin, p_init=[0, 0, 0], color='black', linewidth=1):
     deltaZ = [p_init[2], p_fin[2]]
     ax.plot3D(deltaX, deltaY, deltaZ, color=color, linewidth=linewidth)
 
+# Aristas de la caja como pares de índices de vértices (p1..p8 -> 0..7)
+BOX_EDGES = np.array([[0, 1], [1, 2], [2, 3], [3, 0],
+                      [4, 5], [5, 6], [6, 7], [7, 4],
+                      [3, 7], [0, 4], [2, 6], [1, 5]])
+
+class BoxArtist:
+    """Caja dibujada con dos artistas: un Line3DCollection con las 12 aristas
+    y un único conjunto de marcadores con los 8 vértices. update() mueve la
+    caja entre cuadros sin crear artistas nuevos."""
+
+    def __init__(self, points, color='black', alpha=1.0, linewidth=1):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.edges = Line3DCollection(points[BOX_EDGES], colors=color,
+                                      linewidths=linewidth, alpha=alpha)
+        ax.add_collection3d(self.edges)
+        self.vertices, = ax.plot(points[:, 0], points[:, 1], points[:, 2], 'o',
+                                 color=color, alpha=alpha, linestyle='none')
+
+    def update(self, points):
+        """Mueve la caja a unos nuevos vértices (8,3)"""
+        with medir("artistas"):
+            points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+            self.edges.set_segments(points[BOX_EDGES])
+            self.vertices.set_data_3d(points[:, 0], points[:, 1], points[:, 2])
+
+    @property
+    def artists(self):
+        return [self.edges, self.vertices]
+
 def drawBox(p1, p2, p3, p4, p5, p6, p7, p8, color='black', alpha=1.0):
-    drawScatter(p1, color=color)
-    drawScatter(p2, color=color)
-    drawScatter(p3, color=color)
-    drawScatter(p4, color=color)
-    drawScatter(p5, color=color)
-    drawScatter(p6, color=color)
-    drawScatter(p7, color=color)
-    drawScatter(p8, color=color)
-
-    drawVector(p1, p2, color=color)
-    drawVector(p2, p3, color=color)
-    drawVector(p3, p4, color=color)
-    drawVector(p4, p1, color=color)
-    drawVector(p5, p6, color=color)
-    drawVector(p6, p7, color=color)
-    drawVector(p7, p8, color=color)
-    drawVector(p8, p5, color=color)
-    drawVector(p4, p8, color=color)
-    drawVector(p1, p5, color=color)
-    drawVector(p3, p7, color=color)
-    drawVector(p2, p6, color=color)
-
-def drawScatter(point, color='black', marker='o'):
-    ax.scatter(point[0], point[1], point[2], marker=marker, color=color)
-
-def rotate_box(points, axis='x', angle=0):
-    """Rota una lista de puntos alrededor del eje especificado"""
+    """Dibuja una caja con 2 artistas (antes 20) y la devuelve como BoxArtist"""
+    return BoxArtist([p1, p2, p3, p4, p5, p6, p7, p8], color=color, alpha=alpha)
+
+def rotate_box(points, axis='x', angle=0, out=None):
+    """Rota un array (N,3) de puntos alrededor del eje especificado
+
+    Devuelve un array (N,3) contiguo de float64; si se pasa `out` (N,3) el
+    resultado se escribe ahí sin reservar memoria.
+    """
     if axis == 'x':
         rotation_matrix = RotX(angle)
     elif axis == 'y':
@@ -100,35 +118,67 @@ def rotate_box(points, axis='x', angle=0):
     else:
         rotation_matrix = np.eye(3)
 
-    rotated_points = []
-    for point in points:
-        rotated_points.append(rotation_matrix.dot(point))
-    
-    return rotated_points
+    # p' = R·p para cada fila  <=>  P' = P·Rᵀ en una sola multiplicación
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return np.matmul(points, rotation_matrix.T, out=out)
+
+def rotation_trajectory(angles, axis='x'):
+    """Matrices de rotación de todos los ángulos (grados) como una pila (steps,3,3)
+
+    Senos y cosenos se calculan de una vez sobre todo el array de ángulos.
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    c, s = cosd(angles), sind(angles)
+    R = np.zeros(angles.shape + (3, 3))
+    if axis == 'x':
+        R[..., 0, 0] = 1
+        R[..., 1, 1], R[..., 1, 2] = c, -s
+        R[..., 2, 1], R[..., 2, 2] = s, c
+    elif axis == 'y':
+        R[..., 0, 0], R[..., 0, 2] = c, s
+        R[..., 1, 1] = 1
+        R[..., 2, 0], R[..., 2, 2] = -s, c
+    elif axis == 'z':
+        R[..., 0, 0], R[..., 0, 1] = c, -s
+        R[..., 1, 0], R[..., 1, 1] = s, c
+        R[..., 2, 2] = 1
+    else:
+        R[...] = np.eye(3)
+    return R
+
+def transform_trajectory(points, rotations, out=None):
+    """Aplica una pila de rotaciones (steps,3,3) a un array (N,3): devuelve (steps,N,3)"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return np.matmul(points, np.swapaxes(rotations, -1, -2), out=out)
 
 def animate_single_rotation(points, axis='x', total_angle=15, steps=15, delay=0.05, color='red'):
     """Anima una sola rotación mostrando también la posición inicial"""
     angle_step = total_angle / steps
-    
-    for angle in np.arange(0, total_angle + angle_step, angle_step):
-        ax.cla()
-        
-        # Configurar ejes y vista
-        setaxis(-15, 15, -15, 15, -15, 15)
-        fix_system(10, 1)
-        
-        # Dibujar siempre la caja original (en gris)
-        drawBox(*original_points, color='gray', alpha=0.5)
-        
-        # Rotar y dibujar la caja actual
-        rotated_points = rotate_box(points, axis=axis, angle=angle)
-        drawBox(*rotated_points, color=color)
-        
-        ax.set_title(f'Rotación en eje {axis.upper()}: {angle:.1f}° / {total_angle}°')
+    angles = np.arange(0, total_angle + angle_step, angle_step)
+
+    # Precalcular las matrices y los vértices de todos los pasos
+    with medir("cinematica"):
+        trajectory = transform_trajectory(points, rotation_trajectory(angles, axis))
+
+    # Configurar ejes y vista, caja original (en gris) y caja móvil una sola vez
+    ax.cla()
+    setaxis(-15, 15, -15, 15, -15, 15)
+    fix_system(10, 1)
+    drawBox(*original_points, color='gray', alpha=0.5)
+    box = drawBox(*trajectory[0], color=color)
+
+    # Ejes, sistema fijo y caja gris quedan en un fondo cacheado: por cuadro
+    # solo se redibujan la caja móvil y el título
+    layer = FondoEstatico(ax.figure, box.artists + [ax.title])
+
+    for step in grabador.recorrer(len(angles), fps=1 / delay, capa=layer):
+        angle, rotated_points = angles[step], trajectory[step]
+        # Mover la caja actual (precalculada)
+        box.update(rotated_points)
         
-        plt.draw()
-        plt.pause(delay)
+        ax.title.set_text(f'Rotación en eje {axis.upper()}: {angle:.1f}° / {total_angle}°')
     
+    layer.desactivar()
     return rotated_points
 
 # Puntos iniciales de la caja
@@ -143,56 +193,57 @@ p8_init = [0, 2, 3]
 
 original_points = [p1_init, p2_init, p3_init, p4_init, p5_init, p6_init, p7_init, p8_init]
 
-# PASO 1: Rotación de 45° en eje Z (con animación)
-print("PASO 1: Rotación de 45° en eje Z")
-points_after_z = animate_single_rotation(
-    original_points, 
-    axis='z', 
-    total_angle=45, 
-    steps=45, 
-    delay=0.03, 
-    color='green'
-)
-
-# PASO 2: Rotación de 30° en eje Y (con animación)
-print("PASO 2: Rotación de 30° en eje Y")
-points_after_y = animate_single_rotation(
-    points_after_z, 
-    axis='y', 
-    total_angle=30, 
-    steps=30, 
-    delay=0.03, 
-    color='blue'
-)
-
-# PASO 3: Rotación de 15° en eje X (con animación)
-print("PASO 3: Rotación de 15° en eje X")
-final_points = animate_single_rotation(
-    points_after_y, 
-    axis='x', 
-    total_angle=15,  # Cambiado de 360 a 15 grados
-    steps=15,        # Cambiado de 72 a 15 pasos
-    delay=0.03,      # Ajustado el delay
-    color='red'
-)
-
-# Mostrar el resultado final con posición inicial y final
-ax.cla()
-setaxis(-15, 15, -15, 15, -15, 15)
-fix_system(10, 1)
-
-# Dibujar la caja inicial (gris) y final (rojo)
-drawBox(*original_points, color='gray', alpha=0.5)
-drawBox(*final_points, color='red')
-
-ax.set_title('Resultado Final: Posición Inicial (gris) y Final (rojo)\n45° Z → 30° Y → 15° X')
-plt.draw()
-
-# Mostrar la ventana al final
-plt.show()
-
-# Imprimir coordenadas finales
-print("\nCoordenadas finales después de todas las rotaciones:")
-print("Secuencia: 45° Z → 30° Y → 15° X")
-for i, point in enumerate(final_points, 1):
-    print(f"P{i}: [{point[0]:.2f}, {point[1]:.2f}, {point[2]:.2f}]")
\ No newline at end of file
+if __name__ == "__main__":
+    # PASO 1: Rotación de 45° en eje Z (con animación)
+    print("PASO 1: Rotación de 45° en eje Z")
+    points_after_z = animate_single_rotation(
+        original_points, 
+        axis='z', 
+        total_angle=45, 
+        steps=45, 
+        delay=0.03, 
+        color='green'
+    )
+
+    # PASO 2: Rotación de 30° en eje Y (con animación)
+    print("PASO 2: Rotación de 30° en eje Y")
+    points_after_y = animate_single_rotation(
+        points_after_z, 
+        axis='y', 
+        total_angle=30, 
+        steps=30, 
+        delay=0.03, 
+        color='blue'
+    )
+
+    # PASO 3: Rotación de 15° en eje X (con animación)
+    print("PASO 3: Rotación de 15° en eje X")
+    final_points = animate_single_rotation(
+        points_after_y, 
+        axis='x', 
+        total_angle=15,  # Cambiado de 360 a 15 grados
+        steps=15,        # Cambiado de 72 a 15 pasos
+        delay=0.03,      # Ajustado el delay
+        color='red'
+    )
+
+    # Mostrar el resultado final con posición inicial y final
+    ax.cla()
+    setaxis(-15, 15, -15, 15, -15, 15)
+    fix_system(10, 1)
+
+    # Dibujar la caja inicial (gris) y final (rojo)
+    drawBox(*original_points, color='gray', alpha=0.5)
+    drawBox(*final_points, color='red')
+
+    ax.set_title('Resultado Final: Posición Inicial (gris) y Final (rojo)\n45° Z → 30° Y → 15° X')
+    plt.draw()
+
+    # Mostrar la ventana al final
+    grabador.mostrar()
+
+    # Imprimir coordenadas finales
+    print("\nCoordenadas finales después de todas las rotaciones:")
+    print("Secuencia: 45° Z → 30° Y → 15° X")
+    for i, point in enumerate(final_points, 1):
+        print(f"P{i}: [{point[0]:.2f}, {point[1]:.2f}, {point[2]:.2f}]")
\ No newline at end of file
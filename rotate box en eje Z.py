@@ -1,6 +1,7 @@
 # Import libraries and packages
 import matplotlib.pyplot as plt
 from mpl_toolkits import mplot3d
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import numpy as np
 
 # create the fig and ax objects to handle figure and axes of the fixed frame
@@ -75,33 +76,17 @@ def drawVector(p_fin, p_init=[0,0,0], color='black',linewidth=1):
 
 
 
+# Aristas de la caja como pares de índices de vértices (p1..p8 -> 0..7)
+BOX_EDGES = np.array([[0, 1], [1, 2], [2, 3], [3, 0],
+                      [4, 5], [5, 6], [6, 7], [7, 4],
+                      [3, 7], [0, 4], [2, 6], [1, 5]])
+
 def drawBox(p1, p2, p3, p4, p5, p6, p7, p8, color = 'black'):
+    # all 12 edges in one Line3DCollection and all 8 vertices in one scatter
+    points = np.array([p1, p2, p3, p4, p5, p6, p7, p8], dtype=float).reshape(8, 3)
 
-    drawScatter(p1)
-    drawScatter(p2)
-    drawScatter(p3)
-    drawScatter(p4)
-    drawScatter(p5)
-    drawScatter(p6)
-    drawScatter(p7)
-    drawScatter(p8)
-
-    drawVector(p1,p2,color = color)
-    drawVector(p2,p3,color = color)
-    drawVector(p3,p4,color = color)
-    drawVector(p4,p1,color = color)
-    drawVector(p5,p6,color = color)
-    drawVector(p6,p7,color = color)
-    drawVector(p7,p8,color = color)
-    drawVector(p8,p5,color = color)
-    drawVector(p4,p8,color = color)
-    drawVector(p1,p5,color = color)
-    drawVector(p3,p7,color = color)
-    drawVector(p2,p6,color = color)
-
-
-def drawScatter(point,color='black',marker='o'):
-    ax.scatter(point[0],point[1],point[2],marker='o')
+    ax.scatter(points[:,0], points[:,1], points[:,2], marker='o')
+    ax.add_collection3d(Line3DCollection(points[BOX_EDGES], colors=color, linewidths=1))
 
 def rotate_box(p1,p2,p3,p4,p5,p6,p7,p8,axis='z', angle = 0):
     rotation_matrix = 0
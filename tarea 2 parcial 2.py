@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from exportacion import grabador_desde_entorno
+from instrumentacion import medir
+
 def clamp(x, lo=-1.0, hi=1.0):
     return max(lo, min(hi, x))
 
@@ -85,6 +88,123 @@ def cinematica_inversa(px, py, pz, l1, l2, codo="arriba"):
 
     return theta_base, theta1, theta2
 
+# Cinemática inversa por lotes: resuelve una matriz (N,3) de objetivos de una vez.
+# Devuelve (soluciones_arriba, soluciones_abajo, alcanzable); las soluciones son
+# arrays (N,3) con columnas (theta_base, theta1, theta2), con NaN donde el
+# objetivo no es alcanzable, y alcanzable es una máscara booleana (N,)
+def cinematica_inversa_lote(objetivos, l1, l2):
+    objetivos = np.asarray(objetivos, dtype=float).reshape(-1, 3)
+    px, py, pz = objetivos[:, 0], objetivos[:, 1], objetivos[:, 2]
+
+    theta_base = np.arctan2(py, px)
+    X, Z = np.hypot(px, py), pz
+    dist = np.hypot(X, Z)
+    alcanzable = (dist <= l1 + l2) & (dist >= abs(l1 - l2))
+
+    # Ley del coseno para las dos ramas del codo
+    cos_theta2 = np.clip((X**2 + Z**2 - l1**2 - l2**2) / (2*l1*l2), -1.0, 1.0)
+    theta2_abajo = np.arccos(cos_theta2)
+    theta2_arriba = -theta2_abajo
+
+    phi = np.arctan2(Z, X)
+    theta1_abajo = phi - np.arctan2(l2*np.sin(theta2_abajo), l1 + l2*np.cos(theta2_abajo))
+    theta1_arriba = phi - np.arctan2(l2*np.sin(theta2_arriba), l1 + l2*np.cos(theta2_arriba))
+
+    soluciones_arriba = np.column_stack((theta_base, theta1_arriba, theta2_arriba))
+    soluciones_abajo = np.column_stack((theta_base, theta1_abajo, theta2_abajo))
+    soluciones_arriba[~alcanzable] = np.nan
+    soluciones_abajo[~alcanzable] = np.nan
+
+    return soluciones_arriba, soluciones_abajo, alcanzable
+
+# Tramo recto de p0 a p1 con puntos separados como mucho `paso` (incluye los dos extremos)
+def interpolar_recta(p0, p1, paso):
+    p0, p1 = np.asarray(p0, dtype=float), np.asarray(p1, dtype=float)
+    num = max(2, int(np.ceil(np.linalg.norm(p1 - p0) / paso)) + 1)
+    s = np.linspace(0.0, 1.0, num)[:, None]
+    return p0 + s*(p1 - p0)
+
+# Arco de circunferencia que va de p0 a p1 pasando por p_medio, con puntos separados como mucho `paso`
+def interpolar_arco(p0, p_medio, p1, paso):
+    p0, pm, p1 = (np.asarray(p, dtype=float) for p in (p0, p_medio, p1))
+    a, b = pm - p0, p1 - p0
+    normal = np.cross(a, b)
+    nn = normal @ normal
+    if nn < 1e-12:
+        raise ValueError("Los tres puntos del arco están alineados")
+
+    # Centro de la circunferencia que pasa por los tres puntos y base (u, v) de su plano
+    centro = p0 + np.cross((a @ a)*b - (b @ b)*a, normal) / (2*nn)
+    radio = np.linalg.norm(p0 - centro)
+    u = (p0 - centro) / radio
+    v = np.cross(normal / np.sqrt(nn), u)
+
+    # Ángulos de p_medio y p1 medidos desde p0; si p_medio no queda antes que p1, se gira al revés
+    angulo_medio = np.arctan2((pm - centro) @ v, (pm - centro) @ u) % (2*np.pi)
+    angulo_fin = np.arctan2((p1 - centro) @ v, (p1 - centro) @ u) % (2*np.pi)
+    barrido = angulo_fin if angulo_medio <= angulo_fin else angulo_fin - 2*np.pi
+
+    num = max(2, int(np.ceil(radio*abs(barrido) / paso)) + 1)
+    angulos = np.linspace(0.0, barrido, num)[:, None]
+    return centro + radio*(np.cos(angulos)*u + np.sin(angulos)*v)
+
+# Camino cartesiano denso: `camino` empieza en un punto y cada elemento siguiente es
+# un punto (tramo recto hasta él) o un par (p_medio, p_fin) (arco por p_medio).
+# Devuelve los puntos (N,3) y el número de tramo de cada uno
+def trayectoria_cartesiana(camino, paso):
+    if not paso > 0:
+        raise ValueError("La separación entre muestras debe ser mayor que 0")
+    actual = np.asarray(camino[0], dtype=float)
+    tramos, numeros = [actual[None, :]], [np.zeros(1, dtype=int)]
+    for numero, destino in enumerate(camino[1:], start=1):
+        destino = np.asarray(destino, dtype=float)
+        if destino.ndim == 2:
+            puntos = interpolar_arco(actual, destino[0], destino[1], paso)
+            actual = destino[1]
+        else:
+            puntos = interpolar_recta(actual, destino, paso)
+            actual = destino
+        tramos.append(puntos[1:])  # el primer punto es el final del tramo anterior
+        numeros.append(np.full(len(puntos) - 1, numero))
+    return np.vstack(tramos), np.concatenate(numeros)
+
+# Cinemática inversa de todo el camino en una sola llamada por lotes. Se mantiene la
+# rama de codo elegida en todas las muestras (las dos ramas solo se tocan en el borde
+# del anillo alcanzable) y los ángulos se desenrollan para que no salten de +π a -π.
+# Devuelve (ángulos (N,3) con NaN fuera de alcance, alcanzable (N,), índices de las
+# muestras donde alguna articulación salta más de salto_maximo rad respecto a la anterior)
+def resolver_trayectoria_cartesiana(puntos, l1, l2, codo="arriba", salto_maximo=np.radians(20)):
+    soluciones_arriba, soluciones_abajo, alcanzable = cinematica_inversa_lote(puntos, l1, l2)
+    angulos = soluciones_arriba if codo == "arriba" else soluciones_abajo
+    validos = np.flatnonzero(alcanzable)
+    if len(validos):
+        angulos[validos] = np.unwrap(angulos[validos], axis=0)
+    # Saltos entre muestras alcanzables consecutivas (p. ej. la base al pasar por el eje Z)
+    saltos = validos[1:][np.any(np.abs(np.diff(angulos[validos], axis=0)) > salto_maximo, axis=1)]
+    return angulos, alcanzable, saltos
+
+# Agrupa índices en rangos consecutivos "a-b" para informar de las muestras problemáticas
+def rangos_indices(indices):
+    if len(indices) == 0:
+        return ""
+    cortes = np.flatnonzero(np.diff(indices) > 1)
+    inicios = np.concatenate(([indices[0]], indices[cortes + 1]))
+    finales = np.concatenate((indices[cortes], [indices[-1]]))
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in zip(inicios, finales))
+
+# Lee un camino escrito como "x,y,z; x,y,z; x,y,z | x,y,z": cada ';' separa un punto de
+# paso y "p_medio | p_fin" indica un arco que pasa por p_medio
+def leer_camino(texto):
+    camino = []
+    for parte in texto.split(";"):
+        puntos = [[float(c) for c in p.split(",")] for p in parte.split("|")]
+        if any(len(p) != 3 for p in puntos):
+            raise ValueError(f"Cada punto necesita 3 coordenadas: '{parte.strip()}'")
+        camino.append(puntos[0] if len(puntos) == 1 else puntos)
+    if len(camino) < 2 or np.asarray(camino[0]).ndim != 1:
+        raise ValueError("El camino necesita un punto inicial y al menos un tramo")
+    return camino
+
 # Obtener las posiciones del brazo con cinemática directa y dibujarlo
 def dibujar_brazo(tb, t1, t2, l1, l2):
     base, codo, ef = cinematica_directa(tb, t1, t2, l1, l2)
@@ -100,6 +220,60 @@ def interp_angulo(a0, a1, t):
     diff = (a1 - a0 + np.pi) % (2*np.pi) - np.pi
     return a0 + diff*t
 
+# Modo cartesiano: la punta recorre rectas y arcos entre puntos de paso
+def main_cartesiano(codo, l1, l2):
+    print("Camino como 'x,y,z; x,y,z; ...' (un arco que pasa por p_medio hasta p_fin: 'p_medio | p_fin')")
+    try:
+        camino = leer_camino(input("Camino: "))
+        paso = float(input(f"Separación entre muestras [{(l1 + l2)/1000:g}]: ") or (l1 + l2)/1000)
+        puntos, tramos = trayectoria_cartesiana(camino, paso)
+    except ValueError as error:
+        print(f"ERROR: {error}")
+        return
+    angulos, alcanzable, saltos = resolver_trayectoria_cartesiana(puntos, l1, l2, codo)
+    print(f"{len(puntos)} muestras resueltas en una sola llamada a cinematica_inversa_lote")
+
+    # Informe de muestras fuera del anillo alcanzable y de saltos articulares
+    fuera = np.flatnonzero(~alcanzable)
+    if len(fuera):
+        print(f"AVISO: {len(fuera)} muestras fuera del alcance (muestras {rangos_indices(fuera)}, "
+              f"tramos {sorted(set(tramos[fuera].tolist()))})")
+        for i in fuera[:5]:
+            print(f"  muestra {i}: [{puntos[i, 0]:.3f}, {puntos[i, 1]:.3f}, {puntos[i, 2]:.3f}], "
+                  f"distancia {np.linalg.norm(puntos[i]):.3f} fuera de [{abs(l1 - l2):g}, {l1 + l2:g}]")
+    if len(saltos):
+        print(f"AVISO: saltos articulares bruscos en las muestras {rangos_indices(saltos)}")
+    if not alcanzable.any():
+        print("Ningún punto del camino es alcanzable.")
+        return
+
+    # Fuera de alcance el brazo se queda en la última postura válida (o en la primera, al principio)
+    ultimo_valido = np.maximum.accumulate(np.where(alcanzable, np.arange(len(puntos)), -1))
+    angulos_dibujo = angulos[np.where(ultimo_valido >= 0, ultimo_valido, np.argmax(alcanzable))]
+
+    grabador = grabador_desde_entorno()  # plt.pause o exportación sin ventana
+    fig = plt.figure(figsize=(8,8))
+    global ax
+    ax = fig.add_subplot(111, projection="3d")
+    lim = l1 + l2 + 2
+    # Se dibujan como mucho 200 cuadros repartidos por el camino
+    indices = np.unique(np.linspace(0, len(puntos) - 1, min(len(puntos), 200)).round().astype(int))
+
+    for n in grabador.recorrer(len(indices), fps=1/0.03, figura=fig):
+        i = indices[n]
+        with medir("artistas"):
+            ax.cla()
+            setaxis(-lim, lim, -lim, lim, -lim, lim)
+            fix_system(lim, 2)
+            ax.set_title(f"Camino cartesiano - codo {codo} ({i+1}/{len(puntos)})")
+            ax.plot(puntos[:, 0], puntos[:, 1], puntos[:, 2], color="gray", linewidth=1)  # camino
+            if len(fuera):
+                ax.scatter(puntos[fuera, 0], puntos[fuera, 1], puntos[fuera, 2], color="red", s=10, marker="x")
+            ax.scatter([0], [0], [0], color="black", s=100)  # base
+            dibujar_brazo(*angulos_dibujo[i], l1, l2)
+
+    grabador.mostrar()
+
 def main():
     print("Animación rotatoria de codo arriba o abajo")
 
@@ -112,6 +286,12 @@ def main():
     # Preguntar cuales son los datos que se van a querer utilizar
     l1 = float(input("Longitud l1: "))
     l2 = float(input("Longitud l2: "))
+
+    modo = input("Movimiento 'articular' (a un punto) o 'cartesiano' (rectas y arcos) [articular]: ").strip().lower()
+    if modo == "cartesiano":
+        main_cartesiano(codo, l1, l2)
+        return
+
     Xf = float(input("Posición Xf: "))
     Yf = float(input("Posición Yf: "))
     Zf = float(input("Posición Zf: "))
@@ -128,6 +308,7 @@ def main():
 
     # Animación
     pasos = 100
+    grabador = grabador_desde_entorno()  # plt.pause o exportación sin ventana
     tb0, t10, t20 = 0.0, 0.0, 0.0
     fig = plt.figure(figsize=(8,8))
     global ax
@@ -135,24 +316,25 @@ def main():
     lim = l1 + l2 + 2
 
     # Interpolación de los ángulos
-    for n in range(pasos+1):
+    # Ritmo fijo de reloj (~33 fps); si el dibujado se retrasa se saltan pasos
+    for n in grabador.recorrer(pasos+1, fps=1/0.03, figura=fig):
         t = n/pasos
-        tb = interp_angulo(tb0, tb_f, t)
-        t1 = interp_angulo(t10, t1_f, t)
-        t2 = interp_angulo(t20, t2_f, t)
+        with medir("cinematica"):
+            tb = interp_angulo(tb0, tb_f, t)
+            t1 = interp_angulo(t10, t1_f, t)
+            t2 = interp_angulo(t20, t2_f, t)
 
         # Dibujar todo
-        ax.cla()
-        setaxis(-lim, lim, -lim, lim, -lim, lim)
-        fix_system(lim, 2)
-        ax.set_title(f"Brazo 3D - codo {codo}")
-        ax.scatter([0], [0], [0], color="black", s=100)  # base
-        ax.scatter([Xf], [Yf], [Zf], color="darkred", s=80, alpha=0.8, marker="X") # destino
-        dibujar_brazo(tb, t1, t2, l1, l2)
-
-        plt.pause(0.03)
+        with medir("artistas"):
+            ax.cla()
+            setaxis(-lim, lim, -lim, lim, -lim, lim)
+            fix_system(lim, 2)
+            ax.set_title(f"Brazo 3D - codo {codo}")
+            ax.scatter([0], [0], [0], color="black", s=100)  # base
+            ax.scatter([Xf], [Yf], [Zf], color="darkred", s=80, alpha=0.8, marker="X") # destino
+            dibujar_brazo(tb, t1, t2, l1, l2)
 
-    plt.show()
+    grabador.mostrar()
 
 # Ejecutar el programa - CORRECCIÓN: Esta línea estaba mal escrita
 if __name__ == "__main__":
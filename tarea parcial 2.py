@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from exportacion import grabador_desde_entorno
+from instrumentacion import medir
+
 def clamp(x, lo=-1.0, hi=1.0):
     return max(lo, min(hi, x))
 
@@ -46,6 +49,44 @@ def cinematica_inversa(Xf, Yf, l1, l2, codo):
 
     return theta1_final, theta2_final
 
+def cinematica_inversa_lote(objetivos, l1, l2):
+    # Versión vectorizada de cinematica_inversa para una nube de puntos (N,2).
+    # Devuelve (soluciones_arriba, soluciones_abajo, alcanzable): las soluciones
+    # son arrays (N,2) con columnas (theta1, theta2) y valen NaN donde el
+    # objetivo no es alcanzable; alcanzable es una máscara booleana (N,).
+    objetivos = np.asarray(objetivos, dtype=float).reshape(-1, 2)
+    Xf, Yf = objetivos[:, 0], objetivos[:, 1]
+
+    r2 = Xf**2 + Yf**2
+    r = np.sqrt(r2)
+    alcanzable = (r <= l1 + l2) & (r >= abs(l1 - l2))
+
+    cos_alpha2 = np.clip((r2 - l1**2 - l2**2) / (2*l1*l2), -1.0, 1.0)
+    alpha2 = np.arccos(cos_alpha2)
+    phi = np.arctan2(Yf, Xf)
+
+    theta2_pos = alpha2
+    theta2_neg = -alpha2
+    theta1_pos = phi - np.arctan2(l2*np.sin(theta2_pos), l1 + l2*np.cos(theta2_pos))
+    theta1_neg = phi - np.arctan2(l2*np.sin(theta2_neg), l1 + l2*np.cos(theta2_neg))
+
+    # Mismo criterio que cinematica_inversa: codo arriba = mayor altura del codo
+    y_codo_pos = l1 * np.sin(theta1_pos)
+    y_codo_neg = l1 * np.sin(theta1_neg)
+    arriba_es_pos = y_codo_pos >= y_codo_neg
+    abajo_es_pos = y_codo_pos <= y_codo_neg
+
+    soluciones_arriba = np.where(arriba_es_pos[:, None],
+                                 np.column_stack((theta1_pos, theta2_pos)),
+                                 np.column_stack((theta1_neg, theta2_neg)))
+    soluciones_abajo = np.where(abajo_es_pos[:, None],
+                                np.column_stack((theta1_pos, theta2_pos)),
+                                np.column_stack((theta1_neg, theta2_neg)))
+    soluciones_arriba[~alcanzable] = np.nan
+    soluciones_abajo[~alcanzable] = np.nan
+
+    return soluciones_arriba, soluciones_abajo, alcanzable
+
 def dibujar_ejes(ax, longitud=5):
     # Eje X horizontal - azul oscuro con transparencia
     ax.plot([-longitud, longitud], [0, 0], color="#00008B", linewidth=2, alpha=0.7, label="X")
@@ -92,31 +133,33 @@ def main():
 
     theta1_init, theta2_init = 0.0, 0.0
     pasos = 100
+    grabador = grabador_desde_entorno()  # plt.pause o exportación sin ventana
     fig, ax = plt.subplots(figsize=(6,6))
     lim = l1 + l2 + 1
 
-    for n in range(pasos+1):
+    # Ritmo fijo de reloj (~33 fps); si el dibujado se retrasa se saltan pasos
+    for n in grabador.recorrer(pasos+1, fps=1/0.03, figura=fig):
         t = n/pasos
-        th1 = interp_angulo(theta1_init, theta1_final, t)
-        th2 = interp_angulo(theta2_init, theta2_final, t)
-
-        ax.cla()
-        ax.set_xlim(-lim, lim)
-        ax.set_ylim(-lim, lim)
-        ax.set_aspect("equal")
-        ax.set_title(f"Animación planar - codo {codo}")
-        ax.set_xlabel("X")
-        ax.set_ylabel("Y")
-        dibujar_ejes(ax, l1+l2)
-        # Punto objetivo en color rojo oscuro
-        ax.scatter([Xf],[Yf], color="darkred", s=80, alpha=0.8, marker="X")
-
-        ef_final = (Xf, Yf) if n == pasos else None
-        dibujar_brazo(ax, th1, th2, l1, l2, efector_final=ef_final)
-
-        plt.pause(0.03)
-
-    plt.show()
+        with medir("cinematica"):
+            th1 = interp_angulo(theta1_init, theta1_final, t)
+            th2 = interp_angulo(theta2_init, theta2_final, t)
+
+        with medir("artistas"):
+            ax.cla()
+            ax.set_xlim(-lim, lim)
+            ax.set_ylim(-lim, lim)
+            ax.set_aspect("equal")
+            ax.set_title(f"Animación planar - codo {codo}")
+            ax.set_xlabel("X")
+            ax.set_ylabel("Y")
+            dibujar_ejes(ax, l1+l2)
+            # Punto objetivo en color rojo oscuro
+            ax.scatter([Xf],[Yf], color="darkred", s=80, alpha=0.8, marker="X")
+
+            ef_final = (Xf, Yf) if n == pasos else None
+            dibujar_brazo(ax, th1, th2, l1, l2, efector_final=ef_final)
+
+    grabador.mostrar()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file